@@ -7,6 +7,51 @@ AGENCY_DATA_DIR = DATA_DIR / "agency_data"
 
 # Constants for default configuration files
 DEFAULT_CACHE_EXPIRATION = 60 * 60 * 24  # 1 day
+# In-process near cache in front of Redis (see RedisCacheManager)
+NEAR_CACHE_MAXSIZE = 10000
+NEAR_CACHE_TTL = 10  # seconds
+NEAR_CACHE_INVALIDATION_CHANNEL = "cache:invalidate"
+
+# Read-through cache for the Firestore config repositories: TTL per collection, in seconds
+REPOSITORY_CACHE_MAXSIZE = 1000
+REPOSITORY_CACHE_KEY_PREFIX = "repository:"
+REPOSITORY_CACHE_INVALIDATION_CHANNEL = "repository:invalidate"
+REPOSITORY_CACHE_TTL = {
+    "agency_configs": 60,
+    "agent_configs": 60,
+    "skill_configs": 5 * 60,
+}
+
+# Pool of constructed agencies, keyed by agency version: number of versions, TTL in seconds, instances per version
+AGENCY_POOL_MAXSIZE = 1000
+AGENCY_POOL_TTL = 60 * 60
+AGENCY_POOL_MAX_IDLE_INSTANCES = 10
+
+# Maximum number of agents of an agency constructed in parallel
+AGENT_CONSTRUCTION_CONCURRENCY = 4
+# Maximum number of constructed agents kept in memory (keyed by agent id and config timestamp)
+AGENT_CACHE_MAXSIZE = 1000
+
+# Verified ID tokens kept in memory until they expire (see AuthService)
+AUTH_CACHE_MAXSIZE = 10000
+AUTH_CACHE_KEY_PREFIX = "auth:token:"
+
+# Decrypted user variables kept in memory per user, in seconds
+USER_VARIABLES_CACHE_MAXSIZE = 1000
+USER_VARIABLES_CACHE_TTL = 60
+
+# Maximum number of pooled OpenAI clients (one per set of credentials)
+OPENAI_CLIENTS_MAXSIZE = 100
+
+# Consecutive agent_status deltas streamed over the websocket are merged into frames
+# collected over this window (in seconds), up to this many characters
+DELTA_COALESCING_WINDOW = 0.04
+DELTA_COALESCING_MAX_SIZE = 4096
+
+# Websocket backplane over Redis: pub/sub channel per connection, and the key holding the worker that owns it
+WEBSOCKET_CLIENT_CHANNEL_PREFIX = "websocket:client:"
+WEBSOCKET_OWNER_KEY_PREFIX = "websocket:owner:"
+WEBSOCKET_OWNER_TTL = 60 * 60 * 24  # 1 day, in case a worker stops without unregistering its connections
 
 DEFAULT_OPENAI_API_TIMEOUT = 30.0  # seconds
 
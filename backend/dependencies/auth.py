@@ -2,13 +2,12 @@ import logging
 from http import HTTPStatus
 from typing import Annotated
 
-from fastapi import Depends, HTTPException
+from fastapi import Depends, HTTPException, Request
 from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
 
-from backend.dependencies.dependencies import get_redis_cache_manager
+from backend.dependencies.dependencies import get_auth_service
 from backend.models.auth import User
 from backend.services.auth_service import AuthService
-from backend.services.redis_cache_manager import RedisCacheManager
 
 logger = logging.getLogger(__name__)
 
@@ -16,18 +15,18 @@ security = HTTPBearer()
 
 
 async def get_current_user(
+    request: Request,
     credentials: Annotated[HTTPAuthorizationCredentials, Depends(security)],
-    auth_service: Annotated[AuthService, Depends(AuthService)],
-    cache_manager: RedisCacheManager = Depends(get_redis_cache_manager)
+    auth_service: Annotated[AuthService, Depends(get_auth_service)],
 ) -> User:
-    user_data = await cache_manager.get(credentials.credentials)
-    if user_data:
-        user = User.model_validate(user_data)
-    else:
-        user = auth_service.get_user(credentials.credentials)
-        await cache_manager.set(credentials.credentials, user.model_dump(), expire=300)
-
-    return user
+    """Return the user authenticated by UserContextMiddleware, or authenticate the request if it hasn't run."""
+    user = getattr(request.state, "user", None)
+    if user is not None:
+        return user
+    auth_error = getattr(request.state, "auth_error", None)
+    if auth_error is not None:
+        raise auth_error
+    return await auth_service.get_user(credentials.credentials)
 
 
 async def get_current_superuser(
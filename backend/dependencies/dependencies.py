@@ -1,3 +1,5 @@
+from functools import cache
+
 from fastapi import Depends, HTTPException, WebSocket
 from redis import asyncio as aioredis
 
@@ -14,11 +16,12 @@ from backend.services.agency_manager import AgencyManager
 from backend.services.agent_manager import AgentManager
 from backend.services.auth_service import AuthService
 from backend.services.message_manager import MessageManager
-from backend.services.redis_cache_manager import RedisCacheManager
+from backend.services.redis_cache_manager import MsgpackSerializer, RedisCacheManager, near_cache
 from backend.services.session_manager import SessionManager
 from backend.services.skill_manager import SkillManager
 from backend.services.user_profile_manager import UserProfileManager
 from backend.services.user_variable_manager import UserVariableManager
+from backend.services.websocket.connection_backplane import LocalBackplane, RedisBackplane
 from backend.services.websocket.websocket_connection_manager import WebSocketConnectionManager
 from backend.services.websocket.websocket_handler import WebSocketHandler
 from backend.settings import settings
@@ -32,12 +35,27 @@ async def get_websocket(websocket: WebSocket):
     return websocket
 
 
+@cache
 def get_redis() -> aioredis.Redis:
+    """Get the Redis client shared by the whole app.
+    Its connection pool is created on the first call (at startup) and closed by `close_redis` on shutdown."""
     redis_url = str(settings.redis_tls_url or settings.redis_url)
-    redis = aioredis.from_url(redis_url, decode_responses=False, ssl_cert_reqs="none")
+    redis = aioredis.from_url(
+        redis_url,
+        decode_responses=False,
+        ssl_cert_reqs="none",
+        max_connections=settings.redis_max_connections,
+        health_check_interval=settings.redis_health_check_interval,
+    )
     return redis
 
 
+async def close_redis() -> None:
+    if get_redis.cache_info().currsize:
+        await get_redis().aclose()
+        get_redis.cache_clear()
+
+
 def get_agent_adapter(
     skill_config_storage: SkillConfigStorage = Depends(SkillConfigStorage),
 ) -> AgentAdapter:
@@ -59,7 +77,7 @@ def get_session_adapter(
 
 
 def get_redis_cache_manager(redis: aioredis.Redis = Depends(get_redis)) -> RedisCacheManager:
-    return RedisCacheManager(redis)
+    return RedisCacheManager(redis, serializer=MsgpackSerializer(), near_cache=near_cache)
 
 
 def get_user_variable_manager(
@@ -110,9 +128,21 @@ def get_message_manager(
     return MessageManager(user_variable_manager)
 
 
+def get_auth_service(cache_manager: RedisCacheManager = Depends(get_redis_cache_manager)) -> AuthService:
+    return AuthService(cache_manager)
+
+
+@cache
+def get_connection_manager() -> WebSocketConnectionManager:
+    """Get the registry of the websocket connections of this process.
+    With the Redis backplane, messages can also be sent to the connections of the other workers."""
+    backplane = RedisBackplane(get_redis()) if settings.websocket_backplane == "redis" else LocalBackplane()
+    return WebSocketConnectionManager(backplane=backplane)
+
+
 def get_websocket_handler(
-    connection_manager: WebSocketConnectionManager = Depends(WebSocketConnectionManager),
-    auth_service: AuthService = Depends(AuthService),
+    connection_manager: WebSocketConnectionManager = Depends(get_connection_manager),
+    auth_service: AuthService = Depends(get_auth_service),
     agency_manager: AgencyManager = Depends(get_agency_manager),
     message_manager: MessageManager = Depends(get_message_manager),
     session_manager: SessionManager = Depends(get_session_manager),
@@ -3,6 +3,7 @@ import logging
 from fastapi import HTTPException, Request, Response
 from starlette.middleware.base import BaseHTTPMiddleware, RequestResponseEndpoint
 
+from backend.dependencies.dependencies import get_redis, get_redis_cache_manager
 from backend.services.auth_service import AuthService
 from backend.services.context_vars_manager import ContextEnvVarsManager
 
@@ -10,15 +11,23 @@ logger = logging.getLogger(__name__)
 
 
 class UserContextMiddleware(BaseHTTPMiddleware):
+    """Authenticate the request once and share the result with the endpoints.
+
+    The resolved user is stored in `request.state.user` (or the authentication error in `request.state.auth_error`),
+    so that `get_current_user` doesn't verify the token again.
+    """
+
     async def dispatch(self, request: Request, call_next: RequestResponseEndpoint) -> Response:
         token = request.headers.get("Authorization")
         if token:
             token = token.replace("Bearer ", "")
             try:
-                user = AuthService.get_user(token)
-            except HTTPException:
+                user = await AuthService(get_redis_cache_manager(get_redis())).get_user(token)
+            except HTTPException as err:
+                request.state.auth_error = err
                 user = None
             if user:
+                request.state.user = user
                 ContextEnvVarsManager.set("user_id", user.id)
                 logger.info(f"Current User ID set in context: {user.id}")
 
@@ -1,3 +1,6 @@
+import asyncio
+from contextlib import asynccontextmanager, suppress
+
 from fastapi import FastAPI, HTTPException
 from fastapi.exceptions import RequestValidationError
 from fastapi.middleware.cors import CORSMiddleware
@@ -5,10 +8,18 @@ from openai import AuthenticationError as OpenAIAuthenticationError
 from pydantic import ValidationError
 from starlette.staticfiles import StaticFiles
 
+from backend.dependencies.dependencies import close_redis, get_connection_manager, get_redis
 from backend.dependencies.middleware import UserContextMiddleware
 from backend.exceptions import NotFoundError, UnsetVariableError
+from backend.repositories.repository_cache import (
+    listen_for_invalidations as listen_for_repository_cache_invalidations,
+    set_redis_tier,
+)
 from backend.routers.api import api_router
 from backend.routers.websocket import websocket_router
+from backend.services.completion_scheduler import completion_scheduler
+from backend.services.redis_cache_manager import MsgpackSerializer, RedisCacheManager, near_cache
+from backend.settings import settings
 from backend.utils.logging_utils import setup_logging
 
 setup_logging()
@@ -30,8 +41,29 @@ init_firebase_app()
 
 patch_openai_client()
 
+
+@asynccontextmanager
+async def lifespan(_: FastAPI):
+    redis = get_redis()  # create the Redis connection pool shared by all requests
+    invalidation_listeners = []
+    if settings.redis_near_cache_invalidation:
+        invalidation_listeners.append(asyncio.create_task(near_cache.listen_for_invalidations(redis)))
+    if settings.repository_cache_redis:
+        set_redis_tier(RedisCacheManager(redis, serializer=MsgpackSerializer()))
+        invalidation_listeners.append(asyncio.create_task(listen_for_repository_cache_invalidations(redis)))
+    yield
+    for invalidation_listener in invalidation_listeners:
+        invalidation_listener.cancel()
+        with suppress(asyncio.CancelledError):
+            await invalidation_listener
+    set_redis_tier(None)
+    await get_connection_manager().close()
+    await close_redis()
+    completion_scheduler.shutdown()
+
+
 # FastAPI app initialization
-app = FastAPI()
+app = FastAPI(lifespan=lifespan)
 
 # allow cross-origin requests for testing on localhost:800* ports only
 app.add_middleware(
@@ -37,6 +37,9 @@ class AgentFlowSpec(BaseModel):
     description: str = Field("", description="Description of the agent")
     temperature: float = Field(0.0, description="temperature of the agent")
     user_id: str | None = Field(None, description="The user ID owning this configuration")
+    assistant_fingerprint: str | None = Field(
+        None, description="Fingerprint of the settings last synchronized with the OpenAI assistant"
+    )
 
 
 class AgentFlowSpecForAPI(AgentFlowSpec):
@@ -46,3 +49,4 @@ class AgentFlowSpecForAPI(AgentFlowSpec):
     skills: list[SkillConfig] = Field(  # type: ignore
         default_factory=list, description="List of skill configurations equipped by the agent"
     )
+    assistant_fingerprint: str | None = Field(None, exclude=True)
@@ -5,3 +5,11 @@ class User(BaseModel):
     id: str
     email: str
     is_superuser: bool = False  # TODO: Implement superuser functionality
+
+
+class VerifiedToken(BaseModel):
+    """The result of a successful ID token verification."""
+
+    user: User
+    expires_at: float  # the `exp` claim of the token, seconds since the epoch
+    revocation_checked_at: float  # seconds since the epoch
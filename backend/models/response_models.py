@@ -14,11 +14,17 @@ class BaseResponse(BaseModel):
     message: str = Field("Success", description="The message to be displayed.")
 
 
+class PaginatedResponse(BaseResponse):
+    next_cursor: str | None = Field(
+        None, description="The cursor to request the next page with, or null if this is the last page."
+    )
+
+
 # =================================================================================================
 # Skills API
 
 
-class SkillListResponse(BaseResponse):
+class SkillListResponse(PaginatedResponse):
     data: list[SkillConfig] = Field(..., description="The list of skill configurations.")
 
 
@@ -34,7 +40,7 @@ class ExecuteSkillResponse(BaseResponse):
 # Agents API
 
 
-class AgentListResponse(BaseResponse):
+class AgentListResponse(PaginatedResponse):
     data: list[AgentFlowSpecForAPI] = Field(..., description="The list of agent configurations.")
 
 
@@ -46,7 +52,7 @@ class GetAgentResponse(BaseResponse):
 # Agency API
 
 
-class AgencyListResponse(BaseResponse):
+class AgencyListResponse(PaginatedResponse):
     data: list[AgencyConfigForAPI] = Field(..., description="The list of agency configurations.")
 
 
@@ -58,7 +64,7 @@ class GetAgencyResponse(BaseResponse):
 # Session API
 
 
-class SessionListResponse(BaseResponse):
+class SessionListResponse(PaginatedResponse):
     data: list[SessionConfigForAPI] = Field(..., description="The list of session configurations.")
 
 
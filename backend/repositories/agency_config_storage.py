@@ -1,43 +1,81 @@
-from firebase_admin import firestore
+from firebase_admin import firestore_async
 from google.cloud.firestore_v1 import FieldFilter
 
 from backend.models.agency_config import AgencyConfig
+from backend.repositories.pagination import load_merged_by_user_ids, order_by_timestamp
+from backend.repositories.repository_cache import cached, invalidates_cache
 
 
 class AgencyConfigStorage:
     def __init__(self):
-        self.db = firestore.client()
+        self.db = firestore_async.client()
         self.collection_name = "agency_configs"
 
-    def load_by_user_id(self, user_id: str | None = None) -> list[AgencyConfig]:
+    @cached
+    async def load_by_user_id(
+        self, user_id: str | None = None, limit: int | None = None, cursor: str | None = None
+    ) -> list[AgencyConfig]:
+        """Load the agencies owned by the user (or the templates if user_id is None), newest first.
+        Pass `limit` and `cursor` to load a single page (see backend.repositories.pagination)."""
         collection = self.db.collection(self.collection_name)
         query = collection.where(filter=FieldFilter("user_id", "==", user_id))
-        return [AgencyConfig.model_validate(document_snapshot.to_dict()) for document_snapshot in query.stream()]
+        query = order_by_timestamp(query, limit, cursor)
+        return [AgencyConfig.model_validate(document_snapshot.to_dict()) async for document_snapshot in query.stream()]
 
-    def load_by_id(self, id_: str) -> AgencyConfig | None:
+    async def load_by_user_ids(
+        self, user_ids: list[str | None], limit: int | None = None, cursor: str | None = None
+    ) -> list[AgencyConfig]:
+        """Load the agencies of several users (e.g. `[user_id, None]` for the user and the templates), newest first."""
+        return await load_merged_by_user_ids(self.load_by_user_id, user_ids, limit, cursor)
+
+    @cached
+    async def load_by_id(self, id_: str) -> AgencyConfig | None:
         collection = self.db.collection(self.collection_name)
-        document_snapshot = collection.document(id_).get()
+        document_snapshot = await collection.document(id_).get()
         return AgencyConfig.model_validate(document_snapshot.to_dict()) if document_snapshot.exists else None
 
-    def load_by_agent_id(self, agent_id: str) -> list[AgencyConfig]:
+    @cached
+    async def load_by_ids(self, ids: list[str]) -> list[AgencyConfig]:
+        agency_configs = []
+        for i in range(0, len(ids), 10):
+            agency_configs_batch = await self._load_by_ids(ids[i : i + 10])
+            agency_configs.extend(agency_configs_batch)
+        return agency_configs
+
+    async def _load_by_ids(self, ids: list[str]) -> list[AgencyConfig]:
+        collection = self.db.collection(self.collection_name)
+        # Firestore `in` query supports up to 10 items in the array.
+        if len(ids) > 10:
+            raise ValueError("IDs list exceeds the maximum size of 10 for an 'in' query in Firestore.")
+
+        query = collection.where(filter=FieldFilter("id", "in", ids))
+        results = [
+            AgencyConfig.model_validate(document_snapshot.to_dict()) async for document_snapshot in query.stream()
+        ]
+        return results
+
+    @cached
+    async def load_by_agent_id(self, agent_id: str) -> list[AgencyConfig]:
         """Load all agency configurations with the given agent id present in the agents array."""
         collection = self.db.collection(self.collection_name)
         query = collection.where(filter=FieldFilter("agents", "array_contains", agent_id))
-        return [AgencyConfig.model_validate(document_snapshot.to_dict()) for document_snapshot in query.stream()]
+        return [AgencyConfig.model_validate(document_snapshot.to_dict()) async for document_snapshot in query.stream()]
 
-    def save(self, agency_config: AgencyConfig) -> str:
+    @invalidates_cache
+    async def save(self, agency_config: AgencyConfig) -> str:
         """Save the agency configuration to the Firestore.
         If the id is not set, it will create a new document and set the id.
         Returns the id."""
         collection = self.db.collection(self.collection_name)
         if agency_config.id is None:
             # Create a new document and set the id
-            document_reference = collection.add(agency_config.model_dump())[1]
+            document_reference = (await collection.add(agency_config.model_dump()))[1]
             agency_config.id = document_reference.id
 
-        collection.document(agency_config.id).set(agency_config.model_dump())
+        await collection.document(agency_config.id).set(agency_config.model_dump())
         return agency_config.id
 
-    def delete(self, id_: str) -> None:
+    @invalidates_cache
+    async def delete(self, id_: str) -> None:
         collection = self.db.collection(self.collection_name)
-        collection.document(id_).delete()
+        await collection.document(id_).delete()
@@ -1,54 +1,75 @@
-from firebase_admin import firestore
+from firebase_admin import firestore_async
 from google.cloud.firestore_v1 import FieldFilter
 
 from backend.models.agent_flow_spec import AgentFlowSpec
+from backend.repositories.pagination import load_merged_by_user_ids, order_by_timestamp
+from backend.repositories.repository_cache import cached, invalidates_cache
 
 
 class AgentFlowSpecStorage:
     def __init__(self):
-        self.db = firestore.client()
+        self.db = firestore_async.client()
         self.collection_name = "agent_configs"
 
-    def load_by_user_id(self, user_id: str | None = None) -> list[AgentFlowSpec]:
+    @cached
+    async def load_by_user_id(
+        self, user_id: str | None = None, limit: int | None = None, cursor: str | None = None
+    ) -> list[AgentFlowSpec]:
+        """Load the agents owned by the user (or the templates if user_id is None), newest first."""
         collection = self.db.collection(self.collection_name)
         query = collection.where(filter=FieldFilter("user_id", "==", user_id))
-        return [AgentFlowSpec.model_validate(document_snapshot.to_dict()) for document_snapshot in query.stream()]
+        query = order_by_timestamp(query, limit, cursor)
+        return [
+            AgentFlowSpec.model_validate(document_snapshot.to_dict()) async for document_snapshot in query.stream()
+        ]
 
-    def load_by_id(self, id_: str) -> AgentFlowSpec | None:
+    async def load_by_user_ids(
+        self, user_ids: list[str | None], limit: int | None = None, cursor: str | None = None
+    ) -> list[AgentFlowSpec]:
+        """Load the agents of all given owners with concurrent queries, newest first."""
+        return await load_merged_by_user_ids(self.load_by_user_id, user_ids, limit, cursor)
+
+    @cached
+    async def load_by_id(self, id_: str) -> AgentFlowSpec | None:
         collection = self.db.collection(self.collection_name)
-        document_snapshot = collection.document(id_).get()
+        document_snapshot = await collection.document(id_).get()
         return AgentFlowSpec.model_validate(document_snapshot.to_dict()) if document_snapshot.exists else None
 
-    def load_by_ids(self, ids: list[str]) -> list[AgentFlowSpec]:
+    @cached
+    async def load_by_ids(self, ids: list[str]) -> list[AgentFlowSpec]:
         agent_configs = []
         for i in range(0, len(ids), 10):
-            agent_configs_batch = self._load_by_ids(ids[i : i + 10])
+            agent_configs_batch = await self._load_by_ids(ids[i : i + 10])
             agent_configs.extend(agent_configs_batch)
         return agent_configs
 
-    def _load_by_ids(self, ids: list[str]) -> list[AgentFlowSpec]:
+    async def _load_by_ids(self, ids: list[str]) -> list[AgentFlowSpec]:
         collection = self.db.collection(self.collection_name)
         # Firestore `in` query supports up to 10 items in the array.
         if len(ids) > 10:
             raise ValueError("IDs list exceeds the maximum size of 10 for an 'in' query in Firestore.")
 
         query = collection.where(filter=FieldFilter("id", "in", ids))
-        results = [AgentFlowSpec.model_validate(document_snapshot.to_dict()) for document_snapshot in query.stream()]
+        results = [
+            AgentFlowSpec.model_validate(document_snapshot.to_dict()) async for document_snapshot in query.stream()
+        ]
         return results
 
-    def save(self, agent_flow_spec: AgentFlowSpec) -> str:
+    @invalidates_cache
+    async def save(self, agent_flow_spec: AgentFlowSpec) -> str:
         """Save the agent configuration to the Firestore.
         If the agent id is not set, it will create a new document and set the agent id.
         Returns the agent id."""
         collection = self.db.collection(self.collection_name)
         if agent_flow_spec.id is None:
             # Create a new document and set the id
-            document_reference = collection.add(agent_flow_spec.model_dump())[1]
+            document_reference = (await collection.add(agent_flow_spec.model_dump()))[1]
             agent_flow_spec.id = document_reference.id
 
-        collection.document(agent_flow_spec.id).set(agent_flow_spec.model_dump())
+        await collection.document(agent_flow_spec.id).set(agent_flow_spec.model_dump())
         return agent_flow_spec.id
 
-    def delete(self, id_: str) -> None:
+    @invalidates_cache
+    async def delete(self, id_: str) -> None:
         collection = self.db.collection(self.collection_name)
-        collection.document(id_).delete()
+        await collection.document(id_).delete()
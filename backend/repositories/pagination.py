@@ -0,0 +1,85 @@
+"""Cursor-based pagination of the list queries.
+
+The list queries return the documents ordered by `timestamp`, newest first, and by document ID among the documents
+with the same timestamp. A page is requested with `limit` and `cursor`, where the cursor holds the timestamp and the ID
+of the last item of the previous page (see `get_next_cursor`), so the items sharing its timestamp aren't skipped.
+The user items and the templates are queried concurrently and merged with `load_merged_by_user_ids`.
+"""
+
+import asyncio
+import base64
+import binascii
+import heapq
+import json
+from collections.abc import Awaitable, Callable, Iterable, Sequence
+from itertools import islice
+from typing import Protocol, TypeVar
+
+from google.cloud.firestore_v1 import Query
+from google.cloud.firestore_v1.async_query import AsyncQuery
+from google.cloud.firestore_v1.field_path import FieldPath
+
+
+class Timestamped(Protocol):
+    id: str | None
+    timestamp: str
+
+
+T = TypeVar("T", bound=Timestamped)
+
+
+def order_by_timestamp(query: AsyncQuery, limit: int | None = None, cursor: str | None = None) -> AsyncQuery:
+    """Order the query by timestamp (newest first) and restrict it to the page given by `limit` and `cursor`."""
+    # Firestore orders the documents with the same timestamp by ID anyway (in the direction of the last order);
+    # ordering by it explicitly lets the cursor include it, and needs no other index.
+    query = query.order_by("timestamp", direction=Query.DESCENDING)
+    query = query.order_by(FieldPath.document_id(), direction=Query.DESCENDING)
+    if cursor:
+        timestamp, id_ = decode_cursor(cursor)
+        start_after = {"timestamp": timestamp}
+        if id_ is not None:
+            start_after[FieldPath.document_id()] = id_
+        query = query.start_after(start_after)
+    if limit:
+        query = query.limit(limit)
+    return query
+
+
+def merge_by_timestamp(*pages: Iterable[T], limit: int | None = None) -> list[T]:
+    """Merge the pages sorted by timestamp (newest first) into a single page of at most `limit` items."""
+    merged = heapq.merge(*pages, key=lambda item: (item.timestamp, item.id or ""), reverse=True)
+    return list(islice(merged, limit))
+
+
+async def load_merged_by_user_ids(
+    load_by_user_id: Callable[..., Awaitable[list[T]]],
+    user_ids: Iterable[str | None],
+    limit: int | None = None,
+    cursor: str | None = None,
+) -> list[T]:
+    """Run the `load_by_user_id` query for each of the user IDs concurrently and merge the results
+    into a single page, newest first."""
+    pages = await asyncio.gather(*(load_by_user_id(user_id, limit=limit, cursor=cursor) for user_id in user_ids))
+    return merge_by_timestamp(*pages, limit=limit)
+
+
+def get_next_cursor(page: Sequence[Timestamped], limit: int | None) -> str | None:
+    """Return the cursor of the page following the given one, or None if this is the last page."""
+    if not limit or len(page) < limit:
+        return None
+    return encode_cursor(page[-1])
+
+
+def encode_cursor(item: Timestamped) -> str:
+    """Encode the timestamp and the ID of the item as an opaque, URL-safe cursor."""
+    return base64.urlsafe_b64encode(json.dumps([item.timestamp, item.id]).encode()).decode()
+
+
+def decode_cursor(cursor: str) -> tuple[str, str | None]:
+    """Decode a cursor made by `encode_cursor`. Any other cursor is taken as a bare timestamp, like the cursors
+    returned before the ID was added to them."""
+    try:
+        timestamp, id_ = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+    except (binascii.Error, UnicodeDecodeError, ValueError, TypeError):
+        return cursor, None
+    return timestamp, id_
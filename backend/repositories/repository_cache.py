@@ -0,0 +1,205 @@
+"""
+Read-through cache for the Firestore repositories.
+
+Configs change rarely but are re-read many times per request (by the managers and the adapters),
+so the read methods of a repository can be wrapped with `@cached`, and the write methods with `@invalidates_cache`:
+
+class AgencyConfigStorage:
+    collection_name = "agency_configs"
+
+    @cached
+    async def load_by_id(self, id_: str) -> AgencyConfig | None: ...
+
+    @invalidates_cache
+    async def save(self, agency_config: AgencyConfig) -> str: ...
+
+Each collection gets its own in-process LRU cache with the TTL from REPOSITORY_CACHE_TTL.
+Any write to a collection drops all cached reads of that collection, so list queries never return stale data
+written by this worker.
+
+With the optional Redis tier (see `set_redis_tier`), the reads missing from the in-process cache are looked up
+in Redis before Firestore, so the workers share the cached reads. Each collection has a generation counter in Redis,
+which is part of the keys of its entries: a write increments it, so all the entries of the collection are dropped
+at once. The write is also published over Redis pub/sub, and `listen_for_invalidations` clears the in-process cache
+of that collection in the other workers. Without the Redis tier, writes made by other workers become visible
+after the TTL expires.
+"""
+
+import asyncio
+import copy
+import functools
+import json
+import logging
+import threading
+import uuid
+from collections.abc import Callable
+from typing import Any
+
+from cachetools import TTLCache
+from redis import asyncio as aioredis
+from redis.exceptions import RedisError
+
+from backend.constants import (
+    DEFAULT_CACHE_EXPIRATION,
+    REPOSITORY_CACHE_INVALIDATION_CHANNEL,
+    REPOSITORY_CACHE_KEY_PREFIX,
+    REPOSITORY_CACHE_MAXSIZE,
+    REPOSITORY_CACHE_TTL,
+)
+from backend.services.redis_cache_manager import RedisCacheManager
+
+logger = logging.getLogger(__name__)
+
+
+class RepositoryCache:
+    """Thread-safe in-process LRU cache with a TTL for the documents of one collection."""
+
+    def __init__(self, maxsize: int, ttl: int) -> None:
+        self.ttl = ttl
+        self._cache: TTLCache = TTLCache(maxsize=maxsize, ttl=ttl)
+        self._lock = threading.Lock()
+        # Incremented by clear(), so that a read started before a write doesn't cache what it loaded
+        self.generation = 0
+
+    def get(self, key: str) -> Any | None:
+        with self._lock:
+            value = self._cache.get(key)
+        # Return a copy: the callers are free to mutate the loaded models
+        return copy.deepcopy(value) if value is not None else None
+
+    def set(self, key: str, value: Any, generation: int | None = None) -> None:
+        """Cache the value, unless the cache was cleared since `generation` was read."""
+        value = copy.deepcopy(value)
+        with self._lock:
+            if generation is None or generation == self.generation:
+                self._cache[key] = value
+
+    def clear(self) -> None:
+        with self._lock:
+            self._cache.clear()
+            self.generation += 1
+
+
+_repository_caches: dict[str, RepositoryCache] = {}
+_repository_caches_lock = threading.Lock()
+
+
+def get_repository_cache(collection_name: str) -> RepositoryCache:
+    """Get (or create) the cache for the given collection."""
+    with _repository_caches_lock:
+        if collection_name not in _repository_caches:
+            ttl = REPOSITORY_CACHE_TTL.get(collection_name, DEFAULT_CACHE_EXPIRATION)
+            _repository_caches[collection_name] = RepositoryCache(maxsize=REPOSITORY_CACHE_MAXSIZE, ttl=ttl)
+        return _repository_caches[collection_name]
+
+
+def clear_repository_caches() -> None:
+    """Drop all cached reads of all collections."""
+    with _repository_caches_lock:
+        for cache in _repository_caches.values():
+            cache.clear()
+
+
+_redis_tier: RedisCacheManager | None = None
+# Identifies the invalidations published by this worker
+_origin_id = uuid.uuid4().hex
+
+
+def set_redis_tier(cache_manager: RedisCacheManager | None) -> None:
+    """Enable the Redis tier shared by the workers (or disable it with None)."""
+    global _redis_tier
+    _redis_tier = cache_manager
+
+
+async def listen_for_invalidations(redis: aioredis.Redis, retry_delay: float = 1.0) -> None:
+    """Clear the in-process caches of the collections written by the other workers. Runs until cancelled."""
+    while True:
+        try:
+            async with redis.pubsub(ignore_subscribe_messages=True) as pubsub:
+                await pubsub.subscribe(REPOSITORY_CACHE_INVALIDATION_CHANNEL)
+                # Collections may have changed while we weren't subscribed
+                clear_repository_caches()
+                async for message in pubsub.listen():
+                    _handle_invalidation(message["data"])
+        except RedisError as err:
+            logger.warning(f"Repository cache invalidation listener disconnected: {err}")
+            await asyncio.sleep(retry_delay)
+
+
+def _handle_invalidation(data: bytes | str) -> None:
+    message = json.loads(data)
+    if message["origin_id"] != _origin_id:
+        get_repository_cache(message["collection"]).clear()
+
+
+def _build_cache_key(method_name: str, args: tuple, kwargs: dict) -> str:
+    return f"{method_name}:{json.dumps([args, kwargs], sort_keys=True, default=str)}"
+
+
+def _generation_key(collection_name: str) -> str:
+    return f"{REPOSITORY_CACHE_KEY_PREFIX}{collection_name}:generation"
+
+
+async def _get_redis_key(redis_tier: RedisCacheManager, collection_name: str, key: str) -> str:
+    generation = await redis_tier.redis.get(_generation_key(collection_name))
+    return f"{REPOSITORY_CACHE_KEY_PREFIX}{collection_name}:{int(generation or 0)}:{key}"
+
+
+async def _invalidate_redis_tier(redis_tier: RedisCacheManager, collection_name: str) -> None:
+    try:
+        await redis_tier.redis.incr(_generation_key(collection_name))
+        message = json.dumps({"origin_id": _origin_id, "collection": collection_name})
+        await redis_tier.redis.publish(REPOSITORY_CACHE_INVALIDATION_CHANNEL, message)
+    except RedisError as err:
+        logger.warning(f"Could not invalidate the Redis cache of {collection_name}: {err}")
+
+
+def cached(method: Callable) -> Callable:
+    """Cache the result of a repository read method. Empty results (None) are not cached."""
+
+    @functools.wraps(method)
+    async def wrapper(self, *args, **kwargs):
+        cache = get_repository_cache(self.collection_name)
+        key = _build_cache_key(method.__name__, args, kwargs)
+        result = cache.get(key)
+        if result is not None:
+            return result
+
+        generation = cache.generation
+        redis_tier = _redis_tier
+        redis_key = None
+        if redis_tier:
+            try:
+                redis_key = await _get_redis_key(redis_tier, self.collection_name, key)
+                result = await redis_tier.get(redis_key)
+            except RedisError as err:
+                logger.warning(f"Could not read the Redis cache of {self.collection_name}: {err}")
+                redis_key = None
+
+        if result is None:
+            result = await method(self, *args, **kwargs)
+            if result is not None and redis_key:
+                try:
+                    await redis_tier.set(redis_key, result, expire=cache.ttl)  # type: ignore[union-attr]
+                except RedisError as err:
+                    logger.warning(f"Could not write the Redis cache of {self.collection_name}: {err}")
+        if result is not None:
+            cache.set(key, result, generation)
+        return result
+
+    return wrapper
+
+
+def invalidates_cache(method: Callable) -> Callable:
+    """Drop all cached reads of the collection after a repository write method."""
+
+    @functools.wraps(method)
+    async def wrapper(self, *args, **kwargs):
+        try:
+            return await method(self, *args, **kwargs)
+        finally:
+            get_repository_cache(self.collection_name).clear()
+            if _redis_tier:
+                await _invalidate_redis_tier(_redis_tier, self.collection_name)
+
+    return wrapper
@@ -1,38 +1,47 @@
-from firebase_admin import firestore
+from firebase_admin import firestore_async
 from google.cloud.firestore_v1 import FieldFilter
 
 from backend.models.session_config import SessionConfig
+from backend.repositories.pagination import order_by_timestamp
 
 
 class SessionConfigStorage:
     def __init__(self):
-        self.db = firestore.client()
+        self.db = firestore_async.client()
         self.collection_name = "session_configs"
 
-    def load_by_user_id(self, user_id: str | None = None) -> list[SessionConfig]:
+    async def load_by_user_id(
+        self, user_id: str | None = None, limit: int | None = None, cursor: str | None = None
+    ) -> list[SessionConfig]:
+        """Load the user's sessions, most recently used first. Pass `limit` and `cursor` to load a single page."""
         collection = self.db.collection(self.collection_name)
         query = collection.where(filter=FieldFilter("user_id", "==", user_id))
-        return [SessionConfig.model_validate(document_snapshot.to_dict()) for document_snapshot in query.stream()]
+        query = order_by_timestamp(query, limit, cursor)
+        return [
+            SessionConfig.model_validate(document_snapshot.to_dict()) async for document_snapshot in query.stream()
+        ]
 
-    def load_by_agency_id(self, agency_id: str) -> list[SessionConfig]:
+    async def load_by_agency_id(self, agency_id: str) -> list[SessionConfig]:
         collection = self.db.collection(self.collection_name)
         query = collection.where(filter=FieldFilter("agency_id", "==", agency_id))
-        return [SessionConfig.model_validate(document_snapshot.to_dict()) for document_snapshot in query.stream()]
+        return [
+            SessionConfig.model_validate(document_snapshot.to_dict()) async for document_snapshot in query.stream()
+        ]
 
-    def load_by_id(self, session_id: str) -> SessionConfig | None:
+    async def load_by_id(self, session_id: str) -> SessionConfig | None:
         collection = self.db.collection(self.collection_name)
-        document_snapshot = collection.document(session_id).get()
+        document_snapshot = await collection.document(session_id).get()
         return SessionConfig.model_validate(document_snapshot.to_dict()) if document_snapshot.exists else None
 
-    def save(self, session_config: SessionConfig) -> None:
+    async def save(self, session_config: SessionConfig) -> None:
         collection = self.db.collection(self.collection_name)
-        collection.document(session_config.id).set(session_config.model_dump())
+        await collection.document(session_config.id).set(session_config.model_dump())
 
-    def update(self, session_id: str, fields: dict[str, str]) -> None:
+    async def update(self, session_id: str, fields: dict[str, str]) -> None:
         """Update the session with the given fields."""
         collection = self.db.collection(self.collection_name)
-        collection.document(session_id).update(fields)
+        await collection.document(session_id).update(fields)
 
-    def delete(self, session_id: str) -> None:
+    async def delete(self, session_id: str) -> None:
         collection = self.db.collection(self.collection_name)
-        collection.document(session_id).delete()
+        await collection.document(session_id).delete()
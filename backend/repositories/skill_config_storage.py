@@ -1,51 +1,70 @@
-from firebase_admin import firestore
+from firebase_admin import firestore_async
 from google.cloud.firestore_v1 import FieldFilter
 
 from backend.models.skill_config import SkillConfig
+from backend.repositories.pagination import load_merged_by_user_ids, order_by_timestamp
+from backend.repositories.repository_cache import cached, invalidates_cache
 
 
 class SkillConfigStorage:
     def __init__(self):
-        self.db = firestore.client()
+        self.db = firestore_async.client()
         self.collection_name = "skill_configs"
 
-    def load_by_user_id(self, user_id: str | None = None) -> list[SkillConfig]:
+    @cached
+    async def load_by_user_id(
+        self, user_id: str | None = None, limit: int | None = None, cursor: str | None = None
+    ) -> list[SkillConfig]:
+        """Load the skills owned by the user (or the templates if user_id is None), newest first."""
         collection = self.db.collection(self.collection_name)
         query = collection.where(filter=FieldFilter("user_id", "==", user_id))
-        return [SkillConfig.model_validate(document_snapshot.to_dict()) for document_snapshot in query.stream()]
+        query = order_by_timestamp(query, limit, cursor)
+        return [SkillConfig.model_validate(document_snapshot.to_dict()) async for document_snapshot in query.stream()]
 
-    def load_by_id(self, id_: str) -> SkillConfig | None:
+    async def load_by_user_ids(
+        self, user_ids: list[str | None], limit: int | None = None, cursor: str | None = None
+    ) -> list[SkillConfig]:
+        """Load the skills of all given owners with concurrent queries, newest first."""
+        return await load_merged_by_user_ids(self.load_by_user_id, user_ids, limit, cursor)
+
+    @cached
+    async def load_by_id(self, id_: str) -> SkillConfig | None:
         collection = self.db.collection(self.collection_name)
-        document_snapshot = collection.document(id_).get()
+        document_snapshot = await collection.document(id_).get()
         return SkillConfig.model_validate(document_snapshot.to_dict()) if document_snapshot.exists else None
 
-    def load_by_titles(self, titles: list[str]) -> list[SkillConfig]:
+    @cached
+    async def load_by_titles(self, titles: list[str]) -> list[SkillConfig]:
         skills_db = []
         for i in range(0, len(titles), 10):
-            skills_db_batch = self._load_by_titles(titles[i : i + 10])
+            skills_db_batch = await self._load_by_titles(titles[i : i + 10])
             skills_db.extend(skills_db_batch)
         return skills_db
 
-    def _load_by_titles(self, titles: list[str]) -> list[SkillConfig]:
+    async def _load_by_titles(self, titles: list[str]) -> list[SkillConfig]:
         collection = self.db.collection(self.collection_name)
         # Firestore `in` query supports up to 10 items in the array.
         if len(titles) > 10:
             raise ValueError("Titles list exceeds the maximum size of 10 for an 'in' query in Firestore.")
 
         query = collection.where(filter=FieldFilter("title", "in", titles))
-        results = [SkillConfig.model_validate(document_snapshot.to_dict()) for document_snapshot in query.stream()]
+        results = [
+            SkillConfig.model_validate(document_snapshot.to_dict()) async for document_snapshot in query.stream()
+        ]
         return results
 
-    def save(self, skill_config: SkillConfig) -> tuple[str, int]:
+    @invalidates_cache
+    async def save(self, skill_config: SkillConfig) -> tuple[str, int]:
         collection = self.db.collection(self.collection_name)
         if skill_config.id is None:
             # Create a new document and set the id
-            document_reference = collection.add(skill_config.model_dump())[1]
+            document_reference = (await collection.add(skill_config.model_dump()))[1]
             skill_config.id = document_reference.id
-        collection.document(skill_config.id).set(skill_config.model_dump())
+        await collection.document(skill_config.id).set(skill_config.model_dump())
 
         return skill_config.id, skill_config.version
 
-    def delete(self, id_: str) -> None:
+    @invalidates_cache
+    async def delete(self, id_: str) -> None:
         collection = self.db.collection(self.collection_name)
-        collection.document(id_).delete()
+        await collection.document(id_).delete()
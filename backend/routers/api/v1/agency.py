@@ -13,6 +13,7 @@ from backend.models.response_models import (
     AgencyListResponse,
     GetAgencyResponse,
 )
+from backend.repositories.pagination import get_next_cursor
 from backend.services.adapters.agency_adapter import AgencyAdapter
 from backend.services.agency_manager import AgencyManager
 from backend.services.session_manager import SessionManager
@@ -30,11 +31,13 @@ async def get_agency_list(
     current_user: Annotated[User, Depends(get_current_user)],
     adapter: Annotated[AgencyAdapter, Depends(get_agency_adapter)],
     manager: AgencyManager = Depends(get_agency_manager),
+    limit: int | None = Query(None, ge=1, description="The maximum number of items to return"),
+    cursor: str | None = Query(None, description="The next_cursor value returned with the previous page"),
 ) -> AgencyListResponse:
     """Get the list of agencies"""
-    agencies = await manager.get_agency_list(current_user.id)
-    agencies_for_api = [adapter.to_api(agency) for agency in agencies]
-    return AgencyListResponse(data=agencies_for_api)
+    agencies = await manager.get_agency_list(current_user.id, limit=limit, cursor=cursor)
+    agencies_for_api = await adapter.to_api_many(agencies)
+    return AgencyListResponse(data=agencies_for_api, next_cursor=get_next_cursor(agencies, limit))
 
 
 @agency_router.get("/agency")
@@ -50,7 +53,7 @@ async def get_agency_config(
     agency_config = await manager.get_agency_config(id, current_user.id, allow_template=True)
 
     # Transform the internal model to the API model
-    config_for_api = adapter.to_api(agency_config)
+    config_for_api = await adapter.to_api(agency_config)
     return GetAgencyResponse(data=config_for_api)
 
 
@@ -68,7 +71,7 @@ async def create_or_update_agency(
     await manager.handle_agency_creation_or_update(config, current_user.id)
 
     agencies = await manager.get_agency_list(current_user.id)
-    agencies_for_api = [adapter.to_api(agency) for agency in agencies]
+    agencies_for_api = await adapter.to_api_many(agencies)
     return AgencyListResponse(message="Saved", data=agencies_for_api)
 
 
@@ -82,8 +85,8 @@ async def delete_agency(
 ) -> AgencyListResponse:
     """Delete an agency"""
     await manager.delete_agency(id, current_user.id)
-    session_manager.delete_sessions_by_agency_id(id)
+    await session_manager.delete_sessions_by_agency_id(id)
 
     agencies = await manager.get_agency_list(current_user.id)
-    agencies_for_api = [adapter.to_api(agency) for agency in agencies]
+    agencies_for_api = await adapter.to_api_many(agencies)
     return AgencyListResponse(message="Agency deleted", data=agencies_for_api)
@@ -13,6 +13,7 @@ from backend.models.response_models import (
     AgentListResponse,
     GetAgentResponse,
 )
+from backend.repositories.pagination import get_next_cursor
 from backend.services.adapters.agent_adapter import AgentAdapter
 from backend.services.agency_manager import AgencyManager
 from backend.services.agent_manager import AgentManager
@@ -33,11 +34,13 @@ async def get_agent_list(
     adapter: Annotated[AgentAdapter, Depends(get_agent_adapter)],
     manager: AgentManager = Depends(get_agent_manager),
     owned_by_user: bool = Query(False, description="Filter agents owned by the current user"),
+    limit: int | None = Query(None, ge=1, description="The maximum number of items to return"),
+    cursor: str | None = Query(None, description="The next_cursor value returned with the previous page"),
 ) -> AgentListResponse:
     """Get a list of agent configurations."""
-    configs = await manager.get_agent_list(current_user.id, owned_by_user=owned_by_user)
-    configs_for_api = [adapter.to_api(config) for config in configs]
-    return AgentListResponse(data=configs_for_api)
+    configs = await manager.get_agent_list(current_user.id, owned_by_user=owned_by_user, limit=limit, cursor=cursor)
+    configs_for_api = await adapter.to_api_many(configs)
+    return AgentListResponse(data=configs_for_api, next_cursor=get_next_cursor(configs, limit))
 
 
 @agent_router.get("/agent")
@@ -54,7 +57,7 @@ async def get_agent_config(
     # check if the current user is the owner of the agent
     if config.user_id and config.user_id != current_user.id:
         raise HTTPException(status_code=HTTPStatus.FORBIDDEN, detail="You don't have permissions to access this agent")
-    config_for_api = adapter.to_api(config)
+    config_for_api = await adapter.to_api(config)
     return GetAgentResponse(data=config_for_api)
 
 
@@ -72,7 +75,7 @@ async def create_or_update_agent(
     await manager.handle_agent_creation_or_update(internal_config, current_user.id)
 
     configs = await manager.get_agent_list(current_user.id)
-    configs_for_api = [adapter.to_api(config) for config in configs]
+    configs_for_api = await adapter.to_api_many(configs)
     return AgentListResponse(message="Saved", data=configs_for_api)
 
 
@@ -86,7 +89,7 @@ async def delete_agent(
 ) -> AgentListResponse:
     """Delete an agent configuration."""
     # Check if the agent is part of any team configurations
-    if agency_manager.is_agent_used_in_agencies(id):
+    if await agency_manager.is_agent_used_in_agencies(id):
         raise HTTPException(
             status_code=HTTPStatus.BAD_REQUEST,
             detail="Agent cannot be deleted as it is currently used in a team configuration",
@@ -95,5 +98,5 @@ async def delete_agent(
     await manager.delete_agent(id, current_user.id)
 
     configs = await manager.get_agent_list(current_user.id)
-    configs_for_api = [adapter.to_api(config) for config in configs]
+    configs_for_api = await adapter.to_api_many(configs)
     return AgentListResponse(message="Agent configuration deleted", data=configs_for_api)
@@ -1,22 +1,33 @@
 import asyncio
+import json
 import logging
+from collections.abc import AsyncIterator
 from typing import Annotated
 
+from agency_swarm import Agency
 from fastapi import APIRouter, Depends, HTTPException
+from fastapi.responses import StreamingResponse
+from openai import AuthenticationError as OpenAIAuthenticationError
 
 from backend.constants import INTERNAL_ERROR_MESSAGE
 from backend.dependencies.auth import get_current_user
 from backend.dependencies.dependencies import get_agency_manager, get_message_manager, get_session_manager
+from backend.exceptions import UnsetVariableError
 from backend.models.auth import User
 from backend.models.message import Message
 from backend.models.response_models import MessagePostResponse
 from backend.services.agency_manager import AgencyManager
+from backend.services.completion_scheduler import completion_scheduler
+from backend.services.completion_stream import stream_completion
 from backend.services.context_vars_manager import ContextEnvVarsManager
 from backend.services.message_manager import MessageManager
 from backend.services.session_manager import SessionManager
 
 logger = logging.getLogger(__name__)
 
+# The streamed completions still running after their client went away
+_background_completions: set[asyncio.Task] = set()
+
 message_router = APIRouter(
     responses={404: {"description": "Not found"}},
     tags=["message"],
@@ -34,10 +45,10 @@ async def get_message_list(
 ) -> list[Message]:
     """Get the list of messages for the given session_id."""
     # check if the current_user has permissions to send a message to the agency
-    session_config = session_manager.get_session(session_id)
+    session_config = await session_manager.get_session(session_id)
     session_manager.validate_session_ownership(session_config.user_id, current_user.id)
 
-    messages = message_manager.get_messages(session_id, limit=limit, before=before)
+    messages = await asyncio.to_thread(message_manager.get_messages, session_id, limit=limit, before=before)
     return messages
 
 
@@ -52,7 +63,7 @@ async def post_message(
     """Send a message to the User Proxy (the main agent) for the given agency_id and session_id."""
     session_id = request.session_id
 
-    session_config = session_manager.get_session(session_id)
+    session_config = await session_manager.get_session(session_id)
     agency_id = session_config.agency_id
 
     # Set the agency_id in the context variables
@@ -66,17 +77,102 @@ async def post_message(
     )
 
     try:
-        response = await asyncio.to_thread(
-            agency.get_completion, message=request.content, yield_messages=False, message_files=None
+        response = await completion_scheduler.run(
+            current_user.id, agency.get_completion, message=request.content, yield_messages=False, message_files=None
         )
     except Exception as e:
         logger.exception(f"Error sending message to agency {agency_id}, session {session_id}")
         raise HTTPException(status_code=500, detail=INTERNAL_ERROR_MESSAGE) from e
+    finally:
+        agency_manager.release_agency(agency)
 
     # update the session timestamp
-    session_manager.update_session_timestamp(session_id)
+    await session_manager.update_session_timestamp(session_id)
 
     # get the updated list of messages for the session
-    messages = message_manager.get_messages(session_id, limit=20)
+    messages = await asyncio.to_thread(message_manager.get_messages, session_id, limit=20)
 
     return MessagePostResponse(data=messages, response=response)
+
+
+@message_router.post("/message/stream")
+async def post_message_stream(
+    current_user: Annotated[User, Depends(get_current_user)],
+    request: Message,
+    agency_manager: AgencyManager = Depends(get_agency_manager),
+    session_manager: SessionManager = Depends(get_session_manager),
+) -> StreamingResponse:
+    """Send a message to the User Proxy (the main agent) for the given agency_id and session_id,
+    and stream the progress of the completion as Server-Sent Events.
+
+    The events are the ones sent over the websocket: `agent_status` (text and tool call deltas), `agent_message`
+    (the messages exchanged by the agents) and a final `agent_response` with the messages added to the session,
+    or an `error` event if the completion failed.
+    """
+    session_id = request.session_id
+
+    session_config = await session_manager.get_session(session_id)
+    agency_id = session_config.agency_id
+
+    # Set the agency_id in the context variables
+    ContextEnvVarsManager.set("agency_id", agency_id)
+
+    logger.info(f"Received a message to stream for agency_id: {agency_id}, session_id: {session_id}")
+
+    # permissions are checked in the agency_manager.get_agency method
+    agency, _ = await agency_manager.get_agency(
+        agency_id, thread_ids=session_config.thread_ids, user_id=current_user.id
+    )
+
+    await session_manager.update_session_timestamp(session_id)
+
+    events: asyncio.Queue[dict | None] = asyncio.Queue()
+    completion = asyncio.create_task(
+        _run_streamed_completion(current_user.id, agency_id, agency, request, agency_manager, events)
+    )
+    # The completion can't be interrupted: it runs to the end (and releases the agency) even if the client disconnects
+    _background_completions.add(completion)
+    completion.add_done_callback(_background_completions.discard)
+
+    return StreamingResponse(
+        _format_server_sent_events(events),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+async def _run_streamed_completion(
+    user_id: str,
+    agency_id: str,
+    agency: Agency,
+    request: Message,
+    agency_manager: AgencyManager,
+    events: asyncio.Queue[dict | None],
+) -> None:
+    """Run the completion, putting its events in the queue, followed by the final response (or error) and None."""
+    try:
+        new_messages = await stream_completion(
+            user_id, agency_id, agency, request.session_id, request.content, events.put
+        )
+        response = {
+            "status": True,
+            "message": "Message processed successfully",
+            "data": [message.model_dump() for message in new_messages],
+            "incremental": True,
+        }
+        await events.put({"type": "agent_response", "data": response})
+    except UnsetVariableError as exception:
+        await events.put({"type": "error", "data": {"status": False, "message": str(exception)}})
+    except OpenAIAuthenticationError as exception:
+        await events.put({"type": "error", "data": {"status": False, "message": exception.message}})
+    except Exception:
+        logger.exception(f"Error streaming message to agency {agency_id}, session {request.session_id}")
+        await events.put({"type": "error", "data": {"status": False, "message": INTERNAL_ERROR_MESSAGE}})
+    finally:
+        agency_manager.release_agency(agency)
+        await events.put(None)
+
+
+async def _format_server_sent_events(events: asyncio.Queue[dict | None]) -> AsyncIterator[str]:
+    while (event := await events.get()) is not None:
+        yield f"event: {event['type']}\ndata: {json.dumps(event['data'])}\n\n"
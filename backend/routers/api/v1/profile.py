@@ -2,7 +2,7 @@ import json
 import os
 from typing import Annotated
 
-from fastapi import APIRouter, Depends, Body
+from fastapi import APIRouter, Body, Depends
 from jsonref import requests
 
 from backend.dependencies.auth import get_current_user
@@ -23,7 +23,7 @@ async def get_user_profile(
     Retrieve profile data associated with the current user.
     This endpoint fetches profile data stored for the authenticated user.
     """
-    user_profile = user_profile_manager.get_user_profile(current_user.id)
+    user_profile = await user_profile_manager.get_user_profile(current_user.id)
     user_profile_data = {}
     if user_profile is not None:
         user_profile_data = {
@@ -47,7 +47,7 @@ async def update_user_profile(
 
     This endpoint allows for updating the user's profile data.
     """
-    user_profile = user_profile_manager.get_user_profile(current_user.id)
+    user_profile = await user_profile_manager.get_user_profile(current_user.id)
 
     previous_email_subscribe_value = user_profile.get('email_subscription') if user_profile is not None else ""
     requested_email_subscribe_value = user_profile_fields.get("email_subscription")
@@ -114,5 +114,5 @@ def update_mailchimp_subscription(url: str, headers: dict, data: dict, is_existi
 
 
 async def update_user_profile_in_db(user_profile_manager, user_id: str, fields: dict[str, str]):
-    user_profile_manager.update_user_profile(user_id=user_id, fields=fields)
-    return user_profile_manager.get_user_profile(user_id)
+    await user_profile_manager.update_user_profile(user_id=user_id, fields=fields)
+    return await user_profile_manager.get_user_profile(user_id)
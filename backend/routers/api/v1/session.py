@@ -9,6 +9,7 @@ from backend.dependencies.dependencies import get_agency_manager, get_session_ma
 from backend.models.auth import User
 from backend.models.request_models import RenameSessionRequest
 from backend.models.response_models import CreateSessionResponse, SessionListResponse
+from backend.repositories.pagination import get_next_cursor
 from backend.services.agency_manager import AgencyManager
 from backend.services.session_manager import SessionManager
 from backend.utils import sanitize_id
@@ -25,10 +26,12 @@ session_router = APIRouter(
 async def get_session_list(
     current_user: Annotated[User, Depends(get_current_user)],
     session_manager: SessionManager = Depends(get_session_manager),
+    limit: int | None = Query(None, ge=1, description="The maximum number of items to return"),
+    cursor: str | None = Query(None, description="The next_cursor value returned with the previous page"),
 ) -> SessionListResponse:
-    """Return a list of all sessions for the current user."""
-    sessions_for_api = session_manager.get_sessions_for_user(current_user.id)
-    return SessionListResponse(data=sessions_for_api)
+    """Return a list of sessions for the current user."""
+    sessions_for_api = await session_manager.get_sessions_for_user(current_user.id, limit=limit, cursor=cursor)
+    return SessionListResponse(data=sessions_for_api, next_cursor=get_next_cursor(sessions_for_api, limit))
 
 
 @session_router.post("/session")
@@ -46,11 +49,14 @@ async def create_session(
         agency_id, thread_ids=new_thread_ids, user_id=current_user.id
     )
 
-    session_id = session_manager.create_session(
-        agency, name=agency_config.name, agency_id=agency_id, user_id=current_user.id, thread_ids=new_thread_ids
-    )
+    try:
+        session_id = await session_manager.create_session(
+            agency, name=agency_config.name, agency_id=agency_id, user_id=current_user.id, thread_ids=new_thread_ids
+        )
+    finally:
+        agency_manager.release_agency(agency)
 
-    sessions_for_api = session_manager.get_sessions_for_user(current_user.id)
+    sessions_for_api = await session_manager.get_sessions_for_user(current_user.id)
     return CreateSessionResponse(data=sessions_for_api, session_id=session_id, message="Session created successfully")
 
 
@@ -64,11 +70,11 @@ async def rename_session(
     session_id = sanitize_id(payload.id)
     logger.info(f"Renaming session: {session_id}, user: {current_user.id}")
 
-    db_session = session_manager.get_session(session_id)
+    db_session = await session_manager.get_session(session_id)
     session_manager.validate_session_ownership(db_session.user_id, current_user.id)
-    session_manager.rename_session(session_id, payload.name)
+    await session_manager.rename_session(session_id, payload.name)
 
-    sessions_for_api = session_manager.get_sessions_for_user(current_user.id)
+    sessions_for_api = await session_manager.get_sessions_for_user(current_user.id)
     return SessionListResponse(message="Session renamed successfully", data=sessions_for_api)
 
 
@@ -81,7 +87,7 @@ async def delete_session(
     """Delete the session with the given id and return a list of all sessions for the current user."""
     logger.info(f"Deleting session: {id}, user: {current_user.id}")
 
-    session_manager.delete_session(id)
+    await session_manager.delete_session(id)
 
-    sessions_for_api = session_manager.get_sessions_for_user(current_user.id)
+    sessions_for_api = await session_manager.get_sessions_for_user(current_user.id)
     return SessionListResponse(message="Session deleted successfully", data=sessions_for_api)
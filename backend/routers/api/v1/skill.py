@@ -15,6 +15,7 @@ from backend.models.response_models import (
     SkillListResponse,
 )
 from backend.models.skill_config import SkillConfig
+from backend.repositories.pagination import get_next_cursor
 from backend.services.skill_executor import SkillExecutor
 from backend.services.skill_manager import SkillManager
 
@@ -23,8 +24,6 @@ logger = logging.getLogger(__name__)
 skill_router = APIRouter(tags=["skill"])
 
 
-# TODO: add pagination support for skill list
-
 # FIXME: current limitation on skills: we always use common skills (user_id=None).
 # TODO: support dynamic loading of skills (save skills in /approve to Python files in backend/custom_tools,
 #  and update the skill mapping).
@@ -34,10 +33,12 @@ skill_router = APIRouter(tags=["skill"])
 async def get_skill_list(
     current_user: Annotated[User, Depends(get_current_user)],
     manager: SkillManager = Depends(get_skill_manager),
+    limit: int | None = Query(None, ge=1, description="The maximum number of items to return"),
+    cursor: str | None = Query(None, description="The next_cursor value returned with the previous page"),
 ) -> SkillListResponse:
     """Get a list of configs for the skills the current user has access to."""
-    skills = manager.get_skill_list(current_user.id)
-    return SkillListResponse(data=skills)
+    skills = await manager.get_skill_list(current_user.id, limit=limit, cursor=cursor)
+    return SkillListResponse(data=skills, next_cursor=get_next_cursor(skills, limit))
 
 
 @skill_router.get("/skill")
@@ -49,7 +50,7 @@ async def get_skill_config(
     """Get a skill configuration by ID.
     NOTE: currently this endpoint is not used in the frontend.
     """
-    config = manager.get_skill_config(id)
+    config = await manager.get_skill_config(id)
     manager.check_user_permissions(config, current_user.id)
     return GetSkillResponse(data=config)
 
@@ -63,8 +64,8 @@ async def create_skill_version(
     """Create a new version of the skill configuration.
     NOTE: currently this endpoint is not fully supported.
     """
-    skill_id, skill_version = manager.create_skill_version(config, current_user.id)
-    configs = manager.get_skill_list(current_user.id)
+    skill_id, skill_version = await manager.create_skill_version(config, current_user.id)
+    configs = await manager.get_skill_list(current_user.id)
     return SkillListResponse(data=configs, message=f"Version {skill_version} of the skill {config.title} created")
 
 
@@ -75,8 +76,8 @@ async def delete_skill(
     manager: SkillManager = Depends(get_skill_manager),
 ):
     """Delete a skill configuration."""
-    manager.delete_skill(id, current_user.id)
-    configs = manager.get_skill_list(current_user.id)
+    await manager.delete_skill(id, current_user.id)
+    configs = await manager.get_skill_list(current_user.id)
     return SkillListResponse(data=configs, message="Skill configuration deleted")
 
 
@@ -101,7 +102,7 @@ async def execute_skill(
 ) -> ExecuteSkillResponse:
     """Execute a skill by using the user prompt as input to GPT-4, which fills in the skill kwargs.
     Returns the output of the skill."""
-    config = manager.get_skill_config(payload.id)
+    config = await manager.get_skill_config(payload.id)
     manager.check_user_permissions(config, current_user.id)
 
     # check if the current_user has permissions to execute the skill
@@ -1,3 +1,4 @@
+import asyncio
 from typing import Annotated
 
 from fastapi import APIRouter, Body, Depends
@@ -21,7 +22,7 @@ async def get_variables(
     This endpoint fetches the names of all variables stored for the authenticated user. It does not return the values,
     ensuring sensitive information remains secure.
     """
-    user_variables = user_variable_manager.get_variable_names(current_user.id)
+    user_variables = await asyncio.to_thread(user_variable_manager.get_variable_names, current_user.id)
     return UserVariablesResponse(data=user_variables)
 
 
@@ -38,10 +39,10 @@ async def update_variables(
     Existing variables are updated based on the keys provided in the request body.
     This functionality supports partial updates; items variables "" values remain unchanged.
     """
-    response = user_variable_manager.create_or_update_variables(user_id=current_user.id, variables=user_variables)
+    response = await user_variable_manager.create_or_update_variables(user_id=current_user.id, variables=user_variables)
     message = "Variables updated successfully"
     if not response:
         message = "Please delete all agents and teams to update the Open AI API key"
 
-    user_variable_names = user_variable_manager.get_variable_names(current_user.id)
+    user_variable_names = await asyncio.to_thread(user_variable_manager.get_variable_names, current_user.id)
     return UserVariablesResponse(status=response, message=message, data=user_variable_names)
@@ -1,4 +1,5 @@
 from backend.models.agency_config import AgencyConfig, AgencyConfigForAPI, CommunicationFlow
+from backend.models.agent_flow_spec import AgentFlowSpecForAPI
 from backend.repositories.agent_flow_spec_storage import AgentFlowSpecStorage
 from backend.services.adapters.agent_adapter import AgentAdapter
 
@@ -41,7 +42,7 @@ class AgencyAdapter:
         agency_config_dict["agency_chart"] = agency_chart
         return AgencyConfig(**agency_config_dict)
 
-    def to_api(self, agency_config: AgencyConfig) -> AgencyConfigForAPI:
+    async def to_api(self, agency_config: AgencyConfig) -> AgencyConfigForAPI:
         """
         Converts the `agents` field with a list of IDs and `main_agent` and `agency_chart` fields with names
         of the agents (AgencyConfig Pydantic model) into AgentFlowSpec objects in the `flows` field
@@ -49,26 +50,43 @@ class AgencyAdapter:
         Uses the agent_flow_spec_storage.load_by_ids method to get the AgentFlowSpec objects.
         The `receiver` field is optional if there is only one row in the flow list.
         """
+        return (await self.to_api_many([agency_config]))[0]
+
+    async def to_api_many(self, agency_configs: list[AgencyConfig]) -> list[AgencyConfigForAPI]:
+        """
+        Converts a batch of agencies to the API format.
+        The agents of all agencies (and their skills) are loaded at once and then distributed
+        from an in-memory index.
+        """
+        agent_ids = list(dict.fromkeys(agent_id for config in agency_configs for agent_id in config.agents))
+        agent_list = await self.agent_flow_spec_storage.load_by_ids(agent_ids) if agent_ids else []
+        agent_list_for_api = await self.agent_adapter.to_api_many(agent_list)
+        agents_by_id = {agent.id: agent for agent in agent_list_for_api}
+
+        return [self._build_agency_config_for_api(agency_config, agents_by_id) for agency_config in agency_configs]
+
+    @staticmethod
+    def _build_agency_config_for_api(
+        agency_config: AgencyConfig, agents_by_id: dict[str, AgentFlowSpecForAPI]
+    ) -> AgencyConfigForAPI:
         if not agency_config.agents:
             return AgencyConfigForAPI(**agency_config.model_dump())
 
-        agent_list = self.agent_flow_spec_storage.load_by_ids(agency_config.agents)
-        agents = {agent.config.name: agent for agent in agent_list}
+        agents = {
+            agents_by_id[agent_id].config.name: agents_by_id[agent_id]
+            for agent_id in agency_config.agents
+            if agent_id in agents_by_id
+        }
 
         flows = []
         if agency_config.agency_chart:
             for sender_name, receiver_name in agency_config.agency_chart.values():
                 sender = agents[sender_name]
                 receiver = agents[receiver_name] if receiver_name else None
-                flow = CommunicationFlow(
-                    sender=self.agent_adapter.to_api(sender),
-                    receiver=self.agent_adapter.to_api(receiver) if receiver else None,
-                )
-                flows.append(flow)
+                flows.append(CommunicationFlow(sender=sender, receiver=receiver))
         else:
             main_agent = agents[agency_config.main_agent]
-            flow = CommunicationFlow(sender=self.agent_adapter.to_api(main_agent))
-            flows.append(flow)
+            flows.append(CommunicationFlow(sender=main_agent))
 
         agency_config_dict = agency_config.model_dump()
         agency_config_dict["flows"] = flows
@@ -1,4 +1,7 @@
+from collections import defaultdict
+
 from backend.models.agent_flow_spec import AgentFlowSpec, AgentFlowSpecForAPI
+from backend.models.skill_config import SkillConfig
 from backend.repositories.skill_config_storage import SkillConfigStorage
 
 
@@ -23,16 +26,29 @@ class AgentAdapter:
         agent_flow_spec_dict["skills"] = skill_names
         return AgentFlowSpec.model_validate(agent_flow_spec_dict)
 
-    def to_api(self, agent_flow_spec: AgentFlowSpec) -> AgentFlowSpecForAPI:
+    async def to_api(self, agent_flow_spec: AgentFlowSpec) -> AgentFlowSpecForAPI:
         """
         Converts the `skills` field from a list of strings to a list of SkillConfig objects.
         """
-        if not agent_flow_spec.skills:
-            return AgentFlowSpecForAPI.model_validate(agent_flow_spec.model_dump())
-
-        skill_configs = self.skill_config_storage.load_by_titles(agent_flow_spec.skills)
+        return (await self.to_api_many([agent_flow_spec]))[0]
 
-        agent_flow_spec_dict = agent_flow_spec.model_dump()
-        agent_flow_spec_dict["skills"] = skill_configs
-        agent_flow_spec_new = AgentFlowSpecForAPI.model_validate(agent_flow_spec_dict)
-        return agent_flow_spec_new
+    async def to_api_many(self, agent_flow_specs: list[AgentFlowSpec]) -> list[AgentFlowSpecForAPI]:
+        """
+        Converts a batch of agents to the API format.
+        The skills of all agents are loaded at once and then distributed from an in-memory index.
+        """
+        skill_titles = list(dict.fromkeys(title for spec in agent_flow_specs for title in spec.skills))
+        skill_configs = await self.skill_config_storage.load_by_titles(skill_titles) if skill_titles else []
+
+        skills_by_title: dict[str, list[SkillConfig]] = defaultdict(list)
+        for skill_config in skill_configs:
+            skills_by_title[skill_config.title].append(skill_config)
+
+        agent_flow_specs_for_api = []
+        for agent_flow_spec in agent_flow_specs:
+            agent_flow_spec_dict = agent_flow_spec.model_dump()
+            agent_flow_spec_dict["skills"] = [
+                skill_config for title in agent_flow_spec.skills for skill_config in skills_by_title[title]
+            ]
+            agent_flow_specs_for_api.append(AgentFlowSpecForAPI.model_validate(agent_flow_spec_dict))
+        return agent_flow_specs_for_api
@@ -14,17 +14,31 @@ class SessionAdapter:
         self.agency_config_storage = agency_config_storage
         self.agency_adapter = agency_adapter
 
-    def to_api(self, session_config: SessionConfig) -> SessionConfigForAPI:
+    async def to_api(self, session_config: SessionConfig) -> SessionConfigForAPI:
         """
         Converts the SessionConfig model to the API model.
         """
-        agency_config = self.agency_config_storage.load_by_id(session_config.agency_id)
-        if agency_config is None:
-            raise NotFoundError("Agency", session_config.agency_id)
+        return (await self.to_api_many([session_config]))[0]
 
-        agency_config_for_api = self.agency_adapter.to_api(agency_config)
+    async def to_api_many(self, session_configs: list[SessionConfig]) -> list[SessionConfigForAPI]:
+        """
+        Converts a batch of sessions to the API model.
+        The agencies are deduplicated and loaded in one batch; their agents and skills are loaded in one batch too.
+        Each agency is converted once and the result is shared by all sessions that use it.
+        """
+        agency_ids = list(dict.fromkeys(session_config.agency_id for session_config in session_configs))
+        agency_config_list = await self.agency_config_storage.load_by_ids(agency_ids)
+        agency_configs = {agency_config.id: agency_config for agency_config in agency_config_list}
+        for agency_id in agency_ids:
+            if agency_id not in agency_configs:
+                raise NotFoundError("Agency", agency_id)
+
+        agency_configs_for_api = await self.agency_adapter.to_api_many([agency_configs[id_] for id_ in agency_ids])
+        agencies_by_id = dict(zip(agency_ids, agency_configs_for_api, strict=True))
 
-        session_config_dict = session_config.model_dump()
-        session_config_dict["flow_config"] = agency_config_for_api
-        session_config_new = SessionConfigForAPI.model_validate(session_config_dict)
-        return session_config_new
+        sessions_for_api = []
+        for session_config in session_configs:
+            session_config_dict = session_config.model_dump()
+            session_config_dict["flow_config"] = agencies_by_id[session_config.agency_id]
+            sessions_for_api.append(SessionConfigForAPI.model_validate(session_config_dict))
+        return sessions_for_api
@@ -1,23 +1,26 @@
-import json
+import asyncio
 import logging
 from datetime import UTC, datetime
 from http import HTTPStatus
 from typing import Any
 
 from agency_swarm import Agency, Agent
-from cachetools import LRUCache
 from fastapi import HTTPException
 
+from backend.constants import AGENCY_POOL_MAX_IDLE_INSTANCES, AGENCY_POOL_MAXSIZE, AGENCY_POOL_TTL
 from backend.exceptions import NotFoundError
 from backend.models.agency_config import AgencyConfig
+from backend.models.agent_flow_spec import AgentFlowSpec
 from backend.repositories.agency_config_storage import AgencyConfigStorage
+from backend.services.agency_pool import AgencyPool, bind_threads
 from backend.services.agent_manager import AgentManager
 from backend.services.user_variable_manager import UserVariableManager
-from backend.utils import hash_string
 
 logger = logging.getLogger(__name__)
 
-agency_cache: LRUCache = LRUCache(maxsize=1000)
+agency_pool = AgencyPool(
+    maxsize=AGENCY_POOL_MAXSIZE, ttl=AGENCY_POOL_TTL, max_idle_instances=AGENCY_POOL_MAX_IDLE_INSTANCES
+)
 
 
 class AgencyManager:
@@ -31,17 +34,16 @@ class AgencyManager:
         self.agent_manager = agent_manager
         self.user_variable_manager = user_variable_manager
 
-    async def get_agency_list(self, user_id: str) -> list[AgencyConfig]:
-        """Get the list of agencies for the user. It will return the agencies for the user and the templates."""
-        user_agencies = self.storage.load_by_user_id(user_id)
-        template_agencies = self.storage.load_by_user_id(None)
-        agencies = user_agencies + template_agencies
-        sorted_agencies = sorted(agencies, key=lambda x: x.timestamp, reverse=True)
-        return sorted_agencies
+    async def get_agency_list(
+        self, user_id: str, limit: int | None = None, cursor: str | None = None
+    ) -> list[AgencyConfig]:
+        """Get the list of agencies for the user. It will return the agencies for the user and the templates,
+        newest first. If limit is set, only the page following the cursor is returned."""
+        return await self.storage.load_by_user_ids([user_id, None], limit=limit, cursor=cursor)
 
     async def get_agency_config(self, id_: str, user_id: str, allow_template: bool = False) -> AgencyConfig:
         """Get the agency configuration by ID."""
-        agency_config = self.storage.load_by_id(id_)
+        agency_config = await self.storage.load_by_id(id_)
         if not agency_config:
             raise NotFoundError("Agency", id_)
         self.validate_agency_ownership(agency_config.user_id, user_id, allow_template=allow_template)
@@ -50,15 +52,21 @@ class AgencyManager:
     async def get_agency(
         self, id_: str, thread_ids: dict[str, Any], user_id: str, allow_template: bool = False
     ) -> tuple[Agency, AgencyConfig]:
-        """Get the agency from the Firestore. It will construct the agency and update the assistants."""
+        """Get the agency from the Firestore. It will construct the agency and update the assistants.
+        Once the session is done with the agency, pass it to `release_agency` so that other sessions can reuse it."""
         agency_config = await self.get_agency_config(id_, user_id, allow_template=allow_template)
 
         agency = await self._construct_agency_and_update_assistants(agency_config, thread_ids)
         return agency, agency_config
 
-    def is_agent_used_in_agencies(self, agent_id: str) -> bool:
+    @staticmethod
+    def release_agency(agency: Agency) -> None:
+        """Return the agency obtained from `get_agency` to the pool."""
+        agency_pool.release(agency)
+
+    async def is_agent_used_in_agencies(self, agent_id: str) -> bool:
         """Check if the agent is part of any agency configurations."""
-        return len(self.storage.load_by_agent_id(agent_id)) > 0
+        return len(await self.storage.load_by_agent_id(agent_id)) > 0
 
     async def handle_agency_creation_or_update(self, config: AgencyConfig, current_user_id: str) -> str:
         """Handle the agency creation or update. It will check the permissions and update the agency in the Firestore
@@ -71,36 +79,34 @@ class AgencyManager:
 
         # Check permissions
         if config.id:
-            config_db = self.storage.load_by_id(config.id)
+            config_db = await self.storage.load_by_id(config.id)
             if not config_db:
                 raise NotFoundError("Agency", config.id)
             self.validate_agency_ownership(config_db.user_id, current_user_id)
-        self._validate_agent_ownership(config.agents, current_user_id)
+        await self._validate_agent_ownership(config.agents, current_user_id)
 
         # Ensure the agency is associated with the current user
         config.user_id = current_user_id
         config.timestamp = datetime.now(UTC).isoformat()
 
-        return await self._create_or_update_agency(config)
+        agency_id = await self._create_or_update_agency(config)
+        agency_pool.discard(agency_id)
+        return agency_id
 
-    async def _load_and_construct_agents(self, agency_config: AgencyConfig) -> dict[str, Agent]:
-        agents = {}
-        for agent_id in agency_config.agents:
-            get_result = await self.agent_manager.get_agent(agent_id)
-            if get_result:
-                agent, agent_flow_spec = get_result
-                agents[agent_flow_spec.config.name] = agent
-            else:
-                logger.error(f"Agent with id {agent_id} not found.")
-        return agents
+    async def _construct_agents(self, agent_configs: list[AgentFlowSpec]) -> dict[str, Agent]:
+        agents = await self.agent_manager.construct_agents(agent_configs)
+        return {
+            agent_flow_spec.config.name: agent for agent, agent_flow_spec in zip(agents, agent_configs, strict=True)
+        }
 
     async def delete_agency(self, agency_id: str, current_user_id: str) -> None:
         """Delete the agency from the Firestore."""
-        agency_config = self.storage.load_by_id(agency_id)
+        agency_config = await self.storage.load_by_id(agency_id)
         if not agency_config:
             raise NotFoundError("Agency", agency_id)
         self.validate_agency_ownership(agency_config.user_id, current_user_id)
-        self.storage.delete(agency_id)
+        await self.storage.delete(agency_id)
+        agency_pool.discard(agency_id)
 
     @staticmethod
     def validate_agency_ownership(
@@ -117,7 +123,7 @@ class AgencyManager:
     async def _create_or_update_agency(self, agency_config: AgencyConfig) -> str:
         """Update or create the agency. It will update the agency in the Firestore."""
         AgencyConfig.model_validate(agency_config.model_dump())
-        return self.storage.save(agency_config)
+        return await self.storage.save(agency_config)
 
     async def _construct_agency_and_update_assistants(
         self, agency_config: AgencyConfig, thread_ids: dict[str, Any]
@@ -127,14 +133,21 @@ class AgencyManager:
         Gets the agency config from the Firestore, constructs agents and agency
         (agency-swarm also updates assistants). Returns the Agency instance if successful, otherwise None.
         """
-        # Check if the agency is already in the cache
-        agency_config_str = agency_config.model_dump_json()
-        thread_ids_str = json.dumps(thread_ids)
-        cache_key = hash_string(agency_config_str + thread_ids_str)
-        if cache_key in agency_cache:
-            return agency_cache[cache_key]
+        # Reuse an idle agency of the same version, rebinding it to the threads of this session.
+        # The version includes the agents' timestamps, so that editing an agent isn't hidden by a pooled agency.
+        agent_configs = await self.agent_manager.get_agent_configs(agency_config.agents)
+        agency_version = (
+            agency_config.id,
+            agency_config.timestamp,
+            tuple((agent_config.id, agent_config.timestamp) for agent_config in agent_configs),
+        )
+        agency = agency_pool.acquire(agency_version)
+        if agency:
+            await asyncio.to_thread(bind_threads, agency, thread_ids)
+            return agency
 
-        agents = await self._load_and_construct_agents(agency_config)
+        logger.debug(f"Constructing agency {agency_config.id}, pool: {agency_pool.get_stats()}")
+        agents = await self._construct_agents(agent_configs)
 
         agency_chart = []
         if agents and agency_config.main_agent:
@@ -152,17 +165,14 @@ class AgencyManager:
                 {"load": lambda: thread_ids, "save": lambda x: thread_ids.update(x)} if thread_ids is not None else None
             ),
         )
-
-        # Store the constructed agency in the cache
-        agency_cache[cache_key] = agency
-
+        agency_pool.add(agency_version, agency)
         return agency
 
-    def _validate_agent_ownership(self, agents: list[str], current_user_id: str) -> None:
+    async def _validate_agent_ownership(self, agents: list[str], current_user_id: str) -> None:
         """Validate the agent ownership. It will check if the current user has permissions to use the agents."""
         # check that all used agents belong to the current user
         for agent_id in agents:
-            agent_flow_spec = self.agent_manager.storage.load_by_id(agent_id)
+            agent_flow_spec = await self.agent_manager.storage.load_by_id(agent_id)
             if not agent_flow_spec:
                 raise HTTPException(status_code=HTTPStatus.BAD_REQUEST, detail=f"Agent not found: {agent_id}")
             if agent_flow_spec.user_id != current_user_id:
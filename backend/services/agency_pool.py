@@ -0,0 +1,108 @@
+import logging
+import threading
+import weakref
+from typing import Any
+
+from agency_swarm import Agency
+from cachetools import TTLCache
+
+logger = logging.getLogger(__name__)
+
+# (agency id, agency config timestamp, (agent id, agent config timestamp) of each agent)
+AgencyVersion = tuple[str, str, tuple[tuple[str, str], ...]]
+
+
+class AgencyPool:
+    """A pool of constructed Agency instances, keyed by the agency version (the timestamps of its configs).
+
+    An Agency holds the threads of a single session, so an instance is used by one session at a time:
+    `acquire` takes an idle instance out of the pool (or `add` registers a newly constructed one),
+    and `release` puts it back when the session is done with it. An instance that is never released is simply
+    garbage collected. A version expires `ttl` seconds after it was first pooled, however busy it is,
+    and at most `maxsize` versions are kept (LRU).
+    """
+
+    def __init__(self, maxsize: int, ttl: int, max_idle_instances: int) -> None:
+        self._idle_agencies: TTLCache[AgencyVersion, list[Agency]] = TTLCache(maxsize=maxsize, ttl=ttl)
+        self._leased_agencies: weakref.WeakKeyDictionary[Agency, AgencyVersion] = weakref.WeakKeyDictionary()
+        self._max_idle_instances = max_idle_instances
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def acquire(self, version: AgencyVersion) -> Agency | None:
+        """Take an idle agency of the given version out of the pool. Returns None if there is none."""
+        with self._lock:
+            idle_agencies = self._idle_agencies.get(version)
+            if not idle_agencies:
+                self.misses += 1
+                return None
+            self.hits += 1
+            agency = idle_agencies.pop()
+            self._leased_agencies[agency] = version
+            return agency
+
+    def add(self, version: AgencyVersion, agency: Agency) -> None:
+        """Register a newly constructed agency of the given version as leased."""
+        with self._lock:
+            self._leased_agencies[agency] = version
+
+    def release(self, agency: Agency) -> None:
+        """Return a leased agency to the pool, so that another session can reuse it."""
+        with self._lock:
+            version = self._leased_agencies.pop(agency, None)
+            if version is None:
+                return
+            idle_agencies = self._idle_agencies.get(version)
+            if idle_agencies is None:
+                self._idle_agencies[version] = [agency]
+            elif len(idle_agencies) < self._max_idle_instances:
+                # Updated in place: setting the item again would restart its TTL
+                idle_agencies.append(agency)
+
+    def discard(self, agency_id: str) -> None:
+        """Remove all versions of the agency from the pool. Leased instances are not returned to the pool."""
+        with self._lock:
+            for version in [version for version in self._idle_agencies if version[0] == agency_id]:
+                del self._idle_agencies[version]
+            for agency in [agency for agency, version in self._leased_agencies.items() if version[0] == agency_id]:
+                del self._leased_agencies[agency]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._idle_agencies.clear()
+            self._leased_agencies.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def get_stats(self) -> dict[str, int]:
+        """Return the pool size and hit/miss counters."""
+        with self._lock:
+            self._idle_agencies.expire()
+            return {
+                "versions": len(self._idle_agencies),
+                "idle_agencies": sum(len(idle_agencies) for idle_agencies in self._idle_agencies.values()),
+                "leased_agencies": len(self._leased_agencies),
+                "hits": self.hits,
+                "misses": self.misses,
+            }
+
+
+def bind_threads(agency: Agency, thread_ids: dict[str, Any] | None) -> None:
+    """Bind the agency to the threads of another session: load the thread ids from `thread_ids`
+    (creating the missing threads) and save the new ones back to it.
+    The state shared by the agents and their tools is reset, so that nothing leaks from the previous session."""
+    # Cleared in place: the agents hold a reference to the same SharedState
+    agency.shared_state.data.clear()
+    agency.threads_callbacks = (
+        {"load": lambda: thread_ids, "save": lambda x: thread_ids.update(x)} if thread_ids is not None else None
+    )
+    # Agency._init_threads expects the agents_and_threads structure built by Agency._parse_agency_chart
+    agency.agents_and_threads = {
+        agent_name: {
+            other_agent: {"agent": thread.agent.name, "recipient_agent": thread.recipient_agent.name}
+            for other_agent, thread in threads.items()
+        }
+        for agent_name, threads in agency.agents_and_threads.items()
+    }
+    agency._init_threads()
@@ -1,12 +1,15 @@
 import asyncio
+import copy
 import logging
+import threading
 from datetime import UTC, datetime
 from http import HTTPStatus
 
 from agency_swarm import Agent
+from cachetools import LRUCache
 from fastapi import HTTPException
 
-from backend.constants import DEFAULT_OPENAI_API_TIMEOUT
+from backend.constants import AGENT_CACHE_MAXSIZE, AGENT_CONSTRUCTION_CONCURRENCY, DEFAULT_OPENAI_API_TIMEOUT
 from backend.custom_skills import SKILL_MAPPING
 from backend.exceptions import NotFoundError
 from backend.models.agent_flow_spec import AgentFlowSpec
@@ -14,10 +17,15 @@ from backend.models.skill_config import SkillConfig
 from backend.repositories.agent_flow_spec_storage import AgentFlowSpecStorage
 from backend.repositories.skill_config_storage import SkillConfigStorage
 from backend.services.oai_client import get_openai_client
+from backend.services.platform_agent import PlatformAgent
 from backend.services.user_variable_manager import UserVariableManager
 
 logger = logging.getLogger(__name__)
 
+# Constructed agents by (agent id, config timestamp). Agents are handed out as copies, see AgentManager._copy_agent
+agent_cache: LRUCache = LRUCache(maxsize=AGENT_CACHE_MAXSIZE)
+agent_cache_lock = threading.Lock()
+
 
 class AgentManager:
     def __init__(
@@ -38,20 +46,40 @@ class AgentManager:
             self._openai_client = get_openai_client(self.user_variable_manager)
         return self._openai_client
 
-    async def get_agent_list(self, user_id: str, owned_by_user: bool = False) -> list[AgentFlowSpec]:
-        user_configs = self.storage.load_by_user_id(user_id)
-        template_configs = self.storage.load_by_user_id(None) if not owned_by_user else []
-        agents = user_configs + template_configs
-        sorted_agents = sorted(agents, key=lambda x: x.timestamp, reverse=True)
-        return sorted_agents
+    async def get_agent_list(
+        self, user_id: str, owned_by_user: bool = False, limit: int | None = None, cursor: str | None = None
+    ) -> list[AgentFlowSpec]:
+        user_ids = [user_id] if owned_by_user else [user_id, None]
+        return await self.storage.load_by_user_ids(user_ids, limit=limit, cursor=cursor)
 
     async def get_agent(self, agent_id: str) -> tuple[Agent, AgentFlowSpec]:
-        config = self.storage.load_by_id(agent_id)
+        config = await self.storage.load_by_id(agent_id)
         if not config:
             raise NotFoundError("Agent", agent_id)
-        agent = await asyncio.to_thread(self._construct_agent, config)
+        agent = await asyncio.to_thread(self._get_or_construct_agent, config)
         return agent, config
 
+    async def get_agent_configs(self, agent_ids: list[str]) -> list[AgentFlowSpec]:
+        """Load the agent configs in a single query, in the order of agent_ids, skipping the ones that are not found."""
+        configs_by_id = {config.id: config for config in await self.storage.load_by_ids(agent_ids)}
+        configs = []
+        for agent_id in agent_ids:
+            if agent_id in configs_by_id:
+                configs.append(configs_by_id[agent_id])
+            else:
+                logger.error(f"Agent with id {agent_id} not found.")
+        return configs
+
+    async def construct_agents(self, configs: list[AgentFlowSpec]) -> list[Agent]:
+        """Construct the agents concurrently (or take them from the cache), in the order of the configs."""
+        semaphore = asyncio.Semaphore(AGENT_CONSTRUCTION_CONCURRENCY)
+
+        async def construct_agent(config: AgentFlowSpec) -> Agent:
+            async with semaphore:
+                return await asyncio.to_thread(self._get_or_construct_agent, config)
+
+        return list(await asyncio.gather(*(construct_agent(config) for config in configs)))
+
     async def handle_agent_creation_or_update(self, config: AgentFlowSpec, current_user_id: str) -> str:
         """Create or update an agent. If the agent already exists, it will be updated."""
         # Support template configs
@@ -61,29 +89,37 @@ class AgentManager:
 
         # Check permissions and validate agent name
         if config.id:
-            config_db = self.storage.load_by_id(config.id)
+            config_db = await self.storage.load_by_id(config.id)
             if not config_db:
                 raise NotFoundError("Agent", config.id)
             self._validate_agent_ownership(config_db, current_user_id)
             self._validate_agent_name(config, config_db)
+            config.assistant_fingerprint = config_db.assistant_fingerprint
 
         # Ensure the agent is associated with the current user
         config.user_id = current_user_id
         config.timestamp = datetime.now(UTC).isoformat()
 
         # Validate skills
-        skills_db = self.skill_storage.load_by_titles(config.skills)
+        skills_db = await self.skill_storage.load_by_titles(config.skills)
         self._validate_skills(config.skills, skills_db)
 
-        return await self._create_or_update_agent(config)
+        agent_id = await self._create_or_update_agent(config)
+        self.invalidate_agent_cache(agent_id)
+        return agent_id
 
     async def delete_agent(self, agent_id: str, current_user_id: str) -> None:
-        config = self.storage.load_by_id(agent_id)
+        config = await self.storage.load_by_id(agent_id)
         if not config:
             raise NotFoundError("Agent", agent_id)
         self._validate_agent_ownership(config, current_user_id)
-        self.storage.delete(agent_id)
+        await self.storage.delete(agent_id)
+        self.invalidate_agent_cache(agent_id)
+
+        await asyncio.to_thread(self._delete_assistant_via_api, agent_id)
 
+    def _delete_assistant_via_api(self, agent_id: str) -> None:
+        """Delete the OpenAI assistant. Blocking: the client is created from the user's variables."""
         self.openai_client.beta.assistants.delete(assistant_id=agent_id, timeout=DEFAULT_OPENAI_API_TIMEOUT)
 
     async def _create_or_update_agent(self, config: AgentFlowSpec) -> str:
@@ -93,13 +129,44 @@ class AgentManager:
             config.config.name = f"{config.config.name} ({config.user_id})"
 
         agent = await asyncio.to_thread(self._construct_agent, config)
-        await asyncio.to_thread(agent.init_oai)  # initialize the openai agent to get the id
+        # initialize the openai agent to get the id; skipped if the assistant settings are unchanged
+        await asyncio.to_thread(agent.init_oai)
         config.id = agent.id
-        self.storage.save(config)
+        config.assistant_fingerprint = agent.assistant_fingerprint
+        await self.storage.save(config)
         return agent.id
 
-    def _construct_agent(self, agent_flow_spec: AgentFlowSpec) -> Agent:
-        agent = Agent(
+    @staticmethod
+    def invalidate_agent_cache(agent_id: str) -> None:
+        """Remove all the constructed versions of the agent from the cache."""
+        with agent_cache_lock:
+            for key in [key for key in agent_cache if key[0] == agent_id]:
+                del agent_cache[key]
+
+    def _get_or_construct_agent(self, agent_flow_spec: AgentFlowSpec) -> Agent:
+        """Get a copy of the cached agent for this version of the config, constructing the agent on a cache miss."""
+        cache_key = (agent_flow_spec.id, agent_flow_spec.timestamp)
+        with agent_cache_lock:
+            agent = agent_cache.get(cache_key)
+        if agent is None:
+            agent = self._construct_agent(agent_flow_spec)
+            with agent_cache_lock:
+                agent_cache[cache_key] = agent
+        return self._copy_agent(agent)
+
+    @staticmethod
+    def _copy_agent(agent: Agent) -> Agent:
+        """Copy the agent, so that the Agency can add the shared instructions and tools to it
+        without changing the cached agent. The OpenAI client and the uploaded files are shared."""
+        agent_copy = copy.copy(agent)
+        agent_copy.tools = agent.tools[:]
+        agent_copy.tool_resources = copy.deepcopy(agent.tool_resources)
+        agent_copy.files_folder = copy.copy(agent.files_folder)
+        agent_copy.metadata = agent.metadata.copy()
+        return agent_copy
+
+    def _construct_agent(self, agent_flow_spec: AgentFlowSpec) -> PlatformAgent:
+        agent = PlatformAgent(
             id=agent_flow_spec.id,
             name=agent_flow_spec.config.name,
             description=agent_flow_spec.description,
@@ -108,6 +175,7 @@ class AgentManager:
             tools=[SKILL_MAPPING[skill] for skill in agent_flow_spec.skills],
             temperature=agent_flow_spec.config.temperature,
             model=agent_flow_spec.config.model,
+            synced_fingerprint=agent_flow_spec.assistant_fingerprint,
         )
         return agent
 
@@ -1,20 +1,77 @@
+import asyncio
 import logging
+import time
 from http import HTTPStatus
 
+from cachetools import TLRUCache
 from fastapi import HTTPException
 from firebase_admin import auth
 from firebase_admin.exceptions import InvalidArgumentError, UnknownError
 
-from backend.models.auth import User
+from backend.constants import AUTH_CACHE_KEY_PREFIX, AUTH_CACHE_MAXSIZE
+from backend.models.auth import User, VerifiedToken
+from backend.services.redis_cache_manager import RedisCacheManager
+from backend.settings import settings
+from backend.utils import hash_string
 
 logger = logging.getLogger(__name__)
 
+# Verified tokens by token hash, each kept until the token expires
+verified_tokens_cache: TLRUCache = TLRUCache(
+    maxsize=AUTH_CACHE_MAXSIZE, ttu=lambda _, verified_token, __: verified_token.expires_at, timer=time.time
+)
+
 
 class AuthService:
-    """Authentication service class to handle Firebase authentication."""
+    """Authentication service class to handle Firebase authentication.
+
+    Verified tokens are cached in-process and, if a cache manager is given, in Redis to share them between workers.
+    A cached token is used until it expires, but it is verified again every `auth_revocation_check_interval` seconds
+    to check whether it has been revoked.
+    """
+
+    def __init__(self, cache_manager: RedisCacheManager | None = None) -> None:
+        self.cache_manager = cache_manager
+
+    async def get_user(self, token: str) -> User:
+        return (await self.get_verified_token(token)).user
+
+    async def get_verified_token(self, token: str) -> VerifiedToken:
+        """Verify the token (or get it from the cache) and return the user along with the token's expiry."""
+        token_hash = hash_string(token)
+        verified_token = await self._get_cached_token(token_hash)
+        if verified_token and not self._is_revocation_check_due(verified_token):
+            return verified_token
+
+        verified_token = await asyncio.to_thread(self._verify_token, token)
+        verified_tokens_cache[token_hash] = verified_token
+        if self.cache_manager:
+            expire = int(verified_token.expires_at - time.time())
+            if expire > 0:
+                await self.cache_manager.set(AUTH_CACHE_KEY_PREFIX + token_hash, verified_token.model_dump(), expire)
+        return verified_token
+
+    async def _get_cached_token(self, token_hash: str) -> VerifiedToken | None:
+        verified_token = verified_tokens_cache.get(token_hash)
+        if verified_token is None and self.cache_manager:
+            cache_key = AUTH_CACHE_KEY_PREFIX + token_hash
+            verified_token_data = await self.cache_manager.get(cache_key)
+            if verified_token_data:
+                verified_token = VerifiedToken.model_validate(verified_token_data)
+                # The entry (or its copy in the near cache) can outlive the token by up to a few seconds
+                if verified_token.expires_at <= time.time():
+                    await self.cache_manager.delete(cache_key)
+                    return None
+                verified_tokens_cache[token_hash] = verified_token
+        return verified_token
+
+    @staticmethod
+    def _is_revocation_check_due(verified_token: VerifiedToken) -> bool:
+        return time.time() - verified_token.revocation_checked_at >= settings.auth_revocation_check_interval
 
-    @classmethod
-    def get_user(cls, token: str) -> User:
+    @staticmethod
+    def _verify_token(token: str) -> VerifiedToken:
+        """Verify the token with Firebase, including the (remote) revocation check."""
         try:
             decoded_token = auth.verify_id_token(token, check_revoked=True)
         except (ValueError, InvalidArgumentError, UnknownError) as err:
@@ -25,4 +82,8 @@ class AuthService:
                 headers={"WWW-Authenticate": 'Bearer error="invalid_token"'},
             ) from None
         logger.info(f"Authenticated user: {decoded_token['uid']}")
-        return User(id=decoded_token["uid"], email=decoded_token["email"])
+        return VerifiedToken(
+            user=User(id=decoded_token["uid"], email=decoded_token["email"]),
+            expires_at=decoded_token.get("exp", time.time() + settings.auth_revocation_check_interval),
+            revocation_checked_at=time.time(),
+        )
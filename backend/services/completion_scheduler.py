@@ -0,0 +1,129 @@
+import asyncio
+import contextvars
+import functools
+import logging
+import time
+from collections import OrderedDict, deque
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, TypeVar
+
+from backend.settings import settings
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+
+class CompletionScheduler:
+    """Runs the (blocking) agency completions in a dedicated thread pool, so they don't starve the default executor.
+
+    At most `max_workers` completions run at a time, and at most `max_per_user` of them for the same user.
+    When all the slots are taken, the waiting completions get them in round-robin order across users,
+    so a user with many completions can't hold back everyone else.
+    The state is only accessed from the event loop, so it needs no lock.
+    """
+
+    def __init__(self, max_workers: int, max_per_user: int) -> None:
+        self.max_workers = max_workers
+        self.max_per_user = max_per_user
+        self._executor: ThreadPoolExecutor | None = None
+        self._running: dict[str, int] = {}
+        self._running_total = 0
+        self._waiting: OrderedDict[str, deque[asyncio.Future]] = OrderedDict()
+        self._started = 0
+        self._total_wait_time = 0.0
+        self._max_wait_time = 0.0
+
+    async def run(self, user_id: str, func: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+        """Run `func(*args, **kwargs)` in the pool once a slot is available for the user.
+        Like `asyncio.to_thread`, the function runs in a copy of the current context."""
+        queued_at = time.monotonic()
+        await self._acquire(user_id)
+        self._record_wait(time.monotonic() - queued_at)
+        try:
+            context = contextvars.copy_context()
+            call = functools.partial(context.run, func, *args, **kwargs)
+            return await asyncio.get_running_loop().run_in_executor(self._get_executor(), call)
+        finally:
+            self._release(user_id)
+
+    def get_stats(self) -> dict[str, float]:
+        """Return the queue depth, the number of running completions and the wait times (in seconds)."""
+        return {
+            "running": self._running_total,
+            "waiting": sum(len(waiters) for waiters in self._waiting.values()),
+            "waiting_users": len(self._waiting),
+            "started": self._started,
+            "average_wait_time": self._total_wait_time / self._started if self._started else 0.0,
+            "max_wait_time": self._max_wait_time,
+        }
+
+    def shutdown(self) -> None:
+        """Stop the thread pool. A new one is started if a completion is run afterwards."""
+        if self._executor:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="completion")
+        return self._executor
+
+    async def _acquire(self, user_id: str) -> None:
+        slot = asyncio.get_running_loop().create_future()
+        self._waiting.setdefault(user_id, deque()).append(slot)
+        self._dispatch()
+        try:
+            await slot
+        except asyncio.CancelledError:
+            if slot.done() and not slot.cancelled():
+                # The slot was granted just before the cancellation: give it back
+                self._release(user_id)
+            else:
+                self._remove_waiter(user_id, slot)
+            raise
+
+    def _release(self, user_id: str) -> None:
+        self._running_total -= 1
+        self._running[user_id] -= 1
+        if not self._running[user_id]:
+            del self._running[user_id]
+        self._dispatch()
+
+    def _dispatch(self) -> None:
+        """Grant the free slots to the waiting users in round-robin order, respecting the per-user cap."""
+        while self._running_total < self.max_workers:
+            user_id = next(
+                (user_id for user_id in self._waiting if self._running.get(user_id, 0) < self.max_per_user), None
+            )
+            if user_id is None:
+                return
+            waiters = self._waiting[user_id]
+            slot = waiters.popleft()
+            if waiters:
+                self._waiting.move_to_end(user_id)
+            else:
+                del self._waiting[user_id]
+            self._running_total += 1
+            self._running[user_id] = self._running.get(user_id, 0) + 1
+            slot.set_result(None)
+
+    def _remove_waiter(self, user_id: str, slot: asyncio.Future) -> None:
+        waiters = self._waiting.get(user_id)
+        if waiters and slot in waiters:
+            waiters.remove(slot)
+            if not waiters:
+                del self._waiting[user_id]
+
+    def _record_wait(self, wait_time: float) -> None:
+        self._started += 1
+        self._total_wait_time += wait_time
+        self._max_wait_time = max(self._max_wait_time, wait_time)
+        if wait_time > 1:
+            logger.info(f"Completion waited {wait_time:.1f}s for a slot, scheduler: {self.get_stats()}")
+
+
+completion_scheduler = CompletionScheduler(
+    max_workers=settings.completion_max_workers, max_per_user=settings.completion_max_per_user
+)
@@ -0,0 +1,112 @@
+import asyncio
+from collections.abc import Awaitable, Callable
+
+from agency_swarm import Agency
+from openai.lib.streaming import AssistantEventHandler
+from openai.types.beta.threads import Message as OpenAIMessage, Text, TextDelta
+from openai.types.beta.threads.runs import ToolCall, ToolCallDelta
+from typing_extensions import override
+
+from backend.models.message import Message
+from backend.services.completion_scheduler import completion_scheduler
+from backend.services.context_vars_manager import ContextEnvVarsManager
+from backend.services.message_manager import MessageManager
+from backend.services.websocket.delta_coalescer import DeltaCoalescer
+
+
+def create_event_handler(
+    outbox: DeltaCoalescer, session_id: str, new_messages: list[Message]
+) -> type[AssistantEventHandler]:
+    """Create the event handler class of a completion stream.
+
+    The text and tool call deltas are sent through `outbox` as `agent_status` messages, and each completed text
+    as an `agent_message`. The messages added to the session's (main) thread are appended to `new_messages`.
+    """
+
+    class CompletionEventHandler(AssistantEventHandler):
+        agent_name = None
+        recipient_agent_name = None
+
+        @override
+        def on_text_created(self, text: Text) -> None:  # type: ignore
+            """Callback that is fired when a text content block is created"""
+            outbox.send_status(f"\n{self.recipient_agent_name} @ {self.agent_name}  > ")
+
+        @override
+        def on_text_delta(self, delta: TextDelta, snapshot: Text) -> None:  # type: ignore
+            """Callback that is fired whenever a text content delta is returned
+            by the API.
+            """
+            outbox.send_status(delta.value)
+
+        @override
+        def on_text_done(self, text: Text) -> None:  # type: ignore
+            """Callback that is fired when a text content block is done"""
+            outbox.send(
+                {
+                    "type": "agent_message",
+                    "data": {
+                        "sender": self.recipient_agent_name,
+                        "recipient": self.agent_name,
+                        "message": {"content": text.value},
+                    },
+                }
+            )
+
+        @override
+        def on_message_done(self, message: OpenAIMessage) -> None:  # type: ignore
+            """Callback that is fired when a message is completed"""
+            # Messages of the other agents' threads aren't part of the session's history
+            if message.thread_id == session_id:
+                new_messages.append(MessageManager.to_message(message, session_id))
+
+        def on_tool_call_created(self, tool_call: ToolCall) -> None:
+            """Callback that is fired when a tool call is created"""
+            outbox.send_status(f"\n{self.recipient_agent_name} > {tool_call.type}\n")
+
+        def on_tool_call_delta(self, delta: ToolCallDelta, snapshot: ToolCall) -> None:  # noqa:  ARG002
+            """Callback that is fired when a tool call delta is encountered"""
+            if delta.type == "code_interpreter":
+                if delta.code_interpreter.input:
+                    outbox.send_status(delta.code_interpreter.input)
+                if delta.code_interpreter.outputs:
+                    outbox.send_status("\n\noutput > ")
+                    for output in delta.code_interpreter.outputs:
+                        if output.type == "logs":
+                            outbox.send_status(f"\n{output.logs}")
+
+        @classmethod
+        def on_all_streams_end(cls):
+            """Fires when streams for all agents have ended."""
+            pass  # The final response is sent once stream_completion returns
+
+    return CompletionEventHandler
+
+
+async def stream_completion(
+    user_id: str,
+    agency_id: str,
+    agency: Agency,
+    session_id: str,
+    user_message: str,
+    send_message: Callable[[dict], Awaitable[None]],
+) -> list[Message]:
+    """Run the agency completion for the user message, streaming its events to `send_message`.
+    The completion runs in the completion scheduler; the events are sent in order from the event loop.
+
+    :return: The messages added to the session during the run.
+    """
+    outbox = DeltaCoalescer(asyncio.get_running_loop(), send_message)
+    new_messages: list[Message] = []
+    event_handler = create_event_handler(outbox, session_id, new_messages)
+
+    def get_completion_stream_wrapper():
+        ContextEnvVarsManager.set("user_id", user_id)
+        ContextEnvVarsManager.set("agency_id", agency_id)
+        agency.get_completion_stream(user_message, event_handler)
+
+    try:
+        await completion_scheduler.run(user_id, get_completion_stream_wrapper)
+    finally:
+        await outbox.close()
+    return new_messages
@@ -1,5 +1,7 @@
 from datetime import UTC, datetime
 
+from openai.types.beta.threads import Message as OpenAIMessage
+
 from backend.models.message import Message
 from backend.services.oai_client import get_openai_client
 from backend.services.user_variable_manager import UserVariableManager
@@ -25,16 +27,15 @@ class MessageManager:
             before=before,
             order="asc",
         )
-        messages_output = [
-            Message(
-                id=message.id,
-                content=message.content[0].text.value
-                if message.content and message.content[0].text
-                else "[No content]",
-                role=message.role,
-                timestamp=datetime.fromtimestamp(message.created_at, tz=UTC).isoformat(),
-                session_id=session_id,
-            )
-            for message in messages
-        ]
-        return messages_output
+        return [self.to_message(message, session_id) for message in messages]
+
+    @staticmethod
+    def to_message(message: OpenAIMessage, session_id: str) -> Message:
+        """Convert a message of the OpenAI thread (listed or received from a completion stream)."""
+        return Message(
+            id=message.id,
+            content=message.content[0].text.value if message.content and message.content[0].text else "[No content]",
+            role=message.role,
+            timestamp=datetime.fromtimestamp(message.created_at, tz=UTC).isoformat(),
+            session_id=session_id,
+        )
@@ -1,15 +1,26 @@
+import hashlib
+import threading
+from collections.abc import Callable
+
 import instructor
 import openai
+from cachetools import LRUCache
 
+from backend.constants import OPENAI_CLIENTS_MAXSIZE
 from backend.exceptions import UnsetVariableError
 from backend.services.user_variable_manager import UserVariableManager
 
+# Long-lived clients (each with its own keep-alive connection pool) by the hash of their credentials and endpoint
+openai_clients: LRUCache = LRUCache(maxsize=OPENAI_CLIENTS_MAXSIZE)
+openai_clients_lock = threading.Lock()
+
 
 def get_openai_client(
     user_variable_manager: UserVariableManager | None = None, api_key: str | None = None
 ) -> openai.OpenAI:
     """
     Get an OpenAI client. Prefer Azure OpenAI if the Azure token is set.
+    Clients are shared by everyone using the same credentials, so they must not be modified.
 
     Args:
         user_variable_manager (UserVariableManager | None): The user variable manager to fetch API keys.
@@ -26,14 +37,17 @@ def get_openai_client(
             azure_api_key = user_variable_manager.get_by_key("AZURE_OPENAI_API_KEY")
             api_version = user_variable_manager.get_by_key("OPENAI_API_VERSION")
             azure_endpoint = user_variable_manager.get_by_key("AZURE_OPENAI_ENDPOINT")
-            return instructor.patch(
-                openai.AzureOpenAI(
-                    api_key=azure_api_key,
-                    api_version=api_version,
-                    azure_endpoint=azure_endpoint,
-                    timeout=5,
-                    max_retries=5,
-                )
+            return _get_or_create_client(
+                ("azure", azure_api_key, api_version, azure_endpoint),
+                lambda: instructor.patch(
+                    openai.AzureOpenAI(
+                        api_key=azure_api_key,
+                        api_version=api_version,
+                        azure_endpoint=azure_endpoint,
+                        timeout=5,
+                        max_retries=5,
+                    )
+                ),
             )
         except UnsetVariableError:
             # Fall back to OpenAI setup if Azure key is not set
@@ -47,4 +61,17 @@ def get_openai_client(
         except UnsetVariableError as err:
             raise ValueError("API key not provided and no valid API key found in user variables") from err
 
-    return instructor.patch(openai.OpenAI(api_key=api_key, max_retries=5))
+    return _get_or_create_client(
+        ("openai", api_key), lambda: instructor.patch(openai.OpenAI(api_key=api_key, max_retries=5))
+    )
+
+
+def _get_or_create_client(credentials: tuple[str, ...], create_client: Callable[[], openai.OpenAI]) -> openai.OpenAI:
+    """Get the client for the given credentials from the registry, creating it if needed.
+    The credentials are hashed, so that the keys themselves are not kept as cache keys."""
+    key = hashlib.sha256("\0".join(credentials).encode("utf-8")).hexdigest()
+    with openai_clients_lock:
+        client = openai_clients.get(key)
+        if client is None:
+            client = openai_clients[key] = create_client()
+    return client
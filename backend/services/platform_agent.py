@@ -0,0 +1,54 @@
+import json
+
+from agency_swarm import Agent
+from openai.types.beta import Assistant
+
+from backend.utils import hash_string
+
+
+def get_assistant_fingerprint(agent: Agent) -> str:
+    """Fingerprint of the agent settings that are synchronized with the OpenAI assistant."""
+    assistant_settings = {
+        "instructions": agent.instructions,
+        "tools": [getattr(tool, "openai_schema", tool.__name__) for tool in agent.tools],
+        "model": agent.model,
+        "temperature": agent.temperature,
+        "files_folder": agent.files_folder,
+        "tool_resources": agent.tool_resources,
+    }
+    return hash_string(json.dumps(assistant_settings, sort_keys=True, default=str))
+
+
+class PlatformAgent(Agent):
+    """An agency-swarm Agent that skips the OpenAI assistant synchronization in `init_oai`
+    if its settings have not changed since the last synchronization.
+
+    The fingerprint is computed on construction, before the Agency adds the shared instructions and tools.
+    Agents with files always synchronize: their tool resources are only known to the remote assistant.
+    """
+
+    def __init__(self, *args, synced_fingerprint: str | None = None, **kwargs) -> None:
+        super().__init__(*args, **kwargs)
+        self.assistant_fingerprint = get_assistant_fingerprint(self)
+        self.assistant_in_sync = (
+            bool(self.id) and not self.files_folder and synced_fingerprint == self.assistant_fingerprint
+        )
+
+    def init_oai(self):
+        if not self.assistant_in_sync:
+            return super().init_oai()
+        # The threads still read the assistant (e.g. its id), so stand in for the retrieved one with the local settings
+        self.assistant = Assistant(
+            id=self.id,
+            created_at=0,
+            object="assistant",
+            model=self.model,
+            name=self.name,
+            description=self.description,
+            instructions=self.instructions,
+            tools=self.get_oai_tools(),
+            metadata=self.metadata,
+            temperature=self.temperature,
+            top_p=self.top_p,
+        )
+        return self
@@ -1,37 +1,234 @@
+import asyncio
+import functools
+import importlib
+import json
+import logging
 import pickle
-from typing import Any
+import uuid
+from collections.abc import Iterable, Mapping
+from typing import Any, Protocol
 
+import msgpack
+from cachetools import TTLCache
+from pydantic import BaseModel
 from redis import asyncio as aioredis
+from redis.exceptions import RedisError
 
-from backend.constants import DEFAULT_CACHE_EXPIRATION
+from backend.constants import (
+    DEFAULT_CACHE_EXPIRATION,
+    NEAR_CACHE_INVALIDATION_CHANNEL,
+    NEAR_CACHE_MAXSIZE,
+    NEAR_CACHE_TTL,
+)
+from backend.settings import settings
+
+logger = logging.getLogger(__name__)
+
+
+class Serializer(Protocol):
+    """Converts the cached values to and from bytes."""
+
+    def dumps(self, value: Any) -> bytes: ...
+
+    def loads(self, data: bytes) -> Any: ...
+
+
+class PickleSerializer:
+    """Serializes any picklable value. This is the default and the format of the existing cache entries."""
+
+    def dumps(self, value: Any) -> bytes:
+        return pickle.dumps(value)
+
+    def loads(self, data: bytes) -> Any:
+        return pickle.loads(data)
+
+
+class MsgpackSerializer:
+    """Serializes plain data (dicts, lists, strings, bytes, numbers, booleans and None) and Pydantic models
+    with msgpack, which is faster and more compact than pickle for such values.
+    Models are stored as their JSON-mode dump along with their class, and validated again when read.
+    Any other value (e.g. tuples, sets or datetimes outside of a model) falls back to pickle,
+    so entries written by PickleSerializer can still be read.
+    """
+
+    MSGPACK_PREFIX = b"M"
+    MODEL_EXT_TYPE = 1
+
+    def dumps(self, value: Any) -> bytes:
+        try:
+            # strict_types: tuples and subclasses (e.g. enums) go to _default, instead of being changed silently
+            return self.MSGPACK_PREFIX + msgpack.packb(value, default=self._default, strict_types=True)
+        except (TypeError, ValueError, OverflowError):
+            return pickle.dumps(value)
+
+    def loads(self, data: bytes) -> Any:
+        if data.startswith(self.MSGPACK_PREFIX):
+            return msgpack.unpackb(data[len(self.MSGPACK_PREFIX) :], ext_hook=self._ext_hook, strict_map_key=False)
+        return pickle.loads(data)
+
+    def _default(self, value: Any) -> msgpack.ExtType:
+        if not isinstance(value, BaseModel):
+            raise TypeError(f"Cannot serialize {type(value).__name__} with msgpack")
+        model_class = type(value)
+        data = [f"{model_class.__module__}:{model_class.__qualname__}", value.model_dump(mode="json")]
+        return msgpack.ExtType(self.MODEL_EXT_TYPE, msgpack.packb(data, strict_types=True))
+
+    def _ext_hook(self, code: int, data: bytes) -> Any:
+        if code != self.MODEL_EXT_TYPE:
+            return msgpack.ExtType(code, data)
+        class_path, model_data = msgpack.unpackb(data, strict_map_key=False)
+        return self._get_model_class(class_path).model_validate(model_data)
+
+    @staticmethod
+    @functools.cache
+    def _get_model_class(class_path: str) -> type[BaseModel]:
+        module_name, qualname = class_path.split(":")
+        return functools.reduce(getattr, qualname.split("."), importlib.import_module(module_name))
+
+
+class NearCache:
+    """A bounded in-process cache of serialized Redis values, checked before Redis.
+
+    Entries live for a few seconds, which bounds how stale they can get. If `publish_invalidations` is set,
+    changes are also published over Redis pub/sub, and `listen_for_invalidations` drops the entries changed
+    by the other workers.
+    """
+
+    def __init__(self, maxsize: int, ttl: float, publish_invalidations: bool = False) -> None:
+        self._cache: TTLCache = TTLCache(maxsize=maxsize, ttl=ttl)
+        self.publish_invalidations = publish_invalidations
+        self.origin_id = uuid.uuid4().hex
+
+    def get(self, key: str) -> bytes | None:
+        return self._cache.get(key)
+
+    def set(self, key: str, serialized_data: bytes) -> None:
+        self._cache[key] = serialized_data
+
+    def invalidate(self, keys: Iterable[str]) -> None:
+        for key in keys:
+            self._cache.pop(key, None)
+
+    def clear(self) -> None:
+        self._cache.clear()
+
+    async def publish_invalidation(self, redis: aioredis.Redis, keys: list[str]) -> None:
+        if self.publish_invalidations:
+            message = json.dumps({"origin_id": self.origin_id, "keys": keys})
+            await redis.publish(NEAR_CACHE_INVALIDATION_CHANNEL, message)
+
+    async def listen_for_invalidations(self, redis: aioredis.Redis, retry_delay: float = 1.0) -> None:
+        """Drop the entries invalidated by the other workers. Runs until cancelled."""
+        while True:
+            try:
+                async with redis.pubsub(ignore_subscribe_messages=True) as pubsub:
+                    await pubsub.subscribe(NEAR_CACHE_INVALIDATION_CHANNEL)
+                    # Entries may have changed while we weren't subscribed
+                    self.clear()
+                    async for message in pubsub.listen():
+                        self._handle_invalidation(message["data"])
+            except RedisError as err:
+                logger.warning(f"Near cache invalidation listener disconnected: {err}")
+                await asyncio.sleep(retry_delay)
+
+    def _handle_invalidation(self, data: bytes | str) -> None:
+        message = json.loads(data)
+        if message["origin_id"] != self.origin_id:
+            self.invalidate(message["keys"])
+
+
+# The near cache shared by the cache managers of this process
+near_cache = NearCache(
+    maxsize=NEAR_CACHE_MAXSIZE, ttl=NEAR_CACHE_TTL, publish_invalidations=settings.redis_near_cache_invalidation
+)
 
 
 class RedisCacheManager:
     """Redis cache manager
     This class implements the CacheManager interface using Redis as the cache backend.
+    If a near cache is given, it is checked before Redis and kept up to date by all the write operations.
     """
 
-    def __init__(self, redis: aioredis.Redis) -> None:
+    def __init__(
+        self, redis: aioredis.Redis, serializer: Serializer | None = None, near_cache: NearCache | None = None
+    ) -> None:
         """Initializes the Redis cache manager"""
         self.redis = redis
+        self.serializer = serializer or PickleSerializer()
+        self.near_cache = near_cache
 
     async def get(self, key: str) -> Any | None:
         """Gets the value for the given key from the cache"""
-        serialized_data = await self.redis.get(key)
+        serialized_data = self.near_cache.get(key) if self.near_cache else None
+        if serialized_data is None:
+            serialized_data = await self.redis.get(key)
+            if serialized_data and self.near_cache:
+                self.near_cache.set(key, serialized_data)
         if not serialized_data:
             return None
 
-        loaded = pickle.loads(serialized_data)
+        loaded = self.serializer.loads(serialized_data)
         return loaded
 
+    async def get_many(self, keys: Iterable[str]) -> dict[str, Any]:
+        """Gets the values for the given keys with a single MGET. Missing keys are left out of the result."""
+        serialized_values: dict[str, bytes] = {}
+        missing_keys = []
+        for key in keys:
+            serialized_data = self.near_cache.get(key) if self.near_cache else None
+            if serialized_data is None:
+                missing_keys.append(key)
+            else:
+                serialized_values[key] = serialized_data
+
+        if missing_keys:
+            for key, serialized_data in zip(missing_keys, await self.redis.mget(missing_keys), strict=True):
+                if serialized_data:
+                    serialized_values[key] = serialized_data
+                    if self.near_cache:
+                        self.near_cache.set(key, serialized_data)
+
+        return {key: self.serializer.loads(serialized_data) for key, serialized_data in serialized_values.items()}
+
     async def set(self, key: str, value: Any, expire: int = DEFAULT_CACHE_EXPIRATION) -> None:
         """Sets the value for the given key in the cache"""
-        serialized_data = pickle.dumps(value)
+        serialized_data = self.serializer.dumps(value)
         await self.redis.set(key, serialized_data, ex=expire)
+        await self._update_near_cache({key: serialized_data})
+
+    async def set_many(self, values: Mapping[str, Any], expire: int = DEFAULT_CACHE_EXPIRATION) -> None:
+        """Sets the values for the given keys in one round trip, using a (non-transactional) pipeline"""
+        if not values:
+            return
+        serialized_values = {key: self.serializer.dumps(value) for key, value in values.items()}
+        pipeline = self.redis.pipeline(transaction=False)
+        for key, serialized_data in serialized_values.items():
+            pipeline.set(key, serialized_data, ex=expire)
+        await pipeline.execute()
+        await self._update_near_cache(serialized_values)
 
     async def delete(self, key: str) -> None:
         """Deletes the value for the given key from the cache"""
         await self.redis.delete(key)
+        await self._invalidate_near_cache([key])
+
+    async def delete_many(self, keys: Iterable[str]) -> None:
+        """Deletes the values for the given keys with a single DEL"""
+        keys = list(keys)
+        if keys:
+            await self.redis.delete(*keys)
+            await self._invalidate_near_cache(keys)
+
+    async def _update_near_cache(self, serialized_values: dict[str, bytes]) -> None:
+        if self.near_cache:
+            for key, serialized_data in serialized_values.items():
+                self.near_cache.set(key, serialized_data)
+            await self.near_cache.publish_invalidation(self.redis, list(serialized_values))
+
+    async def _invalidate_near_cache(self, keys: list[str]) -> None:
+        if self.near_cache:
+            self.near_cache.invalidate(keys)
+            await self.near_cache.publish_invalidation(self.redis, keys)
 
     async def close(self) -> None:
         """Closes the Redis connection"""
@@ -1,3 +1,4 @@
+import asyncio
 from datetime import UTC, datetime
 from http import HTTPStatus
 from typing import Any
@@ -33,21 +34,22 @@ class SessionManager:
             self._openai_client = get_openai_client(self.user_variable_manager)
         return self._openai_client
 
-    def get_sessions_for_user(self, user_id: str) -> list[SessionConfigForAPI]:
-        """Return a list of all sessions for the given user."""
-        sessions = self.session_storage.load_by_user_id(user_id)
-        sessions_for_api = [self.session_adapter.to_api(session) for session in sessions]
-        sorted_sessions = sorted(sessions_for_api, key=lambda x: x.timestamp, reverse=True)
-        return sorted_sessions
+    async def get_sessions_for_user(
+        self, user_id: str, limit: int | None = None, cursor: str | None = None
+    ) -> list[SessionConfigForAPI]:
+        """Return a list of sessions for the given user, most recently used first.
+        If limit is set, only the page following the cursor is returned."""
+        sessions = await self.session_storage.load_by_user_id(user_id, limit=limit, cursor=cursor)
+        return await self.session_adapter.to_api_many(sessions)
 
-    def get_session(self, session_id: str) -> SessionConfig:
+    async def get_session(self, session_id: str) -> SessionConfig:
         """Return the session with the given ID."""
-        session = self.session_storage.load_by_id(session_id)
+        session = await self.session_storage.load_by_id(session_id)
         if not session:
             raise NotFoundError("Session", session_id)
         return session
 
-    def create_session(
+    async def create_session(
         self, agency: Agency, name: str, agency_id: str, user_id: str, thread_ids: dict[str, Any]
     ) -> str:
         """Create a new session for the given agency and return its id."""
@@ -60,33 +62,33 @@ class SessionManager:
             thread_ids=thread_ids,
             timestamp=datetime.now(UTC).isoformat(),
         )
-        self.session_storage.save(session_config)
+        await self.session_storage.save(session_config)
         return session_id
 
-    def rename_session(self, session_id: str, new_name: str) -> None:
+    async def rename_session(self, session_id: str, new_name: str) -> None:
         """Rename the session with the given ID."""
-        self.session_storage.update(session_id, {"name": new_name})
+        await self.session_storage.update(session_id, {"name": new_name})
 
-    def update_session_timestamp(self, session_id: str) -> None:
+    async def update_session_timestamp(self, session_id: str) -> None:
         """Update the session with the given ID."""
         timestamp = datetime.now(UTC).isoformat()
-        self.session_storage.update(session_id, {"timestamp": timestamp})
+        await self.session_storage.update(session_id, {"timestamp": timestamp})
 
-    def delete_session(self, session_id: str) -> None:
+    async def delete_session(self, session_id: str) -> None:
         """Delete the session with the given ID."""
-        session_config = self.get_session(session_id)
+        session_config = await self.get_session(session_id)
         main_thread_id: str = session_config.thread_ids.pop("main_thread")  # type: ignore
-        self._delete_session_via_api(main_thread_id)
+        await asyncio.to_thread(self._delete_session_via_api, main_thread_id)
         for receiver in session_config.thread_ids.values():
             for thread_id in receiver.values():  # type: ignore
-                self._delete_session_via_api(thread_id)
-        self.session_storage.delete(session_id)
+                await asyncio.to_thread(self._delete_session_via_api, thread_id)
+        await self.session_storage.delete(session_id)
 
-    def delete_sessions_by_agency_id(self, agency_id: str) -> None:
+    async def delete_sessions_by_agency_id(self, agency_id: str) -> None:
         """Delete all sessions for the given agency."""
-        sessions = self.session_storage.load_by_agency_id(agency_id)
+        sessions = await self.session_storage.load_by_agency_id(agency_id)
         for session in sessions:
-            self.delete_session(session.id)
+            await self.delete_session(session.id)
 
     def _delete_session_via_api(self, session_id: str) -> None:
         """Delete the session with the given ID."""
@@ -15,20 +15,21 @@ class SkillManager:
     def __init__(self, storage: SkillConfigStorage):
         self.storage = storage
 
-    def get_skill_list(self, current_user_id: str) -> list[SkillConfig]:
-        """Get a list of configs for the skills owned by the current user and template (public) skills."""
-        skills = self.storage.load_by_user_id(current_user_id) + self.storage.load_by_user_id(None)
-        sorted_skills = sorted(skills, key=lambda x: x.timestamp, reverse=True)
-        return sorted_skills
-
-    def get_skill_config(self, id_: str) -> SkillConfig:
+    async def get_skill_list(
+        self, current_user_id: str, limit: int | None = None, cursor: str | None = None
+    ) -> list[SkillConfig]:
+        """Get a list of configs for the skills owned by the current user and template (public) skills,
+        newest first. If limit is set, only the page following the cursor is returned."""
+        return await self.storage.load_by_user_ids([current_user_id, None], limit=limit, cursor=cursor)
+
+    async def get_skill_config(self, id_: str) -> SkillConfig:
         """Get a skill configuration by ID."""
-        config_db = self.storage.load_by_id(id_)
+        config_db = await self.storage.load_by_id(id_)
         if not config_db:
             raise NotFoundError("Skill", id_)
         return config_db
 
-    def create_skill_version(self, config: SkillConfig, current_user_id: str) -> tuple[str, int]:
+    async def create_skill_version(self, config: SkillConfig, current_user_id: str) -> tuple[str, int]:
         """Create a new version of a skill configuration.
 
         :param config: The new skill configuration.
@@ -42,7 +43,7 @@ class SkillManager:
             config.id = None
         # check if the current_user has permissions
         if config.id:
-            config_db = self.get_skill_config(config.id)
+            config_db = await self.get_skill_config(config.id)
             self.check_user_permissions(config_db, current_user_id)
 
         # Ensure the skill is associated with the current user
@@ -52,14 +53,14 @@ class SkillManager:
         config.approved = False
         config.timestamp = datetime.now(UTC).isoformat()
 
-        skill_id, skill_version = self.storage.save(config)
+        skill_id, skill_version = await self.storage.save(config)
         return skill_id, skill_version
 
-    def delete_skill(self, id_: str, current_user_id: str) -> None:
+    async def delete_skill(self, id_: str, current_user_id: str) -> None:
         """Delete a skill configuration."""
-        config = self.get_skill_config(id_)
+        config = await self.get_skill_config(id_)
         self.check_user_permissions(config, current_user_id)
-        self.storage.delete(id_)
+        await self.storage.delete(id_)
 
     @staticmethod
     def check_user_permissions(config: SkillConfig, current_user_id: str) -> None:
@@ -70,6 +71,6 @@ class SkillManager:
 
     async def approve_skill(self, id_: str) -> None:
         """Approve a skill configuration."""
-        config = self.get_skill_config(id_)
+        config = await self.get_skill_config(id_)
         config.approved = True
-        self.storage.save(config)
+        await self.storage.save(config)
@@ -1,5 +1,10 @@
+import asyncio
 import logging
+import threading
 
+from cachetools import TTLCache
+
+from backend.constants import USER_VARIABLES_CACHE_MAXSIZE, USER_VARIABLES_CACHE_TTL
 from backend.exceptions import UnsetVariableError
 from backend.repositories.agent_flow_spec_storage import AgentFlowSpecStorage
 from backend.repositories.user_variable_storage import UserVariableStorage
@@ -9,6 +14,10 @@ from backend.settings import settings
 
 logger = logging.getLogger(__name__)
 
+# Snapshots of the decrypted variables by user id, shared by all the manager instances
+user_variables_cache: TTLCache = TTLCache(maxsize=USER_VARIABLES_CACHE_MAXSIZE, ttl=USER_VARIABLES_CACHE_TTL)
+user_variables_cache_lock = threading.Lock()
+
 
 class UserVariableManager:
     """Manage user variables. Incorporates the logic for setting, getting, and updating user variables"""
@@ -26,11 +35,10 @@ class UserVariableManager:
         if not user_id:
             logger.error("user_id not found in the context variables.")
             raise ValueError("user_id not found in the context variables.")
-        document = self._user_variable_storage.get_all_variables(user_id) or {}
-        value = document.get(key)
+        value = self._get_decrypted_variable(user_id, key)
         if not value:
             raise UnsetVariableError(key=key)
-        return self._encryption_service.decrypt(value)
+        return value
 
     def set_by_key(self, key: str, value: str) -> None:
         """Set a variable by key."""
@@ -43,6 +51,7 @@ class UserVariableManager:
             variables = {}
         variables[key] = self._encryption_service.encrypt(value)
         self._user_variable_storage.set_variables(user_id, variables)
+        self.invalidate_cache(user_id)
 
     def get_variable_names(self, user_id: str) -> list[str]:
         """Get the names of all the variables for a user."""
@@ -52,7 +61,7 @@ class UserVariableManager:
         all_variables = variable_names.union(self.DEFAULT_VARIABLE_NAMES)
         return sorted(all_variables)
 
-    def create_or_update_variables(self, user_id: str, variables: dict[str, str]) -> bool:
+    async def create_or_update_variables(self, user_id: str, variables: dict[str, str]) -> bool:
         """Update or create variables for a user.
         :param user_id: The ID of the user whose variables are being updated.
         :param variables: A dictionary containing the variables to be updated or created.
@@ -61,7 +70,8 @@ class UserVariableManager:
             - New/updated keys: If the value is not an empty string, the value will be encrypted and updated.
             - Unchanged keys: If the value is an empty string, the value will not be updated.
         """
-        existing_variables = self._user_variable_storage.get_all_variables(user_id) or {}
+        # The storage is synchronous: keep its Firestore round trips off the event loop
+        existing_variables = await asyncio.to_thread(self._user_variable_storage.get_all_variables, user_id) or {}
 
         # Encrypt and update new or changed variables
         for key, value in variables.items():
@@ -69,7 +79,7 @@ class UserVariableManager:
                 if key == "OPENAI_API_KEY" and key in existing_variables and \
                         value != self._encryption_service.decrypt(existing_variables[key]):
                     # Check if OPENAI_API_KEY is updated
-                    agents = self._agent_storage.load_by_user_id(user_id=user_id)
+                    agents = await self._agent_storage.load_by_user_id(user_id=user_id)
                     if len(agents) > 0:  # Check if this user has any agent
                         return False
 
@@ -80,5 +90,29 @@ class UserVariableManager:
         for key in keys_to_remove:
             del existing_variables[key]
 
-        self._user_variable_storage.set_variables(user_id, existing_variables)
+        await asyncio.to_thread(self._user_variable_storage.set_variables, user_id, existing_variables)
+        self.invalidate_cache(user_id)
         return True
+
+    @staticmethod
+    def invalidate_cache(user_id: str) -> None:
+        with user_variables_cache_lock:
+            user_variables_cache.pop(user_id, None)
+
+    def _get_decrypted_variable(self, user_id: str, key: str) -> str | None:
+        """Get a variable from the user's cached snapshot, reading the DB at most once per cache TTL.
+        The snapshot holds the encrypted document and the values decrypted so far."""
+        with user_variables_cache_lock:
+            snapshot = user_variables_cache.get(user_id)
+        if snapshot is None:
+            snapshot = (self._user_variable_storage.get_all_variables(user_id) or {}, {})
+            with user_variables_cache_lock:
+                user_variables_cache[user_id] = snapshot
+
+        encrypted_variables, decrypted_variables = snapshot
+        if key not in decrypted_variables:
+            encrypted_value = encrypted_variables.get(key)
+            if not encrypted_value:
+                return None
+            decrypted_variables[key] = self._encryption_service.decrypt(encrypted_value)
+        return decrypted_variables[key]
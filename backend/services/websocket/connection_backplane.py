@@ -0,0 +1,167 @@
+import asyncio
+import json
+import logging
+import os
+import socket
+from collections.abc import Awaitable, Callable
+from contextlib import suppress
+from typing import Protocol
+
+from redis import asyncio as aioredis
+from redis.exceptions import RedisError
+
+from backend.constants import (
+    WEBSOCKET_CLIENT_CHANNEL_PREFIX,
+    WEBSOCKET_OWNER_KEY_PREFIX,
+    WEBSOCKET_OWNER_TTL,
+)
+
+logger = logging.getLogger(__name__)
+
+# Queues a message for a connection of this worker
+Deliver = Callable[[dict], Awaitable[None]]
+
+
+def get_worker_id() -> str:
+    return f"{socket.gethostname()}:{os.getpid()}"
+
+
+class ConnectionBackplane(Protocol):
+    """Delivers the messages for the websocket connections owned by other workers.
+
+    The worker holding a connection registers it with a `deliver` callback; any worker can then publish messages
+    for the connection, and they are handed to that callback in the order they were published.
+    """
+
+    worker_id: str
+
+    async def register(self, client_id: str, deliver: Deliver) -> None: ...
+
+    async def unregister(self, client_id: str) -> None: ...
+
+    async def publish(self, client_id: str, message: dict) -> bool:
+        """Returns False if no worker holds the connection."""
+        ...
+
+    async def get_owner(self, client_id: str) -> str | None:
+        """Returns the id of the worker holding the connection, if any."""
+        ...
+
+    async def close(self) -> None: ...
+
+
+class LocalBackplane:
+    """The in-process backplane: enough for a single worker, and a stand-in for Redis in tests.
+
+    Backplanes sharing the same `connections` dict behave like workers sharing a Redis server.
+    """
+
+    def __init__(self, worker_id: str | None = None, connections: dict[str, tuple[str, Deliver]] | None = None):
+        self.worker_id = worker_id or get_worker_id()
+        self._connections = connections if connections is not None else {}
+
+    async def register(self, client_id: str, deliver: Deliver) -> None:
+        self._connections[client_id] = (self.worker_id, deliver)
+
+    async def unregister(self, client_id: str) -> None:
+        # The client may have reconnected to another worker in the meantime
+        if client_id in self._connections and self._connections[client_id][0] == self.worker_id:
+            del self._connections[client_id]
+
+    async def publish(self, client_id: str, message: dict) -> bool:
+        connection = self._connections.get(client_id)
+        if connection is None:
+            return False
+        _, deliver = connection
+        await deliver(message)
+        return True
+
+    async def get_owner(self, client_id: str) -> str | None:
+        connection = self._connections.get(client_id)
+        return connection[0] if connection else None
+
+    async def close(self) -> None:
+        for client_id in [client_id for client_id, (owner, _) in self._connections.items() if owner == self.worker_id]:
+            del self._connections[client_id]
+
+
+# Deletes the owner of a connection only if it is still this worker
+_UNREGISTER_SCRIPT = """
+if redis.call("GET", KEYS[1]) == ARGV[1] then
+    return redis.call("DEL", KEYS[1])
+end
+return 0
+"""
+
+
+class RedisBackplane:
+    """The backplane shared by the workers over Redis.
+
+    Each connection has its own pub/sub channel, subscribed to by the worker holding it, and a registry key holding
+    the id of that worker. Messages are published as JSON. A single listener task per worker reads the messages of
+    all its channels; it is started with the first registered connection and ends when there are none left.
+    """
+
+    def __init__(self, redis: aioredis.Redis, worker_id: str | None = None, retry_delay: float = 1.0) -> None:
+        self.redis = redis
+        self.worker_id = worker_id or get_worker_id()
+        self.retry_delay = retry_delay
+        self._pubsub = redis.pubsub(ignore_subscribe_messages=True)
+        self._deliverers: dict[str, Deliver] = {}
+        self._listener: asyncio.Task | None = None
+
+    async def register(self, client_id: str, deliver: Deliver) -> None:
+        self._deliverers[client_id] = deliver
+        await self._pubsub.subscribe(WEBSOCKET_CLIENT_CHANNEL_PREFIX + client_id)
+        await self.redis.set(WEBSOCKET_OWNER_KEY_PREFIX + client_id, self.worker_id, ex=WEBSOCKET_OWNER_TTL)
+        if self._listener is None or self._listener.done():
+            self._listener = asyncio.create_task(self._listen())
+
+    async def unregister(self, client_id: str) -> None:
+        if self._deliverers.pop(client_id, None) is None:
+            return
+        await self._pubsub.unsubscribe(WEBSOCKET_CLIENT_CHANNEL_PREFIX + client_id)
+        await self.redis.eval(_UNREGISTER_SCRIPT, 1, WEBSOCKET_OWNER_KEY_PREFIX + client_id, self.worker_id)
+
+    async def publish(self, client_id: str, message: dict) -> bool:
+        receivers = await self.redis.publish(WEBSOCKET_CLIENT_CHANNEL_PREFIX + client_id, json.dumps(message))
+        return receivers > 0
+
+    async def get_owner(self, client_id: str) -> str | None:
+        owner = await self.redis.get(WEBSOCKET_OWNER_KEY_PREFIX + client_id)
+        return owner.decode() if isinstance(owner, bytes) else owner
+
+    async def close(self) -> None:
+        for client_id in list(self._deliverers):
+            await self.unregister(client_id)
+        if self._listener:
+            self._listener.cancel()
+            with suppress(asyncio.CancelledError):
+                await self._listener
+        await self._pubsub.aclose()
+
+    async def _listen(self) -> None:
+        while self._pubsub.subscribed:
+            try:
+                message = await self._pubsub.get_message(ignore_subscribe_messages=True, timeout=None)
+            except RedisError as err:
+                # The pub/sub connection subscribes to the channels again when it reconnects
+                logger.warning(f"Websocket backplane listener disconnected: {err}")
+                await asyncio.sleep(self.retry_delay)
+                continue
+            if message:
+                await self._handle_message(message)
+
+    async def _handle_message(self, message: dict) -> None:
+        channel = message["channel"]
+        if isinstance(channel, bytes):
+            channel = channel.decode()
+        client_id = channel.removeprefix(WEBSOCKET_CLIENT_CHANNEL_PREFIX)
+        deliver = self._deliverers.get(client_id)
+        if deliver is None:
+            return
+        try:
+            await deliver(json.loads(message["data"]))
+        except Exception:
+            # Keep the listener running for the other connections
+            logger.exception(f"Could not deliver a message to client_id: {client_id}")
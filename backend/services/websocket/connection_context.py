@@ -0,0 +1,43 @@
+import time
+
+from agency_swarm import Agency
+
+from backend.models.auth import User, VerifiedToken
+from backend.models.session_config import SessionConfig
+
+
+class ConnectionContext:
+    """The state bound to a websocket connection: the authenticated user, and the session with its agency.
+
+    The user is authenticated once per token and kept until the token expires. The agency of the session is kept
+    (leased from the agency pool) until the connection switches to another session or disconnects.
+    """
+
+    def __init__(self) -> None:
+        self.user: User | None = None
+        self.token: str | None = None
+        self.token_expires_at: float = 0
+        self.session: SessionConfig | None = None
+        self.agency: Agency | None = None
+
+    def is_authenticated(self, token: str | None) -> bool:
+        """Check whether the bound user is still valid for a message carrying `token` (which may be omitted)."""
+        if self.user is None or time.time() >= self.token_expires_at:
+            return False
+        return token is None or token == self.token
+
+    def bind_user(self, token: str, verified_token: VerifiedToken) -> None:
+        self.user = verified_token.user
+        self.token = token
+        self.token_expires_at = verified_token.expires_at
+
+    def bind_session(self, session: SessionConfig, agency: Agency) -> None:
+        self.session = session
+        self.agency = agency
+
+    def unbind_session(self) -> Agency | None:
+        """Forget the session and return its agency, so that it can be released."""
+        agency = self.agency
+        self.session = None
+        self.agency = None
+        return agency
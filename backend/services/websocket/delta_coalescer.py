@@ -0,0 +1,90 @@
+import asyncio
+import logging
+from collections.abc import Awaitable, Callable
+
+from backend.constants import DELTA_COALESCING_MAX_SIZE, DELTA_COALESCING_WINDOW
+
+logger = logging.getLogger(__name__)
+
+_CLOSE = object()
+
+
+class DeltaCoalescer:
+    """Sends the messages of a completion stream in order, merging consecutive `agent_status` deltas into one frame.
+
+    The stream callbacks run in a worker thread and only hand the messages over to the event loop; a single sender
+    task writes them out. After the first delta of a frame arrives, the sender waits for `window` seconds to collect
+    more deltas; a frame is cut earlier once it reaches `max_size` characters, and any other message flushes the
+    pending deltas before being sent. A message that fails to send is logged and dropped; the sender keeps going.
+    """
+
+    def __init__(
+        self,
+        loop: asyncio.AbstractEventLoop,
+        send_message: Callable[[dict], Awaitable[None]],
+        window: float = DELTA_COALESCING_WINDOW,
+        max_size: int = DELTA_COALESCING_MAX_SIZE,
+    ) -> None:
+        self._loop = loop
+        self._send_message = send_message
+        self._window = window
+        self._max_size = max_size
+        self._queue: asyncio.Queue = asyncio.Queue()
+        self._sender_task = loop.create_task(self._run())
+
+    def send_status(self, text: str) -> None:
+        """Queue an `agent_status` delta. Safe to call from any thread."""
+        self._loop.call_soon_threadsafe(self._queue.put_nowait, text)
+
+    def send(self, message: dict) -> None:
+        """Queue any other message, sent after the deltas queued before it. Safe to call from any thread."""
+        self._loop.call_soon_threadsafe(self._queue.put_nowait, message)
+
+    async def close(self) -> None:
+        """Wait until everything queued so far has been handed to `send_message`, then stop the sender task.
+        Must be called from the event loop."""
+        # Scheduled like the messages, so that it's queued after the ones already handed over by other threads
+        self._loop.call_soon(self._queue.put_nowait, _CLOSE)
+        await self._sender_task
+
+    async def _run(self) -> None:
+        while True:
+            items = [await self._queue.get()]
+            if isinstance(items[0], str):
+                await asyncio.sleep(self._window)
+            while not self._queue.empty():
+                items.append(self._queue.get_nowait())
+
+            for item in self._coalesce(items):
+                if item is _CLOSE:
+                    return
+                try:
+                    await self._send_message(item)
+                except Exception:
+                    # E.g. a closed socket or a backplane error: the later messages may still get through
+                    logger.exception(f"Could not send a {item.get('type')} message of the completion stream")
+
+    def _coalesce(self, items: list) -> list:
+        """Merge the runs of consecutive deltas into status messages of at most `max_size` characters."""
+        coalesced = []
+        deltas: list[str] = []
+        size = 0
+        for item in items:
+            if isinstance(item, str):
+                if deltas and size + len(item) > self._max_size:
+                    coalesced.append(self._status_message(deltas))
+                    deltas, size = [], 0
+                deltas.append(item)
+                size += len(item)
+                continue
+            if deltas:
+                coalesced.append(self._status_message(deltas))
+                deltas, size = [], 0
+            coalesced.append(item)
+        if deltas:
+            coalesced.append(self._status_message(deltas))
+        return coalesced
+
+    @staticmethod
+    def _status_message(deltas: list[str]) -> dict:
+        return {"type": "agent_status", "data": {"message": "".join(deltas)}}
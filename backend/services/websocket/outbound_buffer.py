@@ -0,0 +1,76 @@
+import asyncio
+from collections import Counter, deque
+from typing import Literal
+
+OverflowPolicy = Literal["coalesce", "drop", "disconnect"]
+
+
+def _is_status(message: dict) -> bool:
+    return message.get("type") == "agent_status"
+
+
+class OutboundBuffer:
+    """The bounded, ordered buffer of the messages waiting to be sent to one client.
+
+    When the buffer is full, the overflow policy decides what happens to a new message:
+    - "coalesce": an `agent_status` delta is merged into the last queued message if that's a delta too;
+    - "drop": `agent_status` deltas are dropped, and the other messages replace the oldest queued delta;
+    - "disconnect": the message is rejected and the client should be disconnected.
+    The other messages (`agent_message`, `agent_response`, errors) are never lost: with the first two policies they
+    are queued even if the buffer is full.
+
+    Counters ("coalesced_messages", "dropped_messages") are added to the shared `stats`.
+    """
+
+    def __init__(self, maxsize: int, policy: OverflowPolicy, stats: Counter) -> None:
+        self.maxsize = maxsize
+        self.policy = policy
+        self._stats = stats
+        self._messages: deque[dict] = deque()
+        self._not_empty = asyncio.Event()
+        self._closed = False
+
+    def __len__(self) -> int:
+        return len(self._messages)
+
+    def put(self, message: dict) -> bool:
+        """Queue the message. Returns False if it was rejected because the client should be disconnected."""
+        if len(self._messages) >= self.maxsize:
+            if self.policy == "disconnect":
+                return False
+            if _is_status(message):
+                if self.policy == "coalesce" and self._messages and _is_status(self._messages[-1]):
+                    last_message = self._messages[-1]
+                    merged_text = last_message["data"]["message"] + message["data"]["message"]
+                    self._messages[-1] = {**last_message, "data": {**last_message["data"], "message": merged_text}}
+                    self._stats["coalesced_messages"] += 1
+                    return True
+                if self.policy == "drop":
+                    self._stats["dropped_messages"] += 1
+                    return True
+            elif self.policy == "drop":
+                self._drop_oldest_status()
+
+        self._messages.append(message)
+        self._not_empty.set()
+        return True
+
+    def close(self) -> None:
+        """Stop accepting messages; `get` returns None once the queued ones have been taken."""
+        self._closed = True
+        self._not_empty.set()
+
+    async def get(self) -> dict | None:
+        while not self._messages:
+            if self._closed:
+                return None
+            self._not_empty.clear()
+            await self._not_empty.wait()
+        return self._messages.popleft()
+
+    def _drop_oldest_status(self) -> None:
+        for index, queued_message in enumerate(self._messages):
+            if _is_status(queued_message):
+                del self._messages[index]
+                self._stats["dropped_messages"] += 1
+                return
@@ -1,27 +1,147 @@
 import asyncio
+import logging
+from collections import Counter
+from contextlib import suppress
 
-from starlette.websockets import WebSocket
+from starlette.websockets import WebSocket, WebSocketDisconnect
+from websockets.exceptions import ConnectionClosed
+
+from backend.services.websocket.connection_backplane import ConnectionBackplane
+from backend.services.websocket.outbound_buffer import OutboundBuffer, OverflowPolicy
+from backend.settings import settings
+
+logger = logging.getLogger(__name__)
 
 
 class WebSocketConnectionManager:
-    def __init__(self) -> None:
+    """Keeps track of the active connections and sends them messages.
+
+    Each connection has its own bounded, ordered send buffer (see OutboundBuffer), written out by a dedicated writer
+    task, so a slow client only delays its own messages and can't pile up unbounded memory. The lock only guards
+    the changes to the registry of connections.
+
+    With a backplane, the connections are also registered there, and the messages for the clients connected
+    to other workers are published through it.
+    """
+
+    def __init__(
+        self,
+        buffer_size: int = settings.websocket_send_buffer_size,
+        overflow_policy: OverflowPolicy = settings.websocket_send_buffer_policy,
+        backplane: ConnectionBackplane | None = None,
+    ) -> None:
         self.active_connections: dict[str, WebSocket] = {}
+        self.buffer_size = buffer_size
+        self.overflow_policy = overflow_policy
+        self.backplane = backplane
+        self._send_buffers: dict[str, OutboundBuffer] = {}
+        self._writer_tasks: dict[str, asyncio.Task] = {}
         self._connections_lock = asyncio.Lock()
+        self._stats: Counter = Counter()
 
     async def connect(self, websocket: WebSocket, client_id: str) -> None:
+        await websocket.accept()
+        send_buffer = OutboundBuffer(self.buffer_size, self.overflow_policy, self._stats)
+        writer_task = asyncio.create_task(self._write_messages(websocket, send_buffer, client_id))
         async with self._connections_lock:
-            await websocket.accept()
+            if client_id in self._send_buffers:
+                # The client reconnected: stop writing to the previous connection
+                self._send_buffers[client_id].close()
             self.active_connections[client_id] = websocket
+            self._send_buffers[client_id] = send_buffer
+            self._writer_tasks[client_id] = writer_task
+        if self.backplane:
+            await self.backplane.register(client_id, lambda message: self._send_local_message(message, client_id))
 
-    async def disconnect(self, client_id: str, close: bool = False) -> None:
-        async with self._connections_lock:
-            if client_id in self.active_connections:
-                websocket = self.active_connections.pop(client_id)
-                if close:
-                    await websocket.close()
+    async def disconnect(self, client_id: str, close: bool = False, websocket: WebSocket | None = None) -> None:
+        """Unregister the connection after sending the messages already queued for it.
+        If `websocket` is given, the connection is only unregistered if it is still the client's current one,
+        so that a client that has reconnected in the meantime keeps its new connection."""
+        connection = await self._unregister(client_id, websocket)
+        if connection is None:
+            if close and websocket is not None:
+                await websocket.close()
+            return
+        websocket, send_buffer, writer_task = connection
+        send_buffer.close()
+        await writer_task
+        if close:
+            await websocket.close()
+        logger.info(f"Unregistered client_id: {client_id}, websocket send buffers: {self.get_stats()}")
 
     async def send_message(self, message: dict, client_id: str) -> None:
+        """Queue the message for the client. It is sent in order by the connection's writer task.
+        If the client's buffer is full, the message is handled according to the overflow policy.
+        If the client is connected to another worker, the message is published through the backplane."""
+        if client_id not in self._send_buffers and self.backplane:
+            if not await self.backplane.publish(client_id, message):
+                logger.info(f"Could not send a message to client_id: {client_id}, it is not connected")
+            return
+        await self._send_local_message(message, client_id)
+
+    async def close(self) -> None:
+        """Unregister this worker's connections from the backplane."""
+        if self.backplane:
+            await self.backplane.close()
+
+    async def _send_local_message(self, message: dict, client_id: str) -> None:
+        send_buffer = self._send_buffers.get(client_id)
+        if send_buffer is not None and not send_buffer.put(message):
+            self._stats["overflow_disconnects"] += 1
+            logger.warning(
+                f"Send buffer of client_id: {client_id} is full ({len(send_buffer)} messages), disconnecting it. "
+                f"Websocket send buffers: {self.get_stats()}"
+            )
+            await self._disconnect_immediately(client_id)
+
+    def get_stats(self) -> dict[str, int]:
+        """Return the number of connections, the buffer depths and the overflow counters."""
+        buffer_depths = [len(send_buffer) for send_buffer in self._send_buffers.values()]
+        return {
+            "connections": len(self.active_connections),
+            "buffered_messages": sum(buffer_depths),
+            "max_buffer_depth": max(buffer_depths, default=0),
+            "coalesced_messages": self._stats["coalesced_messages"],
+            "dropped_messages": self._stats["dropped_messages"],
+            "overflow_disconnects": self._stats["overflow_disconnects"],
+        }
+
+    async def _unregister(
+        self, client_id: str, websocket: WebSocket | None = None
+    ) -> tuple[WebSocket, OutboundBuffer, asyncio.Task] | None:
         async with self._connections_lock:
-            if client_id in self.active_connections:
-                websocket = self.active_connections[client_id]
+            if client_id not in self.active_connections:
+                return None
+            if websocket is not None and self.active_connections[client_id] is not websocket:
+                return None
+            connection = (
+                self.active_connections.pop(client_id),
+                self._send_buffers.pop(client_id),
+                self._writer_tasks.pop(client_id),
+            )
+        if self.backplane:
+            await self.backplane.unregister(client_id)
+        return connection
+
+    async def _disconnect_immediately(self, client_id: str) -> None:
+        """Drop the queued messages and close the connection, without waiting for a slow client."""
+        connection = await self._unregister(client_id)
+        if connection is None:
+            return
+        websocket, _, writer_task = connection
+        writer_task.cancel()
+        with suppress(Exception):
+            await websocket.close(code=1013)  # Try again later
+
+    @staticmethod
+    async def _write_messages(websocket: WebSocket, send_buffer: OutboundBuffer, client_id: str) -> None:
+        connected = True
+        while (message := await send_buffer.get()) is not None:
+            if not connected:
+                # Keep consuming the buffer, so that disconnect() doesn't wait for messages that can't be sent
+                continue
+            try:
                 await websocket.send_json(message)
+            except (WebSocketDisconnect, ConnectionClosed, RuntimeError) as err:
+                connected = False
+                logger.info(f"Could not send a message to client_id: {client_id}, the connection is closed: {err}")
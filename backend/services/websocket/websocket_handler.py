@@ -4,10 +4,6 @@ import logging
 from agency_swarm import Agency
 from fastapi import HTTPException, WebSocket, WebSocketDisconnect
 from openai import AuthenticationError as OpenAIAuthenticationError
-from openai.lib.streaming import AssistantEventHandler
-from openai.types.beta.threads import Text, TextDelta
-from openai.types.beta.threads.runs import ToolCall, ToolCallDelta
-from typing_extensions import override
 from websockets.exceptions import ConnectionClosedOK
 
 from backend.constants import INTERNAL_ERROR_MESSAGE
@@ -16,9 +12,11 @@ from backend.models.auth import User
 from backend.models.session_config import SessionConfig
 from backend.services.agency_manager import AgencyManager
 from backend.services.auth_service import AuthService
+from backend.services.completion_stream import stream_completion
 from backend.services.context_vars_manager import ContextEnvVarsManager
 from backend.services.message_manager import MessageManager
 from backend.services.session_manager import SessionManager
+from backend.services.websocket.connection_context import ConnectionContext
 from backend.services.websocket.websocket_connection_manager import WebSocketConnectionManager
 
 logger = logging.getLogger(__name__)
@@ -38,6 +36,7 @@ class WebSocketHandler:
         self.agency_manager = agency_manager
         self.message_manager = message_manager
         self.session_manager = session_manager
+        self._contexts: dict[str, ConnectionContext] = {}
 
     async def handle_websocket_connection(
         self,
@@ -56,7 +55,6 @@ class WebSocketHandler:
         try:
             await self._handle_websocket_messages(websocket, client_id)
         except (WebSocketDisconnect, ConnectionClosedOK):
-            await self.connection_manager.disconnect(client_id)
             logger.info(f"WebSocket disconnected for client_id: {client_id}")
         except UnsetVariableError as exception:
             await self._send_error_message(client_id, str(exception))
@@ -67,25 +65,65 @@ class WebSocketHandler:
         except Exception as exception:
             logger.exception(f"Exception while processing message: client_id: {client_id}, error: {str(exception)}")
             await self._send_error_message(client_id, INTERNAL_ERROR_MESSAGE)
+        finally:
+            self._release_context(client_id)
+            # Sends the messages still queued for the client before the connection is closed
+            await self.connection_manager.disconnect(client_id, websocket=websocket)
 
     async def _authenticate(self, client_id: str, token: str) -> User:
         """Authenticate the user before sending messages.
         Process the token sent by the user and authenticate the user using Firebase.
         If the token is invalid, send an error message to the user.
+        The user is bound to the connection until the token expires, so the following messages
+        don't need to be authenticated again.
 
         :param client_id: The client ID.
         :param token: The token sent by the user.
         """
         try:
-            user = self.auth_service.get_user(token)
+            verified_token = await self.auth_service.get_verified_token(token)
         except HTTPException:
             logger.info(f"Invalid token {token} for client_id: {client_id}")
             await self._send_error_message(client_id, "Invalid token")
             raise WebSocketDisconnect from None
 
+        context = self._get_context(client_id)
+        if context.user and context.user.id != verified_token.user.id:
+            self._release_session(context)
+        context.bind_user(token, verified_token)
+
+        user = verified_token.user
         ContextEnvVarsManager.set("user_id", user.id)
         return user
 
+    async def _get_session_agency(
+        self, client_id: str, user_id: str, session_id: str
+    ) -> tuple[SessionConfig | None, Agency | None]:
+        """Get the session and its agency bound to the connection, setting them up if the session has changed."""
+        context = self._get_context(client_id)
+        if context.session and context.session.id == session_id:
+            ContextEnvVarsManager.set("agency_id", context.session.agency_id)
+            return context.session, context.agency
+
+        self._release_session(context)
+        session, agency = await self._setup_agency(user_id, session_id)
+        if session and agency:
+            context.bind_session(session, agency)
+        return session, agency
+
+    def _get_context(self, client_id: str) -> ConnectionContext:
+        return self._contexts.setdefault(client_id, ConnectionContext())
+
+    def _release_context(self, client_id: str) -> None:
+        context = self._contexts.pop(client_id, None)
+        if context:
+            self._release_session(context)
+
+    def _release_session(self, context: ConnectionContext) -> None:
+        agency = context.unbind_session()
+        if agency:
+            self.agency_manager.release_agency(agency)
+
     async def _setup_agency(self, user_id: str, session_id: str) -> tuple[SessionConfig | None, Agency | None]:
         """
         Set up the agency and thread IDs for the WebSocket connection.
@@ -95,7 +133,7 @@ class WebSocketHandler:
 
         :return: The session config and agency instances.
         """
-        session = self.session_manager.get_session(session_id)
+        session = await self.session_manager.get_session(session_id)
         agency, _ = await self.agency_manager.get_agency(session.agency_id, session.thread_ids, user_id)
         ContextEnvVarsManager.set("agency_id", session.agency_id)
         return session, agency
@@ -150,12 +188,18 @@ class WebSocketHandler:
         message_data = message.get("data")
         token = message.get("access_token")
 
-        if not token:
-            await self._send_error_message(client_id, "Access token not provided")
+        context = self._get_context(client_id)
+        if context.is_authenticated(token):
+            user = context.user
+            ContextEnvVarsManager.set("user_id", user.id)
+        elif token:
+            user = await self._authenticate(client_id, token)
+        else:
+            await self._send_error_message(
+                client_id, "Access token expired" if context.user else "Access token not provided"
+            )
             return
 
-        user = await self._authenticate(client_id, token)
-
         if message_type == "user_message":
             await self._process_user_message(user, message_data, client_id)
         else:
@@ -164,12 +208,13 @@ class WebSocketHandler:
     async def _process_user_message(self, user: User, message_data: dict, client_id: str) -> None:
         user_message = message_data.get("content")
         session_id = message_data.get("session_id")
+        full_history = bool(message_data.get("full_history"))
 
         if not user_message or not session_id:
             await self._send_error_message(client_id, "Message or session ID not provided")
             return
 
-        session, agency = await self._setup_agency(user.id, session_id)
+        session, agency = await self._get_session_agency(client_id, user.id, session_id)
 
         if not session or not agency:
             await self._send_error_message(
@@ -178,113 +223,28 @@ class WebSocketHandler:
             )
             return
 
-        self.session_manager.update_session_timestamp(session_id)
-
-        connection_manager = self.connection_manager
-        loop = asyncio.get_running_loop()
-
-        class WebSocketEventHandler(AssistantEventHandler):
-            agent_name = None
-            recipient_agent_name = None
-
-            @override
-            def on_text_created(self, text: Text) -> None:  # type: ignore
-                """Callback that is fired when a text content block is created"""
-                loop.create_task(
-                    connection_manager.send_message(
-                        {
-                            "type": "agent_status",
-                            "data": {"message": f"\n{self.recipient_agent_name} @ {self.agent_name}  > "},
-                        },
-                        client_id,
-                    )
-                )
-
-            @override
-            def on_text_delta(self, delta: TextDelta, snapshot: Text) -> None:  # type: ignore
-                """Callback that is fired whenever a text content delta is returned
-                by the API.
-                """
-                loop.create_task(
-                    connection_manager.send_message(
-                        {"type": "agent_status", "data": {"message": delta.value}},
-                        client_id,
-                    )
-                )
-
-            @override
-            def on_text_done(self, text: Text) -> None:  # type: ignore
-                """Callback that is fired when a text content block is done"""
-                loop.create_task(
-                    connection_manager.send_message(
-                        {
-                            "type": "agent_message",
-                            "data": {
-                                "sender": self.recipient_agent_name,
-                                "recipient": self.agent_name,
-                                "message": {"content": text.value},
-                            },
-                        },
-                        client_id,
-                    )
-                )
-
-            def on_tool_call_created(self, tool_call: ToolCall) -> None:
-                """Callback that is fired when a tool call is created"""
-                loop.create_task(
-                    connection_manager.send_message(
-                        {
-                            "type": "agent_status",
-                            "data": {"message": f"\n{self.recipient_agent_name} > {tool_call.type}\n"},
-                        },
-                        client_id,
-                    )
-                )
-
-            def on_tool_call_delta(self, delta: ToolCallDelta, snapshot: ToolCall) -> None:  # noqa:  ARG002
-                """Callback that is fired when a tool call delta is encountered"""
-                if delta.type == "code_interpreter":
-                    if delta.code_interpreter.input:
-                        loop.create_task(
-                            connection_manager.send_message(
-                                {"type": "agent_status", "data": {"message": delta.code_interpreter.input}},
-                                client_id,
-                            )
-                        )
-                    if delta.code_interpreter.outputs:
-                        loop.create_task(
-                            connection_manager.send_message(
-                                {"type": "agent_status", "data": {"message": "\n\noutput > "}},
-                                client_id,
-                            )
-                        )
-                        for output in delta.code_interpreter.outputs:
-                            if output.type == "logs":
-                                loop.create_task(
-                                    connection_manager.send_message(
-                                        {"type": "agent_status", "data": {"message": f"\n{output.logs}"}},
-                                        client_id,
-                                    )
-                                )
-
-            @classmethod
-            def on_all_streams_end(cls):
-                """Fires when streams for all agents have ended."""
-                pass  # Handled in WebSocketHandler._process_single_message
-
-        def get_completion_stream_wrapper():
-            ContextEnvVarsManager.set("user_id", user.id)
-            ContextEnvVarsManager.set("agency_id", session.agency_id)
-            agency.get_completion_stream(user_message, WebSocketEventHandler)
+        await self.session_manager.update_session_timestamp(session_id)
 
-        await loop.run_in_executor(None, get_completion_stream_wrapper)
+        new_messages = await stream_completion(
+            user.id,
+            session.agency_id,
+            agency,
+            session_id,
+            user_message,
+            lambda message: self.connection_manager.send_message(message, client_id),
+        )
 
-        all_messages = self.message_manager.get_messages(session_id)
-        all_messages_dict = [message.model_dump() for message in all_messages]
+        # By default, only the messages created during the run are sent: the client already has the previous ones.
+        # Listing the thread again is opt-in, as it's an extra round trip to OpenAI.
+        if full_history:
+            messages = await asyncio.to_thread(self.message_manager.get_messages, session_id)
+        else:
+            messages = new_messages
         response = {
             "status": True,
             "message": "Message processed successfully",
-            "data": all_messages_dict,
+            "data": [message.model_dump() for message in messages],
+            "incremental": not full_history,
         }
         await self.connection_manager.send_message(
             {"type": "agent_response", "data": response, "connection_id": client_id},
@@ -1,3 +1,5 @@
+from typing import Literal
+
 from pydantic import Field, RedisDsn
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
@@ -8,6 +10,8 @@ SMALL_GPT_MODEL = "gpt-3.5-turbo"
 class Settings(BaseSettings):
     algorithm: str = Field(default="HS256")
     access_token_expire_minutes: int = Field(default=30)
+    # How often a cached ID token is verified again to check whether it has been revoked, in seconds
+    auth_revocation_check_interval: int = Field(default=5 * 60)
 
     google_credentials: str | None = Field(default=None)
     google_cloud_log_name: str = Field(default="backend")
@@ -16,6 +20,20 @@ class Settings(BaseSettings):
     gpt_small_model: str = Field(default=SMALL_GPT_MODEL)
     redis_tls_url: RedisDsn | None = Field(default=None)
     redis_url: RedisDsn = Field(default="redis://localhost:6379/1")
+    redis_max_connections: int = Field(default=50)
+    redis_health_check_interval: int = Field(default=30)  # seconds
+    # Invalidate the other workers' near caches over Redis pub/sub when a cached value changes
+    redis_near_cache_invalidation: bool = Field(default=False)
+    # Share the cached reads of the config repositories between the workers through Redis
+    repository_cache_redis: bool = Field(default=False)
+    # Threads running the agency completions, and how many of them a single user can occupy
+    completion_max_workers: int = Field(default=16)
+    completion_max_per_user: int = Field(default=2)
+    # Maximum number of messages waiting to be sent to a websocket client, and what to do when it's reached
+    websocket_send_buffer_size: int = Field(default=1000)
+    websocket_send_buffer_policy: Literal["coalesce", "drop", "disconnect"] = Field(default="coalesce")
+    # Where the messages for the websocket connections of the other workers go: "local" (single worker) or "redis"
+    websocket_backplane: Literal["local", "redis"] = Field(default="local")
     encryption_key: bytes = Field(default=b"")
     mailchimp_api_key: str | None = Field(default=None)
     mailchimp_list_id: str | None = Field(default=None)
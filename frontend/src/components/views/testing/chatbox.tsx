@@ -367,7 +367,13 @@ const ChatBox = ({
       const updatedMessages = parseMessages(data.data);
       setTimeout(() => {
         setLoading(false);
-        setMessages(updatedMessages);
+        // an incremental response only holds the messages created during the run
+        if (data.incremental) {
+          const currentMessages = useConfigStore.getState().messages || [];
+          setMessages([...currentMessages, ...updatedMessages]);
+        } else {
+          setMessages(updatedMessages);
+        }
       }, 2000);
     } else {
       console.log("error", data);
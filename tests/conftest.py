@@ -3,10 +3,11 @@ from unittest.mock import MagicMock, patch
 
 import pytest
 
+from backend.repositories.repository_cache import clear_repository_caches
 from backend.settings import settings
 from tests.testing_utils import reset_context_vars
 from tests.testing_utils.constants import TEST_AGENCY_ID, TEST_AGENT_ID, TEST_ENCRYPTION_KEY, TEST_USER_ID
-from tests.testing_utils.mock_firestore_client import MockFirestoreClient
+from tests.testing_utils.mock_firestore_client import MockAsyncFirestoreClient, MockFirestoreClient
 
 oai_mock = MagicMock(get_openai_client=MagicMock(return_value=MagicMock(timeout=10)))
 sys.modules["agency_swarm.util.oai"] = oai_mock
@@ -24,15 +25,44 @@ def reset_context_variables():
 @pytest.fixture(autouse=True)
 def mock_firestore_client():
     firestore_client = MockFirestoreClient()
-    with patch("firebase_admin.firestore.client", return_value=firestore_client):
+    clear_repository_caches()
+    with (
+        patch("firebase_admin.firestore.client", return_value=firestore_client),
+        patch("firebase_admin.firestore_async.client", return_value=MockAsyncFirestoreClient(firestore_client)),
+    ):
         yield firestore_client
 
 
+@pytest.fixture(autouse=True)
+def clear_verified_tokens_cache():
+    from backend.services.auth_service import verified_tokens_cache
+
+    verified_tokens_cache.clear()
+    yield
+
+
+@pytest.fixture(autouse=True)
+def clear_user_variables_cache():
+    from backend.services.user_variable_manager import user_variables_cache
+
+    user_variables_cache.clear()
+    yield
+
+
+@pytest.fixture(autouse=True)
+def clear_agent_cache():
+    from backend.services.agent_manager import agent_cache
+
+    agent_cache.clear()
+    yield
+
+
 @pytest.fixture()
 def recover_oai_client():
     from . import oai_mock, original_oai_client
 
     sys.modules["backend.services.oai_client"] = original_oai_client
+    original_oai_client.openai_clients.clear()
     yield
     sys.modules["backend.services.oai_client"] = oai_mock
 
@@ -11,7 +11,8 @@ from tests.testing_utils.constants import TEST_AGENCY_ID
 
 
 @pytest.mark.usefixtures("mock_get_current_user")
-def test_get_agency_list_success(client, mock_firestore_client, agency_adapter):
+@pytest.mark.asyncio
+async def test_get_agency_list_success(client, mock_firestore_client, agency_adapter):
     # Setup expected response
     db_agency = AgencyConfig(
         id="agency1",
@@ -37,7 +38,7 @@ def test_get_agency_list_success(client, mock_firestore_client, agency_adapter):
             "timestamp": "2024-05-05T00:14:57.487901+00:00",
         },
     )
-    expected_agency = agency_adapter.to_api(db_agency)
+    expected_agency = await agency_adapter.to_api(db_agency)
 
     response = client.get("/api/v1/agency/list")
 
@@ -46,7 +47,8 @@ def test_get_agency_list_success(client, mock_firestore_client, agency_adapter):
 
 
 @pytest.mark.usefixtures("mock_get_current_user")
-def test_get_agency_config(client, mock_firestore_client, agency_adapter):
+@pytest.mark.asyncio
+async def test_get_agency_config(client, mock_firestore_client, agency_adapter):
     db_agency = AgencyConfig(
         id=TEST_AGENCY_ID,
         user_id=TEST_USER_ID,
@@ -63,7 +65,7 @@ def test_get_agency_config(client, mock_firestore_client, agency_adapter):
         "sender_agent_id",
         {"id": "sender_agent_id", "config": {"name": "Sender Agent"}, "timestamp": "2024-05-05T00:14:57.487901+00:00"},
     )
-    expected_agency = agency_adapter.to_api(db_agency)
+    expected_agency = await agency_adapter.to_api(db_agency)
 
     response = client.get("/api/v1/agency?id=test_agency_id")
     assert response.status_code == 200
@@ -188,7 +190,8 @@ def test_update_agency_user_id_mismatch(client, mock_firestore_client, agent_con
 
 
 @pytest.mark.usefixtures("mock_get_current_user")
-def test_update_agency_with_foreign_agent(client, mock_firestore_client, agency_adapter):
+@pytest.mark.asyncio
+async def test_update_agency_with_foreign_agent(client, mock_firestore_client, agency_adapter):
     db_agency = {
         "id": TEST_AGENCY_ID,
         "user_id": TEST_USER_ID,
@@ -206,7 +209,7 @@ def test_update_agency_with_foreign_agent(client, mock_firestore_client, agency_
     )
     mock_firestore_client.setup_mock_data("agent_configs", "foreign_agent_id", foreign_agent_flow_spec.model_dump())
     # Simulate a PUT request to update the agency with agents belonging to a different user
-    new_data = agency_adapter.to_api(AgencyConfig(**db_agency)).model_dump()
+    new_data = (await agency_adapter.to_api(AgencyConfig(**db_agency))).model_dump()
     response = client.put("/api/v1/agency", json=new_data)
     # Check if the server responds with a 403 Forbidden
     assert response.status_code == 403
@@ -216,7 +219,10 @@ def test_update_agency_with_foreign_agent(client, mock_firestore_client, agency_
 
 
 @pytest.mark.usefixtures("mock_get_current_user")
-def test_create_or_update_agency_missing_agent(client, agency_adapter, mock_firestore_client, agent_config_data_db):
+@pytest.mark.asyncio
+async def test_create_or_update_agency_missing_agent(
+    client, agency_adapter, mock_firestore_client, agent_config_data_db
+):
     missing_agent_db = deepcopy(agent_config_data_db)
     missing_agent_db["id"] = "missing_agent_id"
     missing_agent_db["config"]["name"] = "Missing Agent"
@@ -231,8 +237,8 @@ def test_create_or_update_agency_missing_agent(client, agency_adapter, mock_fire
     }
     mock_firestore_client.setup_mock_data("agent_configs", "sender_agent_id", agent_config_data_db)
     mock_firestore_client.setup_mock_data("agent_configs", "missing_agent_id", missing_agent_db)  # only for adapter
-    agency_data_with_missing_agent_api = agency_adapter.to_api(
-        AgencyConfig(**agency_data_with_missing_agent_db)
+    agency_data_with_missing_agent_api = (
+        await agency_adapter.to_api(AgencyConfig(**agency_data_with_missing_agent_db))
     ).model_dump()
     mock_firestore_client.collection("agent_configs").document("missing_agent_id").delete()  # remove it
 
@@ -251,7 +257,7 @@ def test_delete_agency_success(mock_openai_client, client, mock_firestore_client
 
     response = client.delete(f"/api/v1/agency?id={TEST_AGENCY_ID}")
     assert response.status_code == 200
-    assert response.json() == {"status": True, "message": "Agency deleted", "data": []}
+    assert response.json() == {"status": True, "message": "Agency deleted", "data": [], "next_cursor": None}
     assert mock_firestore_client.collection("agency_configs").to_dict() == {}
     assert mock_firestore_client.collection("session_configs").to_dict() == {}
     mock_openai_client.return_value.beta.threads.delete.assert_called_with(thread_id="test_session_id", timeout=30.0)
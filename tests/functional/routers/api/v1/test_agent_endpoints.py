@@ -27,9 +27,11 @@ def test_get_agent_list(agent_config_data_api, agent_config_data_db, client, moc
         {"title": "SearchWeb", "approved": True, "timestamp": "2024-05-05T00:14:57.487901+00:00"},
     )
 
+    mock_agent_data_api_template = {**agent_config_data_api, "id": "agent2", "user_id": None}
+
     response = client.get("/api/v1/agent/list")
     assert response.status_code == 200
-    assert response.json()["data"] == [agent_config_data_api]
+    assert response.json()["data"] == [agent_config_data_api, mock_agent_data_api_template]
 
 
 @pytest.mark.usefixtures("mock_get_current_user")
@@ -115,7 +117,7 @@ def test_create_agent_from_template(client, agent_config_data_api, mock_firestor
     agent_config_data_api["user_id"] = None
 
     with patch("backend.services.agent_manager.AgentManager._construct_agent") as mock_construct_agent:
-        mock_construct_agent.return_value = Mock(id=TEST_AGENT_ID)
+        mock_construct_agent.return_value = Mock(id=TEST_AGENT_ID, assistant_fingerprint="fingerprint")
 
         response = client.put("/api/v1/agent", json=agent_config_data_api)
 
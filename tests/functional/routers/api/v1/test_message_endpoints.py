@@ -1,7 +1,9 @@
+import json
 from unittest.mock import MagicMock, patch
 
 import pytest
 from agency_swarm import Agency
+from openai.types.beta.threads import Message as OpenAIMessage, Text, TextDelta
 
 from backend.constants import INTERNAL_ERROR_MESSAGE
 from backend.dependencies.dependencies import get_user_variable_manager
@@ -183,3 +185,72 @@ def test_post_message_processing_failure(client, mock_construct_agency, mock_fir
     assert response.json()["data"]["message"] == INTERNAL_ERROR_MESSAGE
 
     mock_construct_agency.assert_called_once_with(AgencyConfig(**agency_data), {})
+
+
+def _parse_server_sent_events(body: str) -> list[tuple[str, dict]]:
+    events = []
+    for chunk in body.strip().split("\n\n"):
+        event_line, data_line = chunk.split("\n")
+        events.append((event_line.removeprefix("event: "), json.loads(data_line.removeprefix("data: "))))
+    return events
+
+
+@pytest.mark.usefixtures("mock_get_current_user", "mock_session_storage")
+def test_post_message_stream_success(client, mock_construct_agency, mock_firestore_client, message_data):
+    agency_data = {
+        "user_id": TEST_USER_ID,
+        "id": TEST_AGENCY_ID,
+        "name": "Test Agency",
+        "main_agent": "sender_agent_id",
+        "timestamp": "2024-05-05T00:14:57.487901+00:00",
+    }
+    mock_firestore_client.setup_mock_data("agency_configs", TEST_AGENCY_ID, agency_data)
+
+    def get_completion_stream(message, event_handler_cls):  # noqa: ARG001
+        event_handler_cls.agent_name = "Agent"
+        event_handler_cls.recipient_agent_name = "Recipient"
+        event_handler = event_handler_cls()
+        event_handler.on_text_delta(TextDelta(value="Hi"), Text(value="Hi", annotations=[]))
+        event_handler.on_text_done(Text(value="Hi", annotations=[]))
+        event_handler.on_message_done(
+            OpenAIMessage.model_construct(
+                id="msg_1",
+                thread_id="test_session_id",
+                role="assistant",
+                created_at=1700000000,
+                content=[MagicMock(text=Text(value="Hi", annotations=[]))],
+            )
+        )
+
+    mock_construct_agency.return_value.get_completion_stream.side_effect = get_completion_stream
+
+    response = client.post("/api/v1/message/stream", json=message_data)
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/event-stream")
+    events = _parse_server_sent_events(response.text)
+    assert [event_type for event_type, _ in events] == ["agent_status", "agent_message", "agent_response"]
+    assert events[0][1] == {"message": "Hi"}
+    assert events[1][1] == {"sender": "Recipient", "recipient": "Agent", "message": {"content": "Hi"}}
+    final_response = events[2][1]
+    assert final_response["status"] is True
+    assert final_response["incremental"] is True
+    assert [(message["id"], message["content"]) for message in final_response["data"]] == [("msg_1", "Hi")]
+
+
+@pytest.mark.usefixtures("mock_get_current_user", "mock_session_storage")
+def test_post_message_stream_error(client, mock_construct_agency, mock_firestore_client, message_data):
+    agency_data = {
+        "user_id": TEST_USER_ID,
+        "id": TEST_AGENCY_ID,
+        "name": "Test Agency",
+        "main_agent": "sender_agent_id",
+        "timestamp": "2024-05-05T00:14:57.487901+00:00",
+    }
+    mock_firestore_client.setup_mock_data("agency_configs", TEST_AGENCY_ID, agency_data)
+    mock_construct_agency.return_value.get_completion_stream.side_effect = Exception("Test exception")
+
+    response = client.post("/api/v1/message/stream", json=message_data)
+
+    assert response.status_code == 200
+    assert _parse_server_sent_events(response.text) == [("error", {"status": False, "message": INTERNAL_ERROR_MESSAGE})]
@@ -5,6 +5,7 @@ import pytest
 
 from backend.exceptions import NotFoundError
 from backend.services.agency_manager import AgencyManager
+from backend.services.session_manager import SessionManager
 from tests.testing_utils import TEST_USER_ID
 from tests.testing_utils.constants import TEST_AGENCY_ID
 
@@ -67,6 +68,20 @@ def test_create_session_success(client, mock_firestore_client):
         }
 
 
+@pytest.mark.usefixtures("mock_get_current_user")
+def test_create_session_releases_agency_on_error(client):
+    agency_mock = MagicMock()
+    with (
+        patch.object(AgencyManager, "get_agency", AsyncMock(return_value=(agency_mock, MagicMock()))),
+        patch.object(AgencyManager, "release_agency") as mock_release_agency,
+        patch.object(SessionManager, "create_session", AsyncMock(side_effect=RuntimeError("Firestore error"))),
+    ):
+        response = client.post(f"/api/v1/session?agency_id={TEST_AGENCY_ID}")
+
+    assert response.status_code == 500
+    mock_release_agency.assert_called_once_with(agency_mock)
+
+
 @pytest.mark.usefixtures("mock_get_current_user")
 def test_create_session_agency_not_found(client, mock_firestore_client):
     with patch.object(
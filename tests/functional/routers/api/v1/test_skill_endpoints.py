@@ -29,6 +29,31 @@ def test_get_skill_list(skill_config_data, client, mock_firestore_client):
     assert response.json()["data"] == [skill_config_data]
 
 
+@pytest.mark.usefixtures("mock_get_current_user")
+def test_get_skill_list_page(skill_config_data, client, mock_firestore_client):
+    # User skills and templates are merged into a single list, newest first.
+    # skill1 has the same timestamp as skill2, the last item of the first page.
+    for id_, user_id, timestamp in [
+        ("skill1", TEST_USER_ID, "2024-04-02"),
+        ("skill2", None, "2024-04-02"),
+        ("skill3", TEST_USER_ID, "2024-04-03"),
+        ("skill4", None, "2024-04-04"),
+    ]:
+        skill_data = {**skill_config_data, "id": id_, "user_id": user_id, "timestamp": timestamp}
+        mock_firestore_client.setup_mock_data("skill_configs", id_, skill_data)
+
+    response = client.get("/api/v1/skill/list?limit=3")
+    assert response.status_code == 200
+    assert [skill["id"] for skill in response.json()["data"]] == ["skill4", "skill3", "skill2"]
+    next_cursor = response.json()["next_cursor"]
+    assert next_cursor is not None
+
+    response = client.get("/api/v1/skill/list", params={"limit": 3, "cursor": next_cursor})
+    assert response.status_code == 200
+    assert [skill["id"] for skill in response.json()["data"]] == ["skill1"]
+    assert response.json()["next_cursor"] is None
+
+
 @pytest.mark.usefixtures("mock_get_current_user")
 def test_get_skill_config_success(skill_config_data, client, mock_firestore_client):
     mock_firestore_client.setup_mock_data("skill_configs", skill_config_data["id"], skill_config_data)
@@ -62,7 +87,9 @@ def test_delete_skill_success(skill_config_data, client, mock_firestore_client):
 
     response = client.delete("/api/v1/skill?id=skill1")
     assert response.status_code == 200
-    assert response.json() == {"status": True, "message": "Skill configuration deleted", "data": []}
+    assert response.json() == {
+        "status": True, "message": "Skill configuration deleted", "data": [], "next_cursor": None
+    }
 
     # Verify if the skill configuration is deleted in the mock Firestore client
     assert mock_firestore_client.to_dict() == {}
@@ -100,7 +127,8 @@ def test_approve_skill(skill_config_data, client, mock_firestore_client):
 
 
 @pytest.mark.usefixtures("mock_get_current_user")
-def test_update_skill_config_success(skill_config_data, client, mock_firestore_client):
+@pytest.mark.asyncio
+async def test_update_skill_config_success(skill_config_data, client, mock_firestore_client):
     mock_firestore_client.setup_mock_data("skill_configs", "skill1", skill_config_data)
 
     skill_config_data = skill_config_data.copy()
@@ -113,7 +141,7 @@ def test_update_skill_config_success(skill_config_data, client, mock_firestore_c
     assert response.json()["message"] == "Version 2 of the skill Skill 1 Updated created"
 
     # Verify if the skill configuration is updated in the mock Firestore client
-    updated_config = SkillConfigStorage().load_by_id("skill1")
+    updated_config = await SkillConfigStorage().load_by_id("skill1")
     assert updated_config.title == "Skill 1 Updated"
     assert updated_config.content == 'print("Hello World Updated")'
     assert updated_config.version == 2
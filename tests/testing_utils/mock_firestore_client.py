@@ -15,9 +15,16 @@ class MockFirestoreClient:
         self._collections = {}
         self._current_collection = None
         self._current_documents = {}
+        self._reset_query()
+
+    def _reset_query(self):
+        self._order_by = []
+        self._limit = None
+        self._start_after = None
 
     def collection(self, collection_name):
         self._current_collection = collection_name
+        self._reset_query()
         self._collections.setdefault(collection_name, {})
         if collection_name not in self._current_documents:
             self._current_documents[collection_name] = {"current_document": None}
@@ -56,10 +63,44 @@ class MockFirestoreClient:
 
     def where(self, filter: FieldFilter):
         self._where_field = filter.field_path
-        self._where_op = filter.op_string
+        # `== None` filters are converted to the unary IS_NULL operator
+        self._where_op = filter.op_string if isinstance(filter.op_string, str) else "=="
         self._where_value = filter.value
         return self
 
+    def order_by(self, field_path, direction="ASCENDING"):
+        self._order_by.append((field_path, direction == "DESCENDING"))
+        return self
+
+    def limit(self, count):
+        self._limit = count
+        return self
+
+    def start_after(self, document_fields: dict):
+        self._start_after = document_fields
+        return self
+
+    @staticmethod
+    def _get_field(doc: MockDocumentSnapshot, field_path: str):
+        # FieldPath.document_id()
+        return doc.id if field_path == "__name__" else doc.to_dict().get(field_path)
+
+    def _is_after_cursor(self, doc: MockDocumentSnapshot) -> bool:
+        for field_path, descending in self._order_by:
+            if field_path not in self._start_after:
+                break
+            doc_value, cursor_value = self._get_field(doc, field_path), self._start_after[field_path]
+            if doc_value != cursor_value:
+                return doc_value < cursor_value if descending else doc_value > cursor_value
+        return False
+
+    def _apply_ordering(self, docs: list[MockDocumentSnapshot]) -> list[MockDocumentSnapshot]:
+        for field_path, descending in reversed(self._order_by):
+            docs.sort(key=lambda doc: self._get_field(doc, field_path), reverse=descending)
+        if self._start_after is not None:
+            docs = [doc for doc in docs if self._is_after_cursor(doc)]
+        return docs[: self._limit] if self._limit else docs
+
     def stream(self):
         matching_docs = []
         collection = self._collections.get(self._current_collection, {})
@@ -75,7 +116,7 @@ class MockFirestoreClient:
                 and self._where_value in doc_value
             ):
                 matching_docs.append(MockDocumentSnapshot(doc_id, doc))
-        return iter(matching_docs)
+        return iter(self._apply_ordering(matching_docs))
 
     def add(self, data) -> tuple:
         collection = self._current_collection
@@ -95,3 +136,59 @@ class MockFirestoreClient:
         current_doc_id = self._current_documents[collection].get("current_document")
         self._collections[collection].pop(current_doc_id, None)
         self._current_documents[collection]["current_document"] = None
+
+
+class MockAsyncFirestoreClient:
+    """Mirrors the Firestore AsyncClient API on top of the MockFirestoreClient data, so that the tests can set up
+    the data with MockFirestoreClient.setup_mock_data and read it through the async repositories."""
+
+    def __init__(self, client: MockFirestoreClient):
+        self._client = client
+
+    def collection(self, collection_name):
+        self._client.collection(collection_name)
+        return self
+
+    def document(self, document_name):
+        self._client.document(document_name)
+        return self
+
+    async def get(self):
+        return self._client.get()
+
+    def where(self, filter: FieldFilter):
+        self._client.where(filter)
+        return self
+
+    def order_by(self, field_path, direction="ASCENDING"):
+        self._client.order_by(field_path, direction)
+        return self
+
+    def limit(self, count):
+        self._client.limit(count)
+        return self
+
+    def start_after(self, document_fields: dict):
+        self._client.start_after(document_fields)
+        return self
+
+    def stream(self):
+        # Evaluate the query eagerly: the mock keeps the query state on the client
+        return self._iterate(list(self._client.stream()))
+
+    async def set(self, data: dict):
+        self._client.set(data)
+
+    async def add(self, data) -> tuple:
+        return self._client.add(data)
+
+    async def update(self, data: dict, option=None):
+        self._client.update(data, option)
+
+    async def delete(self):
+        self._client.delete()
+
+    @staticmethod
+    async def _iterate(documents):
+        for document in documents:
+            yield document
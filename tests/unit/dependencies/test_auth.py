@@ -1,4 +1,5 @@
 import pickle
+import time
 from typing import Any
 from unittest.mock import patch, AsyncMock
 
@@ -6,7 +7,7 @@ import pytest
 
 from redis import asyncio as aioredis
 
-from fastapi import HTTPException
+from fastapi import HTTPException, Request
 from fastapi.security import HTTPAuthorizationCredentials
 from firebase_admin.auth import (
     CertificateFetchError,
@@ -17,9 +18,11 @@ from firebase_admin.auth import (
 )
 
 from backend.dependencies.auth import get_current_superuser, get_current_user
-from backend.models.auth import User
+from backend.constants import AUTH_CACHE_KEY_PREFIX
+from backend.models.auth import User, VerifiedToken
 from backend.services.auth_service import AuthService
 from backend.services.redis_cache_manager import RedisCacheManager
+from backend.utils import hash_string
 
 user_data: dict[str, Any] = {
     "uid": "testuser",
@@ -51,9 +54,9 @@ def mock_verify_id_token():
 @pytest.mark.asyncio
 async def test_get_current_user_valid(mock_verify_id_token, cache_manager):
     user = await get_current_user(
+        Request({"type": "http"}),
         HTTPAuthorizationCredentials(scheme="Bearer", credentials="valid_token"),
-        auth_service=AuthService(),
-        cache_manager=cache_manager
+        auth_service=AuthService(cache_manager),
     )
     assert user.id == user_data["uid"]
     assert not user.is_superuser
@@ -76,9 +79,9 @@ async def test_get_current_user_invalid(mock_verify_id_token, exception, cache_m
     mock_verify_id_token.side_effect = exception
     with pytest.raises(HTTPException) as exc:
         await get_current_user(
+            Request({"type": "http"}),
             HTTPAuthorizationCredentials(scheme="Bearer", credentials="invalid_token"),
-            auth_service=AuthService(),
-            cache_manager=cache_manager
+            auth_service=AuthService(cache_manager),
         )
         assert exc.value.status_code == 401
     mock_verify_id_token.assert_called_once_with("invalid_token", check_revoked=True)
@@ -96,16 +99,44 @@ async def test_get_current_superuser_not_superuser(mock_verify_id_token):
 
 @pytest.mark.asyncio
 async def test_get_current_user_cached(cache_manager, mock_verify_id_token):
-    token = "valid_token"
-    await cache_manager.set(token, User.model_validate({
-        'id': 'testuser',
-        'email': 'testuser@example.com',
-        'is_superuser': False
-    }), expire=300)
+    verified_token = VerifiedToken(
+        user=User(id="testuser", email="testuser@example.com"),
+        expires_at=time.time() + 3600,
+        revocation_checked_at=time.time(),
+    )
+    cache_manager.redis.get.return_value = pickle.dumps(verified_token.model_dump())
     credentials = HTTPAuthorizationCredentials(scheme="Bearer", credentials="valid_token")
     user = await get_current_user(
+        Request({"type": "http"}),
         credentials,
-        auth_service=AuthService(),
-        cache_manager=cache_manager
+        auth_service=AuthService(cache_manager),
     )
     assert user.id == user_data["uid"]
+    mock_verify_id_token.assert_not_called()
+    cache_manager.redis.get.assert_called_once_with(AUTH_CACHE_KEY_PREFIX + hash_string("valid_token"))
+
+
+@pytest.mark.asyncio
+async def test_get_current_user_authenticated_by_middleware(cache_manager, mock_verify_id_token):
+    request = Request({"type": "http"})
+    request.state.user = User(id="testuser", email="testuser@example.com")
+    credentials = HTTPAuthorizationCredentials(scheme="Bearer", credentials="valid_token")
+
+    user = await get_current_user(request, credentials, auth_service=AuthService(cache_manager))
+
+    assert user == request.state.user
+    mock_verify_id_token.assert_not_called()
+    cache_manager.redis.get.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_get_current_user_rejected_by_middleware(cache_manager, mock_verify_id_token):
+    request = Request({"type": "http"})
+    request.state.auth_error = HTTPException(status_code=401, detail="Could not validate credentials")
+    credentials = HTTPAuthorizationCredentials(scheme="Bearer", credentials="invalid_token")
+
+    with pytest.raises(HTTPException) as exc:
+        await get_current_user(request, credentials, auth_service=AuthService(cache_manager))
+
+    assert exc.value.status_code == 401
+    mock_verify_id_token.assert_not_called()
@@ -0,0 +1,16 @@
+import pytest
+
+from backend.dependencies.dependencies import close_redis, get_redis
+from backend.settings import settings
+
+
+@pytest.mark.asyncio
+async def test_get_redis_shares_connection_pool():
+    redis = get_redis()
+
+    assert get_redis() is redis
+    assert redis.connection_pool.max_connections == settings.redis_max_connections
+
+    await close_redis()
+    assert get_redis() is not redis
+    await close_redis()
@@ -39,6 +39,7 @@ async def test_invalid_token():
         call_next.assert_called_once()
         assert response.status_code == 200
         mock_get_user.assert_called_once_with("invalidtoken")
+        assert request.state.auth_error.status_code == HTTPStatus.UNAUTHORIZED
 
 
 @pytest.mark.asyncio
@@ -59,5 +60,6 @@ async def test_valid_token(caplog):
         call_next.assert_called_once()
         mock_set.assert_called_with("user_id", "123")
         mock_get_user.assert_called_once_with("validtoken")
+        assert request.state.user == user_mock
         assert "Current User ID set in context: 123" in caplog.text
         assert response.status_code == 200
@@ -1,30 +1,35 @@
+import pytest
+
 from backend.models.agency_config import AgencyConfig
 from backend.repositories.agency_config_storage import AgencyConfigStorage
 from tests.testing_utils.constants import TEST_AGENCY_ID, TEST_AGENT_ID, TEST_USER_ID
 
 
-def test_load_agency_config_by_user_id(mock_firestore_client, agency_config_data):
+@pytest.mark.asyncio
+async def test_load_agency_config_by_user_id(mock_firestore_client, agency_config_data):
     mocked_data = AgencyConfig.model_validate(agency_config_data)
     mock_firestore_client.setup_mock_data("agency_configs", TEST_AGENCY_ID, agency_config_data)
 
     storage = AgencyConfigStorage()
-    result = storage.load_by_user_id(TEST_USER_ID)
+    result = await storage.load_by_user_id(TEST_USER_ID)
 
     assert len(result) == 1
     assert result[0] == mocked_data
 
 
-def test_load_agency_config_by_id(mock_firestore_client, agency_config_data):
+@pytest.mark.asyncio
+async def test_load_agency_config_by_id(mock_firestore_client, agency_config_data):
     mocked_data = AgencyConfig.model_validate(agency_config_data)
     mock_firestore_client.setup_mock_data("agency_configs", TEST_AGENCY_ID, agency_config_data)
 
     storage = AgencyConfigStorage()
-    result = storage.load_by_id(TEST_AGENCY_ID)
+    result = await storage.load_by_id(TEST_AGENCY_ID)
 
     assert result == mocked_data
 
 
-def test_save_new_agency_config(mock_firestore_client):
+@pytest.mark.asyncio
+async def test_save_new_agency_config(mock_firestore_client):
     new_agency_data = {
         "user_id": TEST_USER_ID,
         "name": "New Test Agency",
@@ -35,17 +40,18 @@ def test_save_new_agency_config(mock_firestore_client):
     mock_firestore_client.setup_mock_data("agency_configs", "new_test_agency_id", new_agency_data)
 
     storage = AgencyConfigStorage()
-    id_ = storage.save(new_agency_config)
+    id_ = await storage.save(new_agency_config)
 
     assert id_ is not None
 
 
-def test_save_existing_agency_config(mock_firestore_client, agency_config_data):
+@pytest.mark.asyncio
+async def test_save_existing_agency_config(mock_firestore_client, agency_config_data):
     agency_config = AgencyConfig.model_validate(agency_config_data)
     mock_firestore_client.setup_mock_data("agency_configs", agency_config.id, agency_config_data)
 
     storage = AgencyConfigStorage()
-    id_ = storage.save(agency_config)
+    id_ = await storage.save(agency_config)
 
     # Assert
     assert id_ == agency_config.id
@@ -53,12 +59,25 @@ def test_save_existing_agency_config(mock_firestore_client, agency_config_data):
     assert saved_data == agency_config.model_dump()
 
 
-def test_delete_agency_config(mock_firestore_client, agency_config_data):
+@pytest.mark.asyncio
+async def test_delete_agency_config(mock_firestore_client, agency_config_data):
     agency_config = AgencyConfig.model_validate(agency_config_data)
     mock_firestore_client.setup_mock_data("agency_configs", agency_config.id, agency_config_data)
 
     storage = AgencyConfigStorage()
-    storage.delete(agency_config.id)
+    await storage.delete(agency_config.id)
 
     # Assert
     assert mock_firestore_client.to_dict() == {}
+
+
+@pytest.mark.asyncio
+async def test_load_agency_configs_by_ids(mock_firestore_client, agency_config_data):
+    mock_firestore_client.setup_mock_data("agency_configs", TEST_AGENCY_ID, agency_config_data)
+    other_agency_data = {**agency_config_data, "id": "other_agency_id", "name": "Other Agency"}
+    mock_firestore_client.setup_mock_data("agency_configs", "other_agency_id", other_agency_data)
+
+    storage = AgencyConfigStorage()
+    result = await storage.load_by_ids([TEST_AGENCY_ID, "other_agency_id", "missing_agency_id"])
+
+    assert result == [AgencyConfig.model_validate(agency_config_data), AgencyConfig.model_validate(other_agency_data)]
@@ -30,30 +30,33 @@ def mock_storage():
     return AgentFlowSpecStorage()
 
 
-def test_load_agent_flow_spec(mock_firestore_client, agent_data):
+@pytest.mark.asyncio
+async def test_load_agent_flow_spec(mock_firestore_client, agent_data):
     # Setup mock data
     # setup_mock_data(collection_name, document_name, data)
     mock_firestore_client.setup_mock_data("agent_configs", "agent1", agent_data)
 
     storage = AgentFlowSpecStorage()
-    loaded_agent_flow_spec = storage.load_by_id(agent_data["id"])
+    loaded_agent_flow_spec = await storage.load_by_id(agent_data["id"])
 
     expected_agent_flow_spec = AgentFlowSpec.model_validate(agent_data)
     assert loaded_agent_flow_spec == expected_agent_flow_spec
 
 
-def test_save_existing_agent_flow_spec(mock_firestore_client, agent_data):
+@pytest.mark.asyncio
+async def test_save_existing_agent_flow_spec(mock_firestore_client, agent_data):
     mock_firestore_client.setup_mock_data("agent_configs", "agent1", agent_data)
 
     agent_flow_spec = AgentFlowSpec(**agent_data)
     storage = AgentFlowSpecStorage()
-    storage.save(agent_flow_spec)
+    await storage.save(agent_flow_spec)
 
     serialized_data = agent_flow_spec.model_dump()
     assert mock_firestore_client.to_dict() == serialized_data
 
 
-def test_save_new_agent_flow_spec(mock_firestore_client, agent_data):
+@pytest.mark.asyncio
+async def test_save_new_agent_flow_spec(mock_firestore_client, agent_data):
     mock_firestore_client.setup_mock_data("agent_configs", "new_agent_id", agent_data)
 
     new_agent_data = agent_data.copy()
@@ -62,7 +65,7 @@ def test_save_new_agent_flow_spec(mock_firestore_client, agent_data):
     agent_flow_spec = AgentFlowSpec(**new_agent_data)
 
     storage = AgentFlowSpecStorage()
-    storage.save(agent_flow_spec)
+    await storage.save(agent_flow_spec)
 
     serialized_data = agent_flow_spec.model_dump()
     assert mock_firestore_client.to_dict() == serialized_data
@@ -70,7 +73,8 @@ def test_save_new_agent_flow_spec(mock_firestore_client, agent_data):
     assert agent_flow_spec.id == "new_agent_id"
 
 
-def test_load_agent_flow_spec_by_ids(mock_storage, mock_firestore_client, agent_data):
+@pytest.mark.asyncio
+async def test_load_agent_flow_spec_by_ids(mock_storage, mock_firestore_client, agent_data):
     # Setup multiple agents in the mock database
     ids = ["agent1", "agent2"]
     agent_data2 = agent_data.copy()
@@ -79,7 +83,7 @@ def test_load_agent_flow_spec_by_ids(mock_storage, mock_firestore_client, agent_
     mock_firestore_client.setup_mock_data("agent_configs", "agent1", agent_data)
     mock_firestore_client.setup_mock_data("agent_configs", "agent2", agent_data2)
 
-    loaded_agent_flow_specs = mock_storage.load_by_ids(ids)
+    loaded_agent_flow_specs = await mock_storage.load_by_ids(ids)
 
     expected_agent_flow_spec1 = AgentFlowSpec.model_validate(agent_data)
     expected_agent_flow_spec2 = AgentFlowSpec.model_validate(agent_data2)
@@ -90,19 +94,40 @@ def test_load_agent_flow_spec_by_ids(mock_storage, mock_firestore_client, agent_
     assert expected_agent_flow_spec2 in loaded_agent_flow_specs
 
 
-def test_load_agent_flow_spec_by_ids_exceeds_max_size(mock_storage):
+@pytest.mark.asyncio
+async def test_load_agent_flow_spec_by_ids_exceeds_max_size(mock_storage):
     ids = ["agent1"] * 11
 
     with pytest.raises(ValueError) as excinfo:
-        mock_storage._load_by_ids(ids)
+        await mock_storage._load_by_ids(ids)
 
     assert "IDs list exceeds the maximum size of 10 for an 'in' query in Firestore." in str(excinfo.value)
 
 
-def test_delete_agent_flow_spec(mock_storage, mock_firestore_client, agent_data):
+@pytest.mark.asyncio
+async def test_delete_agent_flow_spec(mock_storage, mock_firestore_client, agent_data):
     mock_firestore_client.setup_mock_data("agent_configs", "agent1", agent_data)
 
     agent_flow_spec = AgentFlowSpec(**agent_data)
-    mock_storage.delete(agent_flow_spec.id)
+    await mock_storage.delete(agent_flow_spec.id)
 
     assert mock_firestore_client.to_dict() == {}
+
+
+@pytest.mark.asyncio
+async def test_load_agent_flow_specs_by_user_ids(mock_firestore_client, agent_data):
+    for id_, user_id, timestamp in [
+        ("agent1", TEST_USER_ID, "2024-01-01"),
+        ("agent2", None, "2024-01-02"),
+        ("agent3", TEST_USER_ID, "2024-01-03"),
+        ("agent4", "another_user", "2024-01-04"),
+        ("agent5", None, "2023-12-31"),
+    ]:
+        mock_firestore_client.setup_mock_data(
+            "agent_configs", id_, {**agent_data, "id": id_, "user_id": user_id, "timestamp": timestamp}
+        )
+    storage = AgentFlowSpecStorage()
+
+    loaded_agents = await storage.load_by_user_ids([TEST_USER_ID, None], limit=2, cursor="2024-01-03")
+
+    assert [agent.id for agent in loaded_agents] == ["agent2", "agent1"]
@@ -0,0 +1,157 @@
+import json
+from unittest.mock import AsyncMock
+
+import pytest
+from redis import asyncio as aioredis
+
+from backend.constants import REPOSITORY_CACHE_INVALIDATION_CHANNEL
+from backend.models.agency_config import AgencyConfig
+from backend.repositories import repository_cache
+from backend.repositories.agency_config_storage import AgencyConfigStorage
+from backend.repositories.repository_cache import RepositoryCache, get_repository_cache, set_redis_tier
+from backend.services.redis_cache_manager import RedisCacheManager
+from tests.testing_utils.constants import TEST_AGENCY_ID, TEST_USER_ID
+
+
+def test_repository_cache_returns_copies():
+    cache = RepositoryCache(maxsize=10, ttl=60)
+    value = {"name": "Test Agency"}
+    cache.set("key", value)
+
+    result = cache.get("key")
+    result["name"] = "Changed"
+
+    assert cache.get("key") == {"name": "Test Agency"}
+
+
+def test_repository_cache_clear():
+    cache = RepositoryCache(maxsize=10, ttl=60)
+    cache.set("key", "value")
+
+    cache.clear()
+
+    assert cache.get("key") is None
+
+
+@pytest.mark.asyncio
+async def test_load_by_id_is_cached(mock_firestore_client, agency_config_data):
+    mock_firestore_client.setup_mock_data("agency_configs", TEST_AGENCY_ID, agency_config_data)
+    storage = AgencyConfigStorage()
+    expected = AgencyConfig.model_validate(agency_config_data)
+
+    assert await storage.load_by_id(TEST_AGENCY_ID) == expected
+
+    # Changes made directly in the DB are not visible until the cache is invalidated
+    mock_firestore_client.setup_mock_data("agency_configs", TEST_AGENCY_ID, {**agency_config_data, "name": "New"})
+    assert await storage.load_by_id(TEST_AGENCY_ID) == expected
+
+    get_repository_cache("agency_configs").clear()
+    assert (await storage.load_by_id(TEST_AGENCY_ID)).name == "New"
+
+
+@pytest.mark.asyncio
+async def test_missing_document_is_not_cached(mock_firestore_client, agency_config_data):
+    storage = AgencyConfigStorage()
+
+    assert await storage.load_by_id(TEST_AGENCY_ID) is None
+
+    mock_firestore_client.setup_mock_data("agency_configs", TEST_AGENCY_ID, agency_config_data)
+    assert await storage.load_by_id(TEST_AGENCY_ID) == AgencyConfig.model_validate(agency_config_data)
+
+
+@pytest.mark.asyncio
+async def test_save_invalidates_cached_reads(mock_firestore_client, agency_config_data):
+    mock_firestore_client.setup_mock_data("agency_configs", TEST_AGENCY_ID, agency_config_data)
+    storage = AgencyConfigStorage()
+    assert len(await storage.load_by_user_id(TEST_USER_ID)) == 1
+
+    agency_config = AgencyConfig.model_validate(agency_config_data)
+    agency_config.name = "Updated Agency"
+    await storage.save(agency_config)
+
+    assert (await storage.load_by_id(TEST_AGENCY_ID)).name == "Updated Agency"
+    assert (await storage.load_by_user_id(TEST_USER_ID))[0].name == "Updated Agency"
+
+
+@pytest.mark.asyncio
+async def test_delete_invalidates_cached_reads(mock_firestore_client, agency_config_data):
+    mock_firestore_client.setup_mock_data("agency_configs", TEST_AGENCY_ID, agency_config_data)
+    storage = AgencyConfigStorage()
+    assert await storage.load_by_id(TEST_AGENCY_ID) is not None
+
+    await storage.delete(TEST_AGENCY_ID)
+
+    assert await storage.load_by_id(TEST_AGENCY_ID) is None
+
+
+def test_repository_cache_skips_values_loaded_before_clear():
+    cache = RepositoryCache(maxsize=10, ttl=60)
+    generation = cache.generation
+
+    cache.clear()  # a write happened while the value was loaded
+    cache.set("key", "stale value", generation)
+
+    assert cache.get("key") is None
+
+
+@pytest.fixture
+def redis_tier():
+    """A Redis tier backed by a dict."""
+    data: dict[str, bytes] = {}
+    redis_mock = AsyncMock(spec=aioredis.Redis)
+    redis_mock.get = AsyncMock(side_effect=lambda key: data.get(key))
+
+    async def set_value(key, value, ex=None):  # noqa: ARG001
+        data[key] = value
+
+    redis_mock.set = AsyncMock(side_effect=set_value)
+    redis_mock.incr = AsyncMock(side_effect=lambda key: data.__setitem__(key, int(data.get(key, 0)) + 1))
+    redis_mock.publish = AsyncMock()
+    set_redis_tier(RedisCacheManager(redis_mock))
+    yield redis_mock
+    set_redis_tier(None)
+
+
+@pytest.mark.asyncio
+@pytest.mark.usefixtures("redis_tier")
+async def test_redis_tier_is_read_before_firestore(mock_firestore_client, agency_config_data):
+    mock_firestore_client.setup_mock_data("agency_configs", TEST_AGENCY_ID, agency_config_data)
+    storage = AgencyConfigStorage()
+    expected = AgencyConfig.model_validate(agency_config_data)
+    assert await storage.load_by_id(TEST_AGENCY_ID) == expected
+
+    # Another worker, with an empty in-process cache, gets the value cached in Redis
+    get_repository_cache("agency_configs").clear()
+    mock_firestore_client.setup_mock_data("agency_configs", TEST_AGENCY_ID, {**agency_config_data, "name": "New"})
+    assert await storage.load_by_id(TEST_AGENCY_ID) == expected
+
+
+@pytest.mark.asyncio
+async def test_write_invalidates_redis_tier_of_all_workers(redis_tier, mock_firestore_client, agency_config_data):
+    mock_firestore_client.setup_mock_data("agency_configs", TEST_AGENCY_ID, agency_config_data)
+    storage = AgencyConfigStorage()
+    assert await storage.load_by_id(TEST_AGENCY_ID) is not None
+
+    agency_config = AgencyConfig.model_validate(agency_config_data)
+    agency_config.name = "Updated Agency"
+    await storage.save(agency_config)
+
+    redis_tier.incr.assert_awaited_once_with("repository:agency_configs:generation")
+    message = json.loads(redis_tier.publish.await_args.args[1])
+    assert redis_tier.publish.await_args.args[0] == REPOSITORY_CACHE_INVALIDATION_CHANNEL
+    assert message["collection"] == "agency_configs"
+    assert (await storage.load_by_id(TEST_AGENCY_ID)).name == "Updated Agency"
+
+
+def test_invalidation_from_another_worker_clears_local_cache():
+    cache = get_repository_cache("agency_configs")
+    cache.set("key", "value")
+
+    # Our own invalidations were already applied when writing
+    repository_cache._handle_invalidation(
+        json.dumps({"origin_id": repository_cache._origin_id, "collection": "agency_configs"})
+    )
+    assert cache.get("key") == "value"
+
+    repository_cache._handle_invalidation(json.dumps({"origin_id": "other_worker", "collection": "agency_configs"}))
+    assert cache.get("key") is None
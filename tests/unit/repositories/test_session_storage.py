@@ -1,6 +1,7 @@
 import pytest
 
 from backend.models.session_config import SessionConfig
+from backend.repositories.pagination import get_next_cursor
 from backend.repositories.session_storage import SessionConfigStorage
 from tests.testing_utils import TEST_USER_ID
 
@@ -22,58 +23,95 @@ def storage():
     return SessionConfigStorage()
 
 
-def test_load_session_config_by_session_id(mock_firestore_client, session_data, storage):
+@pytest.mark.asyncio
+async def test_load_session_config_by_session_id(mock_firestore_client, session_data, storage):
     mock_firestore_client.setup_mock_data("session_configs", "session1", session_data)
 
-    loaded_session_config = storage.load_by_id("session1")
+    loaded_session_config = await storage.load_by_id("session1")
 
     assert loaded_session_config is not None
     assert loaded_session_config.id == "session1"
     assert loaded_session_config.model_dump() == session_data
 
 
-def test_load_session_config_by_user_id(mock_firestore_client, session_data, storage):
+@pytest.mark.asyncio
+async def test_load_session_config_by_user_id(mock_firestore_client, session_data, storage):
     # Setup mock data
     mock_firestore_client.setup_mock_data("session_configs", "session1", session_data)
 
     # Simulate loading session configs by user_id, reflecting the correct usage of `where()` before `stream()`
-    loaded_sessions = storage.load_by_user_id(session_data["user_id"])
+    loaded_sessions = await storage.load_by_user_id(session_data["user_id"])
 
     assert loaded_sessions is not None
     # Verify that all loaded sessions have the correct user_id
     assert all(session.user_id == session_data["user_id"] for session in loaded_sessions)
 
 
-def test_load_session_config_by_agency_id(mock_firestore_client, session_data, storage):
+@pytest.mark.asyncio
+async def test_load_session_configs_page_by_user_id(mock_firestore_client, session_data, storage):
+    for i in range(1, 6):
+        mock_firestore_client.setup_mock_data(
+            "session_configs", f"session{i}", {**session_data, "id": f"session{i}", "timestamp": f"2024-05-0{i}"}
+        )
+
+    first_page = await storage.load_by_user_id(TEST_USER_ID, limit=2)
+    second_page = await storage.load_by_user_id(TEST_USER_ID, limit=2, cursor=first_page[-1].timestamp)
+    last_page = await storage.load_by_user_id(TEST_USER_ID, limit=2, cursor=second_page[-1].timestamp)
+
+    assert [session.id for session in first_page] == ["session5", "session4"]
+    assert [session.id for session in second_page] == ["session3", "session2"]
+    assert [session.id for session in last_page] == ["session1"]
+
+
+@pytest.mark.asyncio
+async def test_load_session_configs_page_with_equal_timestamps(mock_firestore_client, session_data, storage):
+    # session2 and session3 share the timestamp at the boundary of the first page
+    for i, timestamp in [(1, "2024-05-01"), (2, "2024-05-02"), (3, "2024-05-02"), (4, "2024-05-04")]:
+        mock_firestore_client.setup_mock_data(
+            "session_configs", f"session{i}", {**session_data, "id": f"session{i}", "timestamp": timestamp}
+        )
+
+    first_page = await storage.load_by_user_id(TEST_USER_ID, limit=2)
+    second_page = await storage.load_by_user_id(TEST_USER_ID, limit=2, cursor=get_next_cursor(first_page, 2))
+
+    assert [session.id for session in first_page] == ["session4", "session3"]
+    assert [session.id for session in second_page] == ["session2", "session1"]
+
+
+@pytest.mark.asyncio
+async def test_load_session_config_by_agency_id(mock_firestore_client, session_data, storage):
     # Setup mock data
     mock_firestore_client.setup_mock_data("session_configs", "session1", session_data)
 
     # Simulate loading session configs by agency_id, reflecting the correct usage of `where()` before `stream()`
-    loaded_sessions = storage.load_by_agency_id(session_data["agency_id"])
+    loaded_sessions = await storage.load_by_agency_id(session_data["agency_id"])
 
     assert loaded_sessions is not None
     # Verify that all loaded sessions have the correct agency_id
     assert all(session.agency_id == session_data["agency_id"] for session in loaded_sessions)
 
 
-def test_update_session_config(mock_firestore_client, session_data, storage):
+@pytest.mark.asyncio
+async def test_update_session_config(mock_firestore_client, session_data, storage):
     mock_firestore_client.setup_mock_data("session_configs", "session1", session_data)
 
-    storage.update("session1", {"timestamp": "2024-05-05T00:14:57.487901+00:00"})
+    await storage.update("session1", {"timestamp": "2024-05-05T00:14:57.487901+00:00"})
 
     assert mock_firestore_client.to_dict()["timestamp"] == "2024-05-05T00:14:57.487901+00:00"
 
 
-def test_save_session_config(mock_firestore_client, session_data, storage):
+@pytest.mark.asyncio
+async def test_save_session_config(mock_firestore_client, session_data, storage):
     session_to_save = SessionConfig(**session_data)
-    storage.save(session_to_save)
+    await storage.save(session_to_save)
 
     assert mock_firestore_client.to_dict()["id"] == "session1"
 
 
-def test_delete_session_config(mock_firestore_client, session_data, storage):
+@pytest.mark.asyncio
+async def test_delete_session_config(mock_firestore_client, session_data, storage):
     mock_firestore_client.setup_mock_data("session_configs", "session1", session_data)
 
-    storage.delete("session1")
+    await storage.delete("session1")
 
     assert mock_firestore_client.to_dict() == {}
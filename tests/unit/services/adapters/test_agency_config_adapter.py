@@ -41,7 +41,8 @@ def test_to_model(agency_adapter):
     }
 
 
-def test_to_api(agency_adapter, agent_adapter, mocker):
+@pytest.mark.asyncio
+async def test_to_api(agency_adapter, agent_adapter, mocker):
     sender = AgentFlowSpec(id="sender_id", config=AgentConfig(name="Sender"))
     receiver = AgentFlowSpec(id="receiver_id", config=AgentConfig(name="Receiver"))
     agency_config = AgencyConfig(
@@ -61,18 +62,19 @@ def test_to_api(agency_adapter, agent_adapter, mocker):
         "load_by_ids",
         return_value=[sender, receiver],
     )
-    agency_config_api = agency_adapter.to_api(agency_config)
+    agency_config_api = await agency_adapter.to_api(agency_config)
     assert agency_config_api.name == "Test Agency"
     assert agency_config_api.description == "Test Description"
     assert agency_config_api.shared_instructions == "Test Instructions"
     assert len(agency_config_api.flows) == 2
-    assert agency_config_api.flows[0].sender == agent_adapter.to_api(sender)
-    assert agency_config_api.flows[0].receiver == agent_adapter.to_api(receiver)
-    assert agency_config_api.flows[1].sender == agent_adapter.to_api(sender)
-    assert agency_config_api.flows[1].receiver == agent_adapter.to_api(receiver)
+    assert agency_config_api.flows[0].sender == await agent_adapter.to_api(sender)
+    assert agency_config_api.flows[0].receiver == await agent_adapter.to_api(receiver)
+    assert agency_config_api.flows[1].sender == await agent_adapter.to_api(sender)
+    assert agency_config_api.flows[1].receiver == await agent_adapter.to_api(receiver)
 
 
-def test_to_api_without_agents(agency_adapter):
+@pytest.mark.asyncio
+async def test_to_api_without_agents(agency_adapter):
     agency_config = AgencyConfig(
         id="agency_id",
         name="Test Agency",
@@ -82,8 +84,39 @@ def test_to_api_without_agents(agency_adapter):
         main_agent="Sender",
         agency_chart={},
     )
-    agency_config_api = agency_adapter.to_api(agency_config)
+    agency_config_api = await agency_adapter.to_api(agency_config)
     assert agency_config_api.name == "Test Agency"
     assert agency_config_api.description == "Test Description"
     assert agency_config_api.shared_instructions == "Test Instructions"
     assert agency_config_api.flows == []
+
+
+@pytest.mark.asyncio
+async def test_to_api_many_loads_agents_once(agency_adapter, mocker):
+    sender = AgentFlowSpec(id="sender_id", config=AgentConfig(name="Sender"))
+    receiver = AgentFlowSpec(id="receiver_id", config=AgentConfig(name="Receiver"))
+    agency_configs = [
+        AgencyConfig(
+            id="agency_1",
+            name="Agency 1",
+            agents=["sender_id", "receiver_id"],
+            main_agent="Sender",
+            agency_chart={"0": ["Sender", "Receiver"]},
+        ),
+        AgencyConfig(id="agency_2", name="Agency 2", agents=["sender_id"], main_agent="Sender"),
+    ]
+    load_by_ids = mocker.patch.object(
+        agency_adapter.agent_flow_spec_storage,
+        "load_by_ids",
+        return_value=[sender, receiver],
+    )
+
+    agency_configs_api = await agency_adapter.to_api_many(agency_configs)
+
+    load_by_ids.assert_called_once_with(["sender_id", "receiver_id"])
+    assert [config.id for config in agency_configs_api] == ["agency_1", "agency_2"]
+    assert agency_configs_api[0].flows[0].sender.id == "sender_id"
+    assert agency_configs_api[0].flows[0].receiver.id == "receiver_id"
+    assert len(agency_configs_api[1].flows) == 1
+    assert agency_configs_api[1].flows[0].sender.id == "sender_id"
+    assert agency_configs_api[1].flows[0].receiver is None
@@ -1,3 +1,5 @@
+import pytest
+
 from backend.models.agent_flow_spec import AgentConfig, AgentFlowSpec, AgentFlowSpecForAPI
 from backend.models.skill_config import SkillConfig
 
@@ -21,7 +23,8 @@ def test_to_model(agent_adapter):
     assert agent_flow_spec.description == "Test Description"
 
 
-def test_to_api(agent_adapter, mocker):
+@pytest.mark.asyncio
+async def test_to_api(agent_adapter, mocker):
     skill_configs = [
         SkillConfig(title="Skill 1"),
         SkillConfig(title="Skill 2"),
@@ -39,14 +42,15 @@ def test_to_api(agent_adapter, mocker):
         return_value=skill_configs,
     )
 
-    agent_flow_spec_api = agent_adapter.to_api(agent_flow_spec)
+    agent_flow_spec_api = await agent_adapter.to_api(agent_flow_spec)
 
     assert agent_flow_spec_api.config.name == "Test Agent"
     assert agent_flow_spec_api.skills == skill_configs
     assert agent_flow_spec_api.description == "Test Description"
 
 
-def test_to_api_without_skills(agent_adapter):
+@pytest.mark.asyncio
+async def test_to_api_without_skills(agent_adapter):
     agent_flow_spec = AgentFlowSpec(
         id="1234",
         config=AgentConfig(name="Test Agent"),
@@ -54,8 +58,34 @@ def test_to_api_without_skills(agent_adapter):
         description="Test Description",
     )
 
-    agent_flow_spec_api = agent_adapter.to_api(agent_flow_spec)
+    agent_flow_spec_api = await agent_adapter.to_api(agent_flow_spec)
 
     assert agent_flow_spec_api.config.name == "Test Agent"
     assert agent_flow_spec_api.skills == []
     assert agent_flow_spec_api.description == "Test Description"
+
+
+@pytest.mark.asyncio
+async def test_to_api_many_loads_skills_once(agent_adapter, mocker):
+    skill_configs = [
+        SkillConfig(title="Skill 1"),
+        SkillConfig(title="Skill 2"),
+    ]
+    agent_flow_specs = [
+        AgentFlowSpec(id="1", config=AgentConfig(name="Agent 1"), skills=["Skill 1", "Skill 2"]),
+        AgentFlowSpec(id="2", config=AgentConfig(name="Agent 2"), skills=["Skill 2"]),
+        AgentFlowSpec(id="3", config=AgentConfig(name="Agent 3"), skills=[]),
+    ]
+    load_by_titles = mocker.patch.object(
+        agent_adapter.skill_config_storage,
+        "load_by_titles",
+        return_value=skill_configs,
+    )
+
+    agent_flow_specs_api = await agent_adapter.to_api_many(agent_flow_specs)
+
+    load_by_titles.assert_called_once_with(["Skill 1", "Skill 2"])
+    assert [spec.id for spec in agent_flow_specs_api] == ["1", "2", "3"]
+    assert agent_flow_specs_api[0].skills == skill_configs
+    assert agent_flow_specs_api[1].skills == [skill_configs[1]]
+    assert agent_flow_specs_api[2].skills == []
@@ -0,0 +1,53 @@
+from unittest.mock import AsyncMock
+
+import pytest
+
+from backend.exceptions import NotFoundError
+from backend.models.agency_config import AgencyConfig, AgencyConfigForAPI
+from backend.models.session_config import SessionConfig
+from backend.services.adapters.session_adapter import SessionAdapter
+from tests.testing_utils.constants import TEST_AGENCY_ID
+
+
+@pytest.fixture
+def agency_config_storage():
+    return AsyncMock()
+
+
+@pytest.fixture
+def agency_adapter():
+    adapter = AsyncMock()
+    adapter.to_api_many.side_effect = lambda configs: [
+        AgencyConfigForAPI(**config.model_dump()) for config in configs
+    ]
+    return adapter
+
+
+@pytest.fixture
+def session_adapter(agency_config_storage, agency_adapter):
+    return SessionAdapter(agency_config_storage, agency_adapter)
+
+
+@pytest.mark.asyncio
+async def test_to_api_many_resolves_each_agency_once(
+    session_adapter, agency_config_storage, agency_adapter, agency_config_data, session_config_data
+):
+    agency_config_storage.load_by_ids.return_value = [AgencyConfig(**agency_config_data)]
+    sessions = [
+        SessionConfig(**{**session_config_data, "id": f"session_{i}", "agency_id": TEST_AGENCY_ID}) for i in range(3)
+    ]
+
+    sessions_for_api = await session_adapter.to_api_many(sessions)
+
+    agency_config_storage.load_by_ids.assert_called_once_with([TEST_AGENCY_ID])
+    agency_adapter.to_api_many.assert_called_once()
+    assert [session.id for session in sessions_for_api] == ["session_0", "session_1", "session_2"]
+    assert all(session.flow_config.id == TEST_AGENCY_ID for session in sessions_for_api)
+
+
+@pytest.mark.asyncio
+async def test_to_api_many_agency_not_found(session_adapter, agency_config_storage, session_config_data):
+    agency_config_storage.load_by_ids.return_value = []
+
+    with pytest.raises(NotFoundError):
+        await session_adapter.to_api_many([SessionConfig(**session_config_data)])
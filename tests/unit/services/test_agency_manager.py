@@ -7,9 +7,10 @@ from fastapi import HTTPException
 
 from backend.dependencies.dependencies import get_user_variable_manager
 from backend.models.agency_config import AgencyConfig
+from backend.models.agent_flow_spec import AgentFlowSpec
 from backend.repositories.agency_config_storage import AgencyConfigStorage
 from backend.repositories.user_variable_storage import UserVariableStorage
-from backend.services.agency_manager import AgencyManager, agency_cache
+from backend.services.agency_manager import AgencyManager, agency_pool
 from tests.testing_utils import TEST_USER_ID
 from tests.testing_utils.constants import TEST_AGENCY_ID, TEST_AGENT_ID
 
@@ -83,53 +84,23 @@ async def test_create_or_update_agency(agency_manager, mock_firestore_client):
 
 # Test successful agent construction
 @pytest.mark.asyncio
-async def test_load_and_construct_agents_success(agency_manager):
-    agency_config = AgencyConfig(
-        id=TEST_AGENCY_ID,
-        user_id=TEST_USER_ID,
-        name="Test agency",
-        shared_instructions="Test manifesto",
-        main_agent="Sender Agent",
-        agents=[TEST_AGENT_ID],
-    )
+async def test_construct_agents_success(agency_manager):
     agent_flow_spec_mock = Mock()
     agent_flow_spec_mock.config.name = "Sender Agent"
     agent_mock = MagicMock(spec=Agent)
     agent_mock.id = TEST_AGENT_ID
 
     agent_manager_mock = AsyncMock()
-    agent_manager_mock.get_agent.return_value = (agent_mock, agent_flow_spec_mock)
+    agent_manager_mock.construct_agents.return_value = [agent_mock]
 
     agency_manager.agent_manager = agent_manager_mock
 
-    agents = await agency_manager._load_and_construct_agents(agency_config)
+    agents = await agency_manager._construct_agents([agent_flow_spec_mock])
 
     assert "Sender Agent" in agents
     assert isinstance(agents["Sender Agent"], Agent)
     assert agents["Sender Agent"].id == TEST_AGENT_ID
-
-
-# Test agent not found
-@pytest.mark.asyncio
-async def test_load_and_construct_agents_agent_not_found(agency_manager):
-    agency_config = AgencyConfig(
-        id=TEST_AGENCY_ID,
-        user_id=TEST_USER_ID,
-        name="Test agency",
-        shared_instructions="Test manifesto",
-        main_agent="Sender Agent",
-        agents=[TEST_AGENT_ID],
-    )
-
-    agent_manager_mock = AsyncMock()
-    agent_manager_mock.get_agent.return_value = None
-    agency_manager.agent_manager = agent_manager_mock
-
-    with patch("logging.Logger.error") as mock_logger_error:
-        agents = await agency_manager._load_and_construct_agents(agency_config)
-
-        assert agents == {}
-        mock_logger_error.assert_called_with("Agent with id sender_agent_id not found.")
+    agent_manager_mock.construct_agents.assert_awaited_once_with([agent_flow_spec_mock])
 
 
 @pytest.mark.asyncio
@@ -162,12 +133,17 @@ async def test_construct_agency_single_layer_chart(agency_manager):
     mock_agent_2.top_p = 1.0
     mock_agent_2.examples = []
 
-    # Clear the agency cache before the test
-    agency_cache.clear()
+    agent_configs = [
+        AgentFlowSpec(id=TEST_AGENT_ID, user_id=TEST_USER_ID, config={"name": "Sender Agent"}),
+        AgentFlowSpec(id="agent2_id", user_id=TEST_USER_ID, config={"name": "agent2_name"}),
+    ]
+    agency_manager.agent_manager.get_agent_configs = AsyncMock(return_value=agent_configs)
+
+    agency_pool.clear()
 
     # Construct the agency
-    with patch.object(agency_manager, "_load_and_construct_agents", new_callable=AsyncMock) as mock_load_agents:
-        mock_load_agents.return_value = {"Sender Agent": mock_agent_1, "agent2_name": mock_agent_2}
+    with patch.object(agency_manager, "_construct_agents", new_callable=AsyncMock) as mock_construct_agents:
+        mock_construct_agents.return_value = {"Sender Agent": mock_agent_1, "agent2_name": mock_agent_2}
         agency = await agency_manager._construct_agency_and_update_assistants(agency_config, {})
 
     # Assertions
@@ -176,19 +152,29 @@ async def test_construct_agency_single_layer_chart(agency_manager):
     assert agency.agents == [mock_agent_1, mock_agent_2]
     assert agency.shared_instructions == "manifesto"
 
-    # Verify that the agency is cached
-    cache_key = "8147cad3c67ff29b97a59e6e1fc1ae9ddc4e6738c2d41190516480a916d0c40e"
-    assert cache_key in agency_cache
-    assert agency_cache[cache_key] == agency
+    # The agency is not reused until it is released
+    agency_manager.release_agency(agency)
+    assert agency_pool.get_stats()["idle_agencies"] == 1
 
-    # Call the method again with the same arguments
-    with patch.object(agency_manager, "_load_and_construct_agents", new_callable=AsyncMock) as mock_load_agents:
-        mock_load_agents.return_value = {"Sender Agent": mock_agent_1, "agent2_name": mock_agent_2}
-        cached_agency = await agency_manager._construct_agency_and_update_assistants(agency_config, {})
+    # Call the method again for another session
+    thread_ids = {"main_thread": "main_thread_id"}
+    with patch.object(agency_manager, "_construct_agents", new_callable=AsyncMock) as mock_construct_agents:
+        pooled_agency = await agency_manager._construct_agency_and_update_assistants(agency_config, thread_ids)
 
-    # Verify that the cached agency is returned
-    assert cached_agency == agency
-    assert mock_load_agents.call_count == 0  # Ensure that _load_and_construct_agents is not called again
+    # Verify that the pooled agency is returned, bound to the threads of the new session
+    assert pooled_agency is agency
+    assert pooled_agency.main_thread.id == "main_thread_id"
+    assert mock_construct_agents.call_count == 0  # Ensure that _construct_agents is not called again
+
+    # Once an agent is edited, the pooled agency is not reused
+    agency_manager.release_agency(pooled_agency)
+    agent_configs[1] = agent_configs[1].model_copy(update={"timestamp": "2024-05-06T00:00:00+00:00"})
+    with patch.object(agency_manager, "_construct_agents", new_callable=AsyncMock) as mock_construct_agents:
+        mock_construct_agents.return_value = {"Sender Agent": mock_agent_1, "agent2_name": mock_agent_2}
+        new_agency = await agency_manager._construct_agency_and_update_assistants(agency_config, {})
+
+    assert new_agency is not agency
+    mock_construct_agents.assert_awaited_once_with(agent_configs)
 
 
 @pytest.mark.asyncio
@@ -212,7 +198,8 @@ def test_validate_agency_ownership_raises_403(agency_manager):
     assert exc_info.value.status_code == HTTPStatus.FORBIDDEN
 
 
-def test_is_agent_used_in_agencies(agency_manager, mock_firestore_client):
+@pytest.mark.asyncio
+async def test_is_agent_used_in_agencies(agency_manager, mock_firestore_client):
     agency_config = AgencyConfig(
         id=TEST_AGENCY_ID,
         user_id=TEST_USER_ID,
@@ -222,5 +209,5 @@ def test_is_agent_used_in_agencies(agency_manager, mock_firestore_client):
         agents=[TEST_AGENT_ID],
     )
     mock_firestore_client.setup_mock_data("agency_configs", TEST_AGENCY_ID, agency_config.model_dump())
-    assert agency_manager.is_agent_used_in_agencies(TEST_AGENT_ID)
-    assert not agency_manager.is_agent_used_in_agencies("another_agent_id")
+    assert await agency_manager.is_agent_used_in_agencies(TEST_AGENT_ID)
+    assert not await agency_manager.is_agent_used_in_agencies("another_agent_id")
@@ -0,0 +1,103 @@
+from unittest.mock import MagicMock
+
+from agency_swarm import Agency
+from agency_swarm.util.shared_state import SharedState
+from cachetools import TTLCache
+
+from backend.services.agency_pool import AgencyPool, bind_threads
+from tests.testing_utils.constants import TEST_AGENCY_ID, TEST_AGENT_ID
+
+VERSION = (TEST_AGENCY_ID, "2024-05-05T00:14:57.487901+00:00", ((TEST_AGENT_ID, "2024-05-05T00:14:57.487901+00:00"),))
+
+
+def make_pool(max_idle_instances: int = 2) -> AgencyPool:
+    return AgencyPool(maxsize=10, ttl=60, max_idle_instances=max_idle_instances)
+
+
+def test_acquire_returns_released_agency():
+    pool = make_pool()
+    agency = MagicMock(spec=Agency)
+    assert pool.acquire(VERSION) is None
+
+    pool.add(VERSION, agency)
+    assert pool.acquire(VERSION) is None  # leased agencies are not shared
+
+    pool.release(agency)
+    assert pool.acquire(VERSION) is agency
+    assert pool.acquire(VERSION) is None
+    assert pool.get_stats() == {"versions": 1, "idle_agencies": 0, "leased_agencies": 1, "hits": 1, "misses": 3}
+
+
+def test_acquire_is_keyed_by_version():
+    pool = make_pool()
+    agency = MagicMock(spec=Agency)
+    pool.add(VERSION, agency)
+    pool.release(agency)
+
+    assert pool.acquire((TEST_AGENCY_ID, "2024-05-06T00:00:00+00:00", VERSION[2])) is None
+    # An edited agent changes the version too
+    assert pool.acquire((TEST_AGENCY_ID, VERSION[1], ((TEST_AGENT_ID, "2024-05-06T00:00:00+00:00"),))) is None
+    assert pool.acquire(VERSION) is agency
+
+
+def test_release_keeps_at_most_max_idle_instances():
+    pool = make_pool(max_idle_instances=1)
+    agencies = [MagicMock(spec=Agency), MagicMock(spec=Agency)]
+    for agency in agencies:
+        pool.add(VERSION, agency)
+    for agency in agencies:
+        pool.release(agency)
+
+    assert pool.get_stats()["idle_agencies"] == 1
+
+
+def test_release_ignores_unknown_agency():
+    pool = make_pool()
+    pool.release(MagicMock(spec=Agency))
+
+    assert pool.get_stats()["idle_agencies"] == 0
+
+
+def test_discard_removes_all_versions_of_the_agency():
+    pool = make_pool()
+    idle_agency, leased_agency = MagicMock(spec=Agency), MagicMock(spec=Agency)
+    pool.add(VERSION, idle_agency)
+    pool.add(VERSION, leased_agency)
+    pool.release(idle_agency)
+
+    pool.discard(TEST_AGENCY_ID)
+    pool.release(leased_agency)
+
+    assert pool.acquire(VERSION) is None
+
+
+def test_release_does_not_extend_the_ttl():
+    pool = make_pool()
+    now = [0.0]
+    pool._idle_agencies = TTLCache(maxsize=10, ttl=60, timer=lambda: now[0])
+    agency = MagicMock(spec=Agency)
+    pool.add(VERSION, agency)
+    pool.release(agency)
+
+    # The agency is busy all the time, but the version still expires 60s after it was pooled
+    now[0] = 50
+    assert pool.acquire(VERSION) is agency
+    pool.release(agency)
+    now[0] = 61
+    assert pool.acquire(VERSION) is None
+
+
+def test_bind_threads_resets_shared_state():
+    agency = MagicMock(spec=Agency)
+    agency.agents_and_threads = {}
+    agency.shared_state = SharedState()
+    agent_shared_state = agency.shared_state
+    agency.shared_state.set("previous_session_key", "value")
+
+    thread_ids = {"main_thread": "main_thread_id"}
+    bind_threads(agency, thread_ids)
+
+    assert agency.shared_state is agent_shared_state
+    assert agency.shared_state.data == {}
+    assert agency.threads_callbacks["load"]() is thread_ids
+    agency._init_threads.assert_called_once()
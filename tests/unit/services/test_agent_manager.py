@@ -1,6 +1,7 @@
-from unittest.mock import AsyncMock, MagicMock
+from unittest.mock import AsyncMock, MagicMock, patch
 
 import pytest
+from agency_swarm import Agent
 from fastapi import HTTPException
 
 from backend.exceptions import NotFoundError
@@ -13,7 +14,7 @@ from tests.testing_utils.constants import TEST_AGENT_ID
 
 @pytest.fixture
 def storage_mock():
-    return MagicMock()
+    return AsyncMock()
 
 
 @pytest.fixture
@@ -23,7 +24,7 @@ def user_variable_manager_mock():
 
 @pytest.fixture
 def skill_storage_mock():
-    return MagicMock()
+    return AsyncMock()
 
 
 @pytest.fixture
@@ -33,15 +34,16 @@ def agent_manager(storage_mock, user_variable_manager_mock, skill_storage_mock):
 
 @pytest.mark.asyncio
 async def test_get_agent_list(agent_manager, storage_mock):
-    user_configs = [AgentFlowSpec(user_id=TEST_USER_ID, config={"name": "Agent1"})]
-    template_configs = [AgentFlowSpec(user_id=None, config={"name": "Agent2"})]
-    storage_mock.load_by_user_id.side_effect = [user_configs, template_configs]
+    configs = [
+        AgentFlowSpec(user_id=None, config={"name": "Agent2"}),
+        AgentFlowSpec(user_id=TEST_USER_ID, config={"name": "Agent1"}),
+    ]
+    storage_mock.load_by_user_ids.return_value = configs
 
-    result = await agent_manager.get_agent_list(TEST_USER_ID)
+    result = await agent_manager.get_agent_list(TEST_USER_ID, limit=2, cursor="2024-01-04T00:00:00")
 
-    assert result == template_configs + user_configs
-    storage_mock.load_by_user_id.assert_any_call(TEST_USER_ID)
-    storage_mock.load_by_user_id.assert_any_call(None)
+    assert result == configs
+    storage_mock.load_by_user_ids.assert_awaited_once_with([TEST_USER_ID, None], limit=2, cursor="2024-01-04T00:00:00")
 
 
 @pytest.mark.asyncio
@@ -117,12 +119,12 @@ async def test_delete_agent_forbidden(agent_manager, storage_mock):
 @pytest.mark.asyncio
 async def test_get_agent_list_owned_by_user(agent_manager, storage_mock):
     user_configs = [AgentFlowSpec(user_id=TEST_USER_ID, config={"name": "Agent1"})]
-    storage_mock.load_by_user_id.return_value = user_configs
+    storage_mock.load_by_user_ids.return_value = user_configs
 
     result = await agent_manager.get_agent_list(TEST_USER_ID, owned_by_user=True)
 
     assert result == user_configs
-    storage_mock.load_by_user_id.assert_called_once_with(TEST_USER_ID)
+    storage_mock.load_by_user_ids.assert_awaited_once_with([TEST_USER_ID], limit=None, cursor=None)
 
 
 # Test get_agent with existing agent
@@ -130,15 +132,52 @@ async def test_get_agent_list_owned_by_user(agent_manager, storage_mock):
 async def test_get_agent_existing(agent_manager, storage_mock):
     config = AgentFlowSpec(id=TEST_AGENT_ID, user_id=TEST_USER_ID, config={"name": "Agent1"})
     storage_mock.load_by_id.return_value = config
-    agent_manager._construct_agent = MagicMock(return_value="mocked_agent")
+    agent_manager._construct_agent = MagicMock(return_value=Agent(id=TEST_AGENT_ID, name="Agent1"))
 
-    result = await agent_manager.get_agent(TEST_AGENT_ID)
+    agent, result_config = await agent_manager.get_agent(TEST_AGENT_ID)
 
-    assert result == ("mocked_agent", config)
+    assert agent.id == TEST_AGENT_ID
+    assert result_config == config
     storage_mock.load_by_id.assert_called_once_with(TEST_AGENT_ID)
     agent_manager._construct_agent.assert_called_once_with(config)
 
 
+# Test get_agent reuses the constructed agent until the config changes
+@pytest.mark.asyncio
+async def test_get_agent_cached(agent_manager, storage_mock):
+    config = AgentFlowSpec(id=TEST_AGENT_ID, user_id=TEST_USER_ID, config={"name": "Agent1"})
+    storage_mock.load_by_id.return_value = config
+    agent_manager._construct_agent = MagicMock(side_effect=lambda _: Agent(id=TEST_AGENT_ID, name="Agent1"))
+
+    agent_1, _ = await agent_manager.get_agent(TEST_AGENT_ID)
+    agent_1.add_shared_instructions("manifesto")
+    agent_2, _ = await agent_manager.get_agent(TEST_AGENT_ID)
+
+    assert agent_manager._construct_agent.call_count == 1
+    # Each caller gets its own copy of the agent
+    assert agent_2 is not agent_1
+    assert agent_2.instructions == ""
+
+    config.timestamp = "2024-05-06T00:00:00+00:00"
+    await agent_manager.get_agent(TEST_AGENT_ID)
+    assert agent_manager._construct_agent.call_count == 2
+
+
+# Test delete_agent invalidates the constructed agent
+@pytest.mark.asyncio
+async def test_delete_agent_invalidates_cache(agent_manager, storage_mock):
+    config = AgentFlowSpec(id=TEST_AGENT_ID, user_id=TEST_USER_ID, config={"name": "Agent1"})
+    storage_mock.load_by_id.return_value = config
+    agent_manager._construct_agent = MagicMock(side_effect=lambda _: Agent(id=TEST_AGENT_ID, name="Agent1"))
+    agent_manager._openai_client = MagicMock()
+
+    await agent_manager.get_agent(TEST_AGENT_ID)
+    await agent_manager.delete_agent(TEST_AGENT_ID, TEST_USER_ID)
+    await agent_manager.get_agent(TEST_AGENT_ID)
+
+    assert agent_manager._construct_agent.call_count == 2
+
+
 # Test get_agent with non-existing agent
 @pytest.mark.asyncio
 async def test_get_agent_non_existing(agent_manager, storage_mock):
@@ -150,6 +189,43 @@ async def test_get_agent_non_existing(agent_manager, storage_mock):
     storage_mock.load_by_id.assert_called_once_with(TEST_AGENT_ID)
 
 
+# Test get_agent_configs keeps the order of the agent ids and skips the missing agents
+@pytest.mark.asyncio
+async def test_get_agent_configs_and_construct_agents(agent_manager, storage_mock):
+    config_1 = AgentFlowSpec(id="agent1", user_id=TEST_USER_ID, config={"name": "Agent1"})
+    config_2 = AgentFlowSpec(id="agent2", user_id=TEST_USER_ID, config={"name": "Agent2"})
+    storage_mock.load_by_ids.return_value = [config_2, config_1]
+    agent_manager._construct_agent = MagicMock(side_effect=lambda config: Agent(id=config.id, name=config.config.name))
+
+    with patch("logging.Logger.error") as mock_logger_error:
+        configs = await agent_manager.get_agent_configs(["agent1", "missing_agent", "agent2"])
+    agents = await agent_manager.construct_agents(configs)
+
+    assert configs == [config_1, config_2]
+    assert [agent.id for agent in agents] == ["agent1", "agent2"]
+    storage_mock.load_by_ids.assert_awaited_once_with(["agent1", "missing_agent", "agent2"])
+    mock_logger_error.assert_called_once_with("Agent with id missing_agent not found.")
+
+
+# Test handle_agent_creation_or_update skips the assistant synchronization if the settings are unchanged
+@pytest.mark.asyncio
+async def test_handle_agent_creation_or_update_unchanged_assistant(
+    agent_manager, storage_mock, skill_storage_mock, mock_init_oai
+):
+    agent_name = f"Agent1 ({TEST_USER_ID})"
+    config_db = AgentFlowSpec(id=TEST_AGENT_ID, user_id=TEST_USER_ID, config={"name": agent_name})
+    config_db.assistant_fingerprint = agent_manager._construct_agent(config_db).assistant_fingerprint
+    storage_mock.load_by_id.return_value = config_db
+    skill_storage_mock.load_by_titles.return_value = []
+
+    config = AgentFlowSpec(id=TEST_AGENT_ID, user_id=TEST_USER_ID, config={"name": agent_name})
+    await agent_manager.handle_agent_creation_or_update(config, TEST_USER_ID)
+
+    mock_init_oai.assert_not_called()
+    storage_mock.save.assert_awaited_once_with(config)
+    assert config.assistant_fingerprint == config_db.assistant_fingerprint
+
+
 # Test handle_agent_creation_or_update with non-existing agent and invalid skills
 @pytest.mark.asyncio
 async def test_handle_agent_creation_or_update_invalid_skills(agent_manager, skill_storage_mock):
@@ -0,0 +1,83 @@
+import time
+from unittest.mock import AsyncMock, patch
+
+import pytest
+from fastapi import HTTPException
+
+from backend.constants import AUTH_CACHE_KEY_PREFIX
+from backend.services.auth_service import AuthService
+from backend.settings import settings
+from backend.utils import hash_string
+
+decoded_token = {"uid": "testuser", "email": "testuser@example.com"}
+
+
+@pytest.fixture
+def mock_verify_id_token():
+    with patch("backend.services.auth_service.auth.verify_id_token") as mock:
+        mock.return_value = {**decoded_token, "exp": time.time() + 3600}
+        yield mock
+
+
+@pytest.mark.asyncio
+async def test_get_user_verifies_token_once(mock_verify_id_token):
+    auth_service = AuthService()
+
+    user1 = await auth_service.get_user("valid_token")
+    user2 = await AuthService().get_user("valid_token")
+
+    assert user1 == user2
+    assert user1.id == "testuser"
+    mock_verify_id_token.assert_called_once_with("valid_token", check_revoked=True)
+
+
+@pytest.mark.asyncio
+async def test_get_user_rechecks_revocation_after_interval(mock_verify_id_token):
+    auth_service = AuthService()
+    await auth_service.get_user("valid_token")
+
+    with patch("backend.services.auth_service.time.time", return_value=time.time() + 60):
+        await auth_service.get_user("valid_token")
+    assert mock_verify_id_token.call_count == 1
+
+    with patch(
+        "backend.services.auth_service.time.time",
+        return_value=time.time() + settings.auth_revocation_check_interval + 1,
+    ):
+        await auth_service.get_user("valid_token")
+    assert mock_verify_id_token.call_count == 2
+
+
+@pytest.mark.asyncio
+@pytest.mark.usefixtures("mock_verify_id_token")
+async def test_get_user_shares_verified_token_in_redis():
+    cache_manager = AsyncMock()
+    cache_manager.get.return_value = None
+
+    await AuthService(cache_manager).get_user("valid_token")
+
+    key = AUTH_CACHE_KEY_PREFIX + hash_string("valid_token")
+    cache_manager.get.assert_called_once_with(key)
+    cache_manager.set.assert_called_once()
+    assert cache_manager.set.call_args.args[0] == key
+    assert cache_manager.set.call_args.args[1]["user"]["id"] == "testuser"
+    assert 3500 < cache_manager.set.call_args.args[2] <= 3600
+
+
+@pytest.mark.asyncio
+async def test_get_user_ignores_expired_token_from_redis(mock_verify_id_token):
+    cache_manager = AsyncMock()
+    now = time.time()
+    cache_manager.get.return_value = {
+        "user": {"id": "testuser", "email": "testuser@example.com"},
+        "expires_at": now - 1,
+        "revocation_checked_at": now - 10,
+    }
+    mock_verify_id_token.side_effect = ValueError("Token expired")
+
+    with pytest.raises(HTTPException) as exc_info:
+        await AuthService(cache_manager).get_user("expired_token")
+
+    assert exc_info.value.status_code == 401
+    cache_manager.delete.assert_awaited_once_with(AUTH_CACHE_KEY_PREFIX + hash_string("expired_token"))
+    mock_verify_id_token.assert_called_once_with("expired_token", check_revoked=True)
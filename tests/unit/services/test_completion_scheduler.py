@@ -0,0 +1,69 @@
+import asyncio
+import threading
+
+import pytest
+
+from backend.services.completion_scheduler import CompletionScheduler
+from backend.services.context_vars_manager import ContextEnvVarsManager
+
+
+@pytest.fixture
+def scheduler():
+    scheduler = CompletionScheduler(max_workers=2, max_per_user=1)
+    yield scheduler
+    scheduler.shutdown()
+
+
+@pytest.mark.asyncio
+async def test_run_returns_result_and_copies_context(scheduler):
+    ContextEnvVarsManager.set("user_id", "user1")
+
+    result = await scheduler.run("user1", lambda value: (value, ContextEnvVarsManager.get("user_id")), "result")
+
+    assert result == ("result", "user1")
+    assert scheduler.get_stats()["started"] == 1
+    assert scheduler.get_stats()["running"] == 0
+
+
+@pytest.mark.asyncio
+async def test_per_user_cap_and_round_robin(scheduler):
+    release = threading.Event()
+    started_order = []
+
+    def completion(name: str) -> str:
+        started_order.append(name)
+        release.wait(timeout=5)
+        return name
+
+    # user1 queues three completions before user2 queues one: user2 doesn't wait for all of user1's completions
+    tasks = [asyncio.create_task(scheduler.run("user1", completion, f"user1-{i}")) for i in range(3)]
+    tasks.append(asyncio.create_task(scheduler.run("user2", completion, "user2-0")))
+    await asyncio.sleep(0.1)
+
+    stats = scheduler.get_stats()
+    assert stats["running"] == 2
+    assert stats["waiting"] == 2
+    assert stats["waiting_users"] == 1
+    assert sorted(started_order) == ["user1-0", "user2-0"]
+
+    release.set()
+    assert await asyncio.gather(*tasks) == ["user1-0", "user1-1", "user1-2", "user2-0"]
+    assert scheduler.get_stats()["running"] == 0
+
+
+@pytest.mark.asyncio
+async def test_cancelled_waiter_leaves_the_queue(scheduler):
+    release = threading.Event()
+    running = asyncio.create_task(scheduler.run("user1", release.wait, 5))
+    waiting = asyncio.create_task(scheduler.run("user1", release.wait, 5))
+    await asyncio.sleep(0.1)
+    assert scheduler.get_stats()["waiting"] == 1
+
+    waiting.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await waiting
+    assert scheduler.get_stats()["waiting"] == 0
+
+    release.set()
+    await running
+    assert scheduler.get_stats()["running"] == 0
@@ -126,3 +126,18 @@ def test_get_openai_client_raises_error_when_no_valid_api_key_in_user_variables(
 
     # Verify
     assert str(e.value) == "API key not provided and no valid API key found in user variables"
+
+
+def test_get_openai_client_reuses_client_for_same_credentials(mock_openai_client, mock_instructor_patch):
+    from backend.services.oai_client import get_openai_client
+
+    mock_instructor_patch.side_effect = lambda client: client
+
+    client1 = get_openai_client(api_key="test_api_key")
+    client2 = get_openai_client(api_key="test_api_key")
+    get_openai_client(api_key="another_api_key")
+
+    assert client1 is client2
+    assert mock_openai_client.call_count == 2
+    mock_openai_client.assert_any_call(api_key="test_api_key", max_retries=5)
+    mock_openai_client.assert_any_call(api_key="another_api_key", max_retries=5)
@@ -0,0 +1,49 @@
+from unittest.mock import patch
+
+from agency_swarm import Agency
+
+from backend.services.platform_agent import PlatformAgent, get_assistant_fingerprint
+from tests.testing_utils.constants import TEST_AGENT_ID
+
+
+def test_init_oai_skipped_if_fingerprint_matches(mock_init_oai):
+    fingerprint = get_assistant_fingerprint(PlatformAgent(id=TEST_AGENT_ID, name="Agent1", instructions="Help"))
+    agent = PlatformAgent(id=TEST_AGENT_ID, name="Agent1", instructions="Help", synced_fingerprint=fingerprint)
+    assert agent.assistant_in_sync
+
+    # The Agency initializes the agent after adding the shared instructions
+    agency = Agency([agent], shared_instructions="manifesto")
+
+    mock_init_oai.assert_not_called()
+    assert agent.assistant.id == TEST_AGENT_ID
+    assert agent.assistant.instructions == agent.instructions
+    assert f"assistant={TEST_AGENT_ID}" in agency.main_thread.thread_url
+
+
+def test_init_oai_called_for_agent_with_files(mock_init_oai, tmp_path):
+    agent_kwargs = {"id": TEST_AGENT_ID, "name": "Agent1", "instructions": "Help", "files_folder": str(tmp_path)}
+    with patch.object(PlatformAgent, "_upload_files"):
+        fingerprint = get_assistant_fingerprint(PlatformAgent(**agent_kwargs))
+        agent = PlatformAgent(**agent_kwargs, synced_fingerprint=fingerprint)
+    agent.init_oai()
+
+    assert not agent.assistant_in_sync
+    mock_init_oai.assert_called_once()
+
+
+def test_init_oai_called_if_settings_changed(mock_init_oai):
+    fingerprint = get_assistant_fingerprint(PlatformAgent(id=TEST_AGENT_ID, name="Agent1", instructions="Help"))
+
+    agent = PlatformAgent(id=TEST_AGENT_ID, name="Agent1", instructions="Changed", synced_fingerprint=fingerprint)
+    agent.init_oai()
+
+    assert not agent.assistant_in_sync
+    mock_init_oai.assert_called_once()
+
+
+def test_init_oai_called_for_new_agent(mock_init_oai):
+    agent = PlatformAgent(name="Agent1", instructions="Help")
+    agent.init_oai()
+
+    assert not agent.assistant_in_sync
+    mock_init_oai.assert_called_once()
@@ -1,11 +1,15 @@
+import json
 import pickle
-from unittest.mock import AsyncMock
+from datetime import datetime
+from unittest.mock import AsyncMock, MagicMock, call
 
+import msgpack
 import pytest
 from redis import asyncio as aioredis
 
-from backend.constants import DEFAULT_CACHE_EXPIRATION
-from backend.services.redis_cache_manager import RedisCacheManager
+from backend.constants import DEFAULT_CACHE_EXPIRATION, NEAR_CACHE_INVALIDATION_CHANNEL
+from backend.models.auth import User
+from backend.services.redis_cache_manager import MsgpackSerializer, NearCache, RedisCacheManager
 
 
 @pytest.fixture
@@ -15,6 +19,7 @@ def redis_mock():
     redis_client_mock.set = AsyncMock()
     redis_client_mock.delete = AsyncMock()
     redis_client_mock.close = AsyncMock()
+    redis_client_mock.publish = AsyncMock()
     return redis_client_mock
 
 
@@ -92,3 +97,140 @@ async def test_delete_non_existing_key(cache_manager, redis_mock):
 async def test_close(cache_manager, redis_mock):
     await cache_manager.close()
     redis_mock.close.assert_called_once()
+
+
+@pytest.mark.asyncio
+async def test_get_many(cache_manager, redis_mock):
+    redis_mock.mget = AsyncMock(return_value=[pickle.dumps("value1"), None, pickle.dumps("")])
+    result = await cache_manager.get_many(["key1", "key2", "key3"])
+    assert result == {"key1": "value1", "key3": ""}
+    redis_mock.mget.assert_called_once_with(["key1", "key2", "key3"])
+
+
+@pytest.mark.asyncio
+async def test_get_many_no_keys(cache_manager, redis_mock):
+    assert await cache_manager.get_many([]) == {}
+    redis_mock.mget.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_set_many(cache_manager, redis_mock):
+    pipeline_mock = MagicMock(execute=AsyncMock())
+    redis_mock.pipeline = MagicMock(return_value=pipeline_mock)
+
+    await cache_manager.set_many({"key1": "value1", "key2": "value2"}, expire=60)
+
+    redis_mock.pipeline.assert_called_once_with(transaction=False)
+    pipeline_mock.set.assert_has_calls(
+        [call("key1", pickle.dumps("value1"), ex=60), call("key2", pickle.dumps("value2"), ex=60)]
+    )
+    pipeline_mock.execute.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_delete_many(cache_manager, redis_mock):
+    await cache_manager.delete_many(["key1", "key2"])
+    redis_mock.delete.assert_called_once_with("key1", "key2")
+
+
+@pytest.mark.asyncio
+async def test_msgpack_serializer(redis_mock):
+    cache_manager = RedisCacheManager(redis_mock, serializer=MsgpackSerializer())
+    value = {"id": "1", "tags": ["a"], "count": 2, "claims": {"admin": False}}
+
+    await cache_manager.set("key", value)
+    serialized_data = redis_mock.set.call_args.args[1]
+    assert serialized_data == b"M" + msgpack.packb(value)
+    assert len(serialized_data) < len(pickle.dumps(value))
+
+    redis_mock.get.return_value = serialized_data
+    assert await cache_manager.get("key") == value
+
+
+@pytest.mark.parametrize("value", [("a", "b"), {"key": {1, 2}}, {"date": datetime(2024, 1, 1)}, 2**70])
+def test_msgpack_serializer_falls_back_to_pickle(value):
+    serializer = MsgpackSerializer()
+    serialized_data = serializer.dumps(value)
+    assert serialized_data == pickle.dumps(value)
+    assert serializer.loads(serialized_data) == value
+
+
+def test_msgpack_serializer_restores_pydantic_models():
+    serializer = MsgpackSerializer()
+    users = [User(id="user1", email="user1@example.com"), User(id="user2", email="user2@example.com")]
+
+    serialized_data = serializer.dumps({"users": users})
+    assert serialized_data.startswith(b"M")
+
+    loaded = serializer.loads(serialized_data)
+    assert loaded == {"users": users}
+    assert all(isinstance(user, User) for user in loaded["users"])
+
+
+def test_msgpack_serializer_reads_pickled_entries():
+    assert MsgpackSerializer().loads(pickle.dumps({"key": "value"})) == {"key": "value"}
+
+
+@pytest.fixture
+def near_cache():
+    return NearCache(maxsize=10, ttl=60)
+
+
+@pytest.mark.asyncio
+async def test_get_uses_near_cache(redis_mock, near_cache):
+    cache_manager = RedisCacheManager(redis_mock, near_cache=near_cache)
+
+    assert await cache_manager.get("key") == "value"
+    assert await cache_manager.get("key") == "value"
+
+    redis_mock.get.assert_called_once_with("key")
+
+
+@pytest.mark.asyncio
+async def test_get_many_uses_near_cache(redis_mock, near_cache):
+    cache_manager = RedisCacheManager(redis_mock, near_cache=near_cache)
+    near_cache.set("key1", pickle.dumps("value1"))
+    redis_mock.mget = AsyncMock(return_value=[pickle.dumps("value2"), None])
+
+    result = await cache_manager.get_many(["key1", "key2", "key3"])
+
+    assert result == {"key1": "value1", "key2": "value2"}
+    redis_mock.mget.assert_called_once_with(["key2", "key3"])
+    assert near_cache.get("key2") == pickle.dumps("value2")
+
+
+@pytest.mark.asyncio
+async def test_set_and_delete_update_near_cache(redis_mock, near_cache):
+    cache_manager = RedisCacheManager(redis_mock, near_cache=near_cache)
+
+    await cache_manager.set("key", "new_value")
+    assert await cache_manager.get("key") == "new_value"
+    redis_mock.get.assert_not_called()
+
+    await cache_manager.delete("key")
+    assert near_cache.get("key") is None
+    redis_mock.publish.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_near_cache_publishes_invalidations(redis_mock):
+    near_cache = NearCache(maxsize=10, ttl=60, publish_invalidations=True)
+    cache_manager = RedisCacheManager(redis_mock, near_cache=near_cache)
+
+    await cache_manager.delete_many(["key1", "key2"])
+
+    redis_mock.publish.assert_called_once_with(
+        NEAR_CACHE_INVALIDATION_CHANNEL, json.dumps({"origin_id": near_cache.origin_id, "keys": ["key1", "key2"]})
+    )
+
+
+def test_near_cache_handles_invalidations_from_other_workers(near_cache):
+    near_cache.set("key1", b"value1")
+    near_cache.set("key2", b"value2")
+
+    near_cache._handle_invalidation(json.dumps({"origin_id": near_cache.origin_id, "keys": ["key1"]}))
+    assert near_cache.get("key1") == b"value1"
+
+    near_cache._handle_invalidation(json.dumps({"origin_id": "another_worker", "keys": ["key1", "key2"]}))
+    assert near_cache.get("key1") is None
+    assert near_cache.get("key2") is None
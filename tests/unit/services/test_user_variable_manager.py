@@ -1,3 +1,4 @@
+import threading
 from unittest.mock import patch, MagicMock, AsyncMock
 
 import pytest
@@ -131,10 +132,11 @@ def test_get_variable_names_no_variables(mock_firestore_client):
 
 
 # Test 10: Successful creation of variables
-def test_create_variables_success(mock_firestore_client):
+@pytest.mark.asyncio
+async def test_create_variables_success(mock_firestore_client):
     variables = {"VARIABLE1": "value1", "VARIABLE2": "value2"}
     manager = UserVariableManager(user_variable_storage=UserVariableStorage(), agent_storage=AgentFlowSpecStorage())
-    manager.create_or_update_variables(TEST_USER_ID, variables)
+    await manager.create_or_update_variables(TEST_USER_ID, variables)
     updated_variables = mock_firestore_client.to_dict()
     assert len(updated_variables) == 2
     for key, value in variables.items():
@@ -142,15 +144,30 @@ def test_create_variables_success(mock_firestore_client):
         assert EncryptionService(settings.encryption_key).decrypt(updated_variables[key]) == value
 
 
+@pytest.mark.asyncio
+async def test_create_or_update_variables_reads_storage_off_event_loop():
+    storage = MagicMock(spec=UserVariableStorage)
+    storage_threads = []
+    storage.get_all_variables.side_effect = lambda _: storage_threads.append(threading.get_ident())
+    storage.set_variables.side_effect = lambda *_: storage_threads.append(threading.get_ident())
+
+    manager = UserVariableManager(user_variable_storage=storage, agent_storage=MagicMock())
+    assert await manager.create_or_update_variables(TEST_USER_ID, {"VARIABLE1": "value1"})
+
+    assert len(storage_threads) == 2
+    assert threading.get_ident() not in storage_threads
+
+
 # Test 11: Successful update of existing variables
-def test_update_variables_success(mock_firestore_client):
+@pytest.mark.asyncio
+async def test_update_variables_success(mock_firestore_client):
     mock_firestore_client.setup_mock_data(
         "user_variables", TEST_USER_ID, {"VARIABLE1": "value1", "VARIABLE2": "value2", "VARIABLE4": "value4"}
     )
     variables = {"VARIABLE1": "new_value", "VARIABLE2": "", "VARIABLE3": "value3"}
 
     manager = UserVariableManager(user_variable_storage=UserVariableStorage(), agent_storage=AgentFlowSpecStorage())
-    manager.create_or_update_variables(TEST_USER_ID, variables)
+    await manager.create_or_update_variables(TEST_USER_ID, variables)
 
     updated_variables = mock_firestore_client.to_dict()
     assert len(updated_variables) == 3
@@ -160,19 +177,21 @@ def test_update_variables_success(mock_firestore_client):
 
 
 # Test 12: Successful update of OPENAI_API_KEY
-def test_create_or_update_open_ai_key_variable_success(mock_firestore_client):
+@pytest.mark.asyncio
+async def test_create_or_update_open_ai_key_variable_success(mock_firestore_client):
     mock_firestore_client.setup_mock_data(
         "user_variables", TEST_USER_ID, {"OPENAI_API_KEY": EncryptionService(settings.encryption_key).encrypt("value1")}
     )
     variables = {"OPENAI_API_KEY": "new_value"}
 
     manager = UserVariableManager(user_variable_storage=UserVariableStorage(), agent_storage=AgentFlowSpecStorage())
-    result = manager.create_or_update_variables(TEST_USER_ID, variables)
+    result = await manager.create_or_update_variables(TEST_USER_ID, variables)
     assert result is True
 
 
 # Test 13: Fail update of OPENAI_API_KEY when user have an agent
-def test_create_or_update_open_ai_key_variable_fail(mock_firestore_client, agent_data):
+@pytest.mark.asyncio
+async def test_create_or_update_open_ai_key_variable_fail(mock_firestore_client, agent_data):
     mock_firestore_client.setup_mock_data("agent_configs", "agent1", agent_data)
 
     mock_firestore_client.setup_mock_data(
@@ -181,5 +200,46 @@ def test_create_or_update_open_ai_key_variable_fail(mock_firestore_client, agent
     variables = {"OPENAI_API_KEY": "new_value"}
 
     manager = UserVariableManager(user_variable_storage=UserVariableStorage(), agent_storage=AgentFlowSpecStorage())
-    result = manager.create_or_update_variables(TEST_USER_ID, variables)
+    result = await manager.create_or_update_variables(TEST_USER_ID, variables)
     assert result is False
+
+
+# Test 14: Variables are read from the DB once and cached for subsequent lookups
+@patch("backend.services.context_vars_manager.ContextEnvVarsManager.get", return_value=TEST_USER_ID)
+def test_get_by_key_cached(mock_get, mock_firestore_client):
+    encryption_service = EncryptionService(settings.encryption_key)
+    mock_firestore_client.setup_mock_data(
+        "user_variables",
+        TEST_USER_ID,
+        {"KEY1": encryption_service.encrypt("value1"), "KEY2": encryption_service.encrypt("value2")},
+    )
+    user_variable_storage = UserVariableStorage()
+    manager = UserVariableManager(user_variable_storage=user_variable_storage, agent_storage=AgentFlowSpecStorage())
+
+    with patch.object(
+        user_variable_storage, "get_all_variables", wraps=user_variable_storage.get_all_variables
+    ) as mock_get_all_variables:
+        assert manager.get_by_key("KEY1") == "value1"
+        assert manager.get_by_key("KEY2") == "value2"
+        assert manager.get_by_key("KEY1") == "value1"
+
+    mock_get_all_variables.assert_called_once_with(TEST_USER_ID)
+    assert mock_get.call_count == 3
+
+
+# Test 15: Setting a variable invalidates the cached variables
+@patch("backend.services.context_vars_manager.ContextEnvVarsManager.get", return_value=TEST_USER_ID)
+@pytest.mark.asyncio
+async def test_set_variables_invalidates_cache(mock_get, mock_firestore_client):
+    mock_firestore_client.setup_mock_data(
+        "user_variables", TEST_USER_ID, {"KEY1": EncryptionService(settings.encryption_key).encrypt("value1")}
+    )
+    manager = UserVariableManager(user_variable_storage=UserVariableStorage(), agent_storage=AgentFlowSpecStorage())
+    assert manager.get_by_key("KEY1") == "value1"
+
+    manager.set_by_key("KEY1", "value2")
+    assert manager.get_by_key("KEY1") == "value2"
+
+    await manager.create_or_update_variables(TEST_USER_ID, {"KEY1": "value3"})
+    assert manager.get_by_key("KEY1") == "value3"
+    mock_get.assert_called()
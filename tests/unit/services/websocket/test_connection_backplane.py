@@ -0,0 +1,131 @@
+import json
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+from redis import asyncio as aioredis
+
+from backend.constants import WEBSOCKET_CLIENT_CHANNEL_PREFIX, WEBSOCKET_OWNER_KEY_PREFIX, WEBSOCKET_OWNER_TTL
+from backend.services.websocket.connection_backplane import LocalBackplane, RedisBackplane
+from backend.services.websocket.websocket_connection_manager import WebSocketConnectionManager
+
+
+class MockWebSocket:
+    def __init__(self):
+        self.sent_messages = []
+
+    async def accept(self):
+        pass
+
+    async def close(self, code: int = 1000):
+        pass
+
+    async def send_json(self, message):
+        self.sent_messages.append(message)
+
+
+@pytest.fixture
+def workers():
+    """Two connection managers sharing a local backplane, like two workers sharing Redis."""
+    connections: dict = {}
+    return (
+        WebSocketConnectionManager(backplane=LocalBackplane("worker1", connections)),
+        WebSocketConnectionManager(backplane=LocalBackplane("worker2", connections)),
+    )
+
+
+@pytest.mark.asyncio
+async def test_message_reaches_connection_of_another_worker(workers):
+    worker1, worker2 = workers
+    websocket = MockWebSocket()
+    await worker1.connect(websocket, "client1")
+
+    assert await worker2.backplane.get_owner("client1") == "worker1"
+    await worker2.send_message({"type": "agent_message"}, "client1")
+    await worker1.disconnect("client1")
+
+    assert websocket.sent_messages == [{"type": "agent_message"}]
+    assert await worker2.backplane.get_owner("client1") is None
+    assert await worker2.backplane.publish("client1", {"type": "agent_message"}) is False
+
+
+@pytest.mark.asyncio
+async def test_reconnection_to_another_worker_keeps_new_owner(workers):
+    worker1, worker2 = workers
+    old_websocket, new_websocket = MockWebSocket(), MockWebSocket()
+    await worker1.connect(old_websocket, "client1")
+    await worker2.connect(new_websocket, "client1")
+
+    # The old connection goes away after the client has reconnected
+    await worker1.disconnect("client1")
+    await worker1.send_message({"type": "agent_response"}, "client1")
+    await worker2.disconnect("client1")
+
+    assert await worker1.backplane.get_owner("client1") is None
+    assert old_websocket.sent_messages == []
+    assert new_websocket.sent_messages == [{"type": "agent_response"}]
+
+
+@pytest.fixture
+def redis_mock():
+    redis_client_mock = AsyncMock(spec=aioredis.Redis)
+    redis_client_mock.pubsub = MagicMock(return_value=AsyncMock(subscribed=False))
+    redis_client_mock.set = AsyncMock()
+    redis_client_mock.eval = AsyncMock(return_value=1)
+    redis_client_mock.publish = AsyncMock(return_value=1)
+    redis_client_mock.get = AsyncMock(return_value=b"worker1")
+    return redis_client_mock
+
+
+@pytest.mark.asyncio
+async def test_redis_backplane_register_and_unregister(redis_mock):
+    backplane = RedisBackplane(redis_mock, worker_id="worker1")
+    pubsub = redis_mock.pubsub.return_value
+
+    await backplane.register("client1", AsyncMock())
+    pubsub.subscribe.assert_awaited_once_with(WEBSOCKET_CLIENT_CHANNEL_PREFIX + "client1")
+    redis_mock.set.assert_awaited_once_with(WEBSOCKET_OWNER_KEY_PREFIX + "client1", "worker1", ex=WEBSOCKET_OWNER_TTL)
+    assert await backplane.get_owner("client1") == "worker1"
+
+    await backplane.unregister("client1")
+    pubsub.unsubscribe.assert_awaited_once_with(WEBSOCKET_CLIENT_CHANNEL_PREFIX + "client1")
+    # The owner is only deleted if it is still this worker
+    redis_mock.eval.assert_awaited_once()
+    assert redis_mock.eval.await_args.args[1:] == (1, WEBSOCKET_OWNER_KEY_PREFIX + "client1", "worker1")
+
+    await backplane.close()
+    pubsub.aclose.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_redis_backplane_publishes_and_delivers_json(redis_mock):
+    backplane = RedisBackplane(redis_mock, worker_id="worker1")
+    deliver = AsyncMock()
+    await backplane.register("client1", deliver)
+
+    message = {"type": "agent_status", "data": {"message": "delta"}}
+    assert await backplane.publish("client1", message) is True
+    redis_mock.publish.assert_awaited_once_with(WEBSOCKET_CLIENT_CHANNEL_PREFIX + "client1", json.dumps(message))
+
+    await backplane._handle_message(
+        {"channel": (WEBSOCKET_CLIENT_CHANNEL_PREFIX + "client1").encode(), "data": json.dumps(message)}
+    )
+    await backplane._handle_message({"channel": WEBSOCKET_CLIENT_CHANNEL_PREFIX + "other", "data": "{}"})
+    deliver.assert_awaited_once_with(message)
+
+    redis_mock.publish.return_value = 0
+    assert await backplane.publish("client2", message) is False
+
+
+@pytest.mark.asyncio
+async def test_stale_disconnect_keeps_backplane_registration(workers):
+    worker1, worker2 = workers
+    old_websocket, new_websocket = MockWebSocket(), MockWebSocket()
+    await worker1.connect(old_websocket, "client1")
+    await worker1.connect(new_websocket, "client1")
+
+    await worker1.disconnect("client1", websocket=old_websocket)
+    await worker2.send_message({"type": "agent_response"}, "client1")
+    await worker1.disconnect("client1", websocket=new_websocket)
+
+    assert old_websocket.sent_messages == []
+    assert new_websocket.sent_messages == [{"type": "agent_response"}]
@@ -0,0 +1,87 @@
+import asyncio
+from unittest.mock import AsyncMock, call
+
+import pytest
+
+from backend.services.websocket.delta_coalescer import DeltaCoalescer
+
+
+def status_message(text: str) -> dict:
+    return {"type": "agent_status", "data": {"message": text}}
+
+
+@pytest.mark.asyncio
+async def test_consecutive_deltas_are_merged():
+    send_message = AsyncMock()
+    coalescer = DeltaCoalescer(asyncio.get_running_loop(), send_message, window=0.01)
+
+    for delta in ["Hel", "lo", " world"]:
+        coalescer.send_status(delta)
+    await coalescer.close()
+
+    send_message.assert_called_once_with(status_message("Hello world"))
+
+
+@pytest.mark.asyncio
+async def test_other_messages_keep_their_order():
+    send_message = AsyncMock()
+    coalescer = DeltaCoalescer(asyncio.get_running_loop(), send_message, window=0.01)
+
+    coalescer.send_status("a")
+    coalescer.send_status("b")
+    coalescer.send({"type": "agent_message"})
+    coalescer.send_status("c")
+    await coalescer.close()
+
+    assert send_message.await_args_list == [
+        call(status_message("ab")),
+        call({"type": "agent_message"}),
+        call(status_message("c")),
+    ]
+
+
+@pytest.mark.asyncio
+async def test_frames_are_limited_by_size():
+    send_message = AsyncMock()
+    coalescer = DeltaCoalescer(asyncio.get_running_loop(), send_message, window=0.01, max_size=4)
+
+    for delta in ["ab", "cd", "ef"]:
+        coalescer.send_status(delta)
+    await coalescer.close()
+
+    assert send_message.await_args_list == [call(status_message("abcd")), call(status_message("ef"))]
+
+
+@pytest.mark.asyncio
+async def test_deltas_from_worker_thread():
+    loop = asyncio.get_running_loop()
+    send_message = AsyncMock()
+    coalescer = DeltaCoalescer(loop, send_message, window=0.01)
+
+    def stream():
+        for i in range(100):
+            coalescer.send_status(str(i % 10))
+
+    await loop.run_in_executor(None, stream)
+    await coalescer.close()
+
+    assert "".join(c.args[0]["data"]["message"] for c in send_message.await_args_list) == "0123456789" * 10
+    assert send_message.await_count < 100
+
+
+@pytest.mark.asyncio
+async def test_send_error_does_not_stop_the_sender():
+    send_message = AsyncMock(side_effect=[ConnectionError("closed"), None, None])
+    coalescer = DeltaCoalescer(asyncio.get_running_loop(), send_message, window=0.01)
+
+    coalescer.send({"type": "agent_message"})
+    await asyncio.sleep(0.02)
+    coalescer.send_status("delta")
+    coalescer.send({"type": "agent_response"})
+    await coalescer.close()
+
+    assert send_message.call_args_list == [
+        call({"type": "agent_message"}),
+        call(status_message("delta")),
+        call({"type": "agent_response"}),
+    ]
@@ -1,4 +1,6 @@
 import asyncio
+import logging
+from unittest.mock import AsyncMock, call
 
 import pytest
 
@@ -62,12 +64,30 @@ async def test_disconnect_nonexistent_client(connection_manager):
     assert client_id not in connection_manager.active_connections
 
 
+@pytest.mark.asyncio
+async def test_stale_disconnect_keeps_reconnected_client(connection_manager):
+    old_websocket, new_websocket = MockWebSocket(), MockWebSocket()
+    await connection_manager.connect(old_websocket, "client1")
+    await connection_manager.connect(new_websocket, "client1")
+
+    # The handler of the old connection only notices now that its socket is closed
+    await connection_manager.disconnect("client1", websocket=old_websocket)
+    await connection_manager.send_message({"type": "agent_message"}, "client1")
+    assert connection_manager.active_connections == {"client1": new_websocket}
+
+    await connection_manager.disconnect("client1", websocket=new_websocket)
+    assert "client1" not in connection_manager.active_connections
+    assert new_websocket.sent_json == {"type": "agent_message"}
+    assert old_websocket.sent_json is None
+
+
 @pytest.mark.asyncio
 async def test_send_message(connection_manager, mock_websocket):
     client_id = "client1"
     await connection_manager.connect(mock_websocket, client_id)
     message = {"text": "Hello"}
     await connection_manager.send_message(message, client_id)
+    await connection_manager.disconnect(client_id)  # waits for the queued messages
     assert mock_websocket.sent_json == message
 
 
@@ -93,3 +113,135 @@ async def test_concurrent_connections(connection_manager):
     assert client_id2 in connection_manager.active_connections
     assert connection_manager.active_connections[client_id1] == websocket1
     assert connection_manager.active_connections[client_id2] == websocket2
+
+
+@pytest.mark.asyncio
+async def test_disconnect_sends_queued_messages(connection_manager, mock_websocket):
+    client_id = "client1"
+    await connection_manager.connect(mock_websocket, client_id)
+    await connection_manager.send_message({"text": "Hello"}, client_id)
+    await connection_manager.disconnect(client_id)
+    assert mock_websocket.sent_json == {"text": "Hello"}
+
+
+@pytest.mark.asyncio
+async def test_send_message_keeps_order(connection_manager):
+    websocket = MockWebSocket()
+    websocket.send_json = AsyncMock()
+    await connection_manager.connect(websocket, "client1")
+
+    for i in range(3):
+        await connection_manager.send_message({"index": i}, "client1")
+    await connection_manager.disconnect("client1")
+
+    assert websocket.send_json.await_args_list == [call({"index": i}) for i in range(3)]
+
+
+@pytest.mark.asyncio
+async def test_slow_client_does_not_block_others(connection_manager):
+    slow_client_blocked = asyncio.Event()
+
+    async def send_json_slowly(_):
+        await slow_client_blocked.wait()
+
+    slow_websocket = MockWebSocket()
+    slow_websocket.send_json = send_json_slowly
+    fast_websocket = MockWebSocket()
+    await connection_manager.connect(slow_websocket, "slow_client")
+    await connection_manager.connect(fast_websocket, "fast_client")
+
+    await connection_manager.send_message({"text": "Hello"}, "slow_client")
+    await connection_manager.send_message({"text": "Hello"}, "fast_client")
+    await asyncio.wait_for(connection_manager.disconnect("fast_client"), timeout=1)
+
+    assert fast_websocket.sent_json == {"text": "Hello"}
+    slow_client_blocked.set()
+    await connection_manager.disconnect("slow_client")
+
+
+@pytest.mark.asyncio
+async def test_send_message_to_closed_connection(connection_manager):
+    websocket = MockWebSocket()
+    websocket.send_json = AsyncMock(side_effect=RuntimeError("WebSocket is not connected"))
+    await connection_manager.connect(websocket, "client1")
+
+    await connection_manager.send_message({"text": "Hello"}, "client1")
+    await connection_manager.send_message({"text": "Hello again"}, "client1")
+    await asyncio.wait_for(connection_manager.disconnect("client1"), timeout=1)
+
+    websocket.send_json.assert_awaited_once_with({"text": "Hello"})
+
+
+def status_message(text: str) -> dict:
+    return {"type": "agent_status", "data": {"message": text}}
+
+
+async def connect_stalled_client(connection_manager: WebSocketConnectionManager) -> tuple[MockWebSocket, asyncio.Event]:
+    """Connect a client whose first send blocks until the returned event is set."""
+    unblocked = asyncio.Event()
+    websocket = MockWebSocket()
+    sent_messages = []
+
+    async def send_json(message):
+        await unblocked.wait()
+        sent_messages.append(message)
+
+    websocket.send_json = send_json
+    websocket.sent_messages = sent_messages
+    await connection_manager.connect(websocket, "client1")
+    await connection_manager.send_message({"type": "agent_message"}, "client1")
+    await asyncio.sleep(0)  # let the writer take the first message
+    return websocket, unblocked
+
+
+@pytest.mark.asyncio
+async def test_full_buffer_coalesces_deltas(caplog):
+    caplog.set_level(logging.INFO)
+    connection_manager = WebSocketConnectionManager(buffer_size=2, overflow_policy="coalesce")
+    websocket, unblocked = await connect_stalled_client(connection_manager)
+
+    for text in ["a", "b", "c", "d"]:
+        await connection_manager.send_message(status_message(text), "client1")
+    assert connection_manager.get_stats()["max_buffer_depth"] == 2
+
+    unblocked.set()
+    await connection_manager.disconnect("client1")
+    assert websocket.sent_messages == [{"type": "agent_message"}, status_message("a"), status_message("bcd")]
+    assert connection_manager.get_stats()["coalesced_messages"] == 2
+    # The stats are logged when a connection is unregistered
+    assert "'coalesced_messages': 2" in caplog.text
+
+
+@pytest.mark.asyncio
+async def test_full_buffer_drops_deltas():
+    connection_manager = WebSocketConnectionManager(buffer_size=2, overflow_policy="drop")
+    websocket, unblocked = await connect_stalled_client(connection_manager)
+
+    for text in ["a", "b", "c"]:
+        await connection_manager.send_message(status_message(text), "client1")
+    await connection_manager.send_message({"type": "agent_response"}, "client1")
+
+    unblocked.set()
+    await connection_manager.disconnect("client1")
+    assert websocket.sent_messages == [{"type": "agent_message"}, status_message("b"), {"type": "agent_response"}]
+    assert connection_manager.get_stats()["dropped_messages"] == 2
+
+
+@pytest.mark.asyncio
+async def test_full_buffer_disconnects_client():
+    connection_manager = WebSocketConnectionManager(buffer_size=2, overflow_policy="disconnect")
+    websocket, _ = await connect_stalled_client(connection_manager)
+
+    for text in ["a", "b", "c"]:
+        await connection_manager.send_message(status_message(text), "client1")
+
+    assert "client1" not in connection_manager.active_connections
+    assert websocket.sent_messages == []
+    assert connection_manager.get_stats() == {
+        "connections": 0,
+        "buffered_messages": 0,
+        "max_buffer_depth": 0,
+        "coalesced_messages": 0,
+        "dropped_messages": 0,
+        "overflow_disconnects": 1,
+    }
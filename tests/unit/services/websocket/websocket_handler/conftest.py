@@ -8,8 +8,9 @@ from backend.services.websocket.websocket_handler import WebSocketHandler
 @pytest.fixture
 def websocket_handler() -> WebSocketHandler:
     connection_manager = AsyncMock()
-    auth_service = MagicMock()
+    auth_service = AsyncMock()
     agency_manager = AsyncMock()
+    agency_manager.release_agency = MagicMock()
     message_manager = MagicMock()
-    session_manager = MagicMock()
+    session_manager = AsyncMock()
     return WebSocketHandler(connection_manager, auth_service, agency_manager, message_manager, session_manager)
@@ -1,10 +1,11 @@
+import time
 from http import HTTPStatus
 
 import pytest
 from fastapi import HTTPException
 from starlette.websockets import WebSocketDisconnect
 
-from backend.models.auth import User
+from backend.models.auth import User, VerifiedToken
 
 
 @pytest.mark.asyncio
@@ -13,12 +14,17 @@ async def test_authenticate_valid_token(websocket_handler):
     token = "valid_token"
 
     user = User(id="user_id", email="user@example.com")
-    websocket_handler.auth_service.get_user.return_value = user
+    websocket_handler.auth_service.get_verified_token.return_value = VerifiedToken(
+        user=user, expires_at=time.time() + 3600, revocation_checked_at=time.time()
+    )
 
     result = await websocket_handler._authenticate(client_id, token)
 
     assert result == user
-    websocket_handler.auth_service.get_user.assert_called_once_with(token)
+    websocket_handler.auth_service.get_verified_token.assert_called_once_with(token)
+    assert websocket_handler._get_context(client_id).is_authenticated(token)
+    assert websocket_handler._get_context(client_id).is_authenticated(None)
+    assert not websocket_handler._get_context(client_id).is_authenticated("another_token")
 
 
 @pytest.mark.asyncio
@@ -26,7 +32,7 @@ async def test_authenticate_invalid_token(websocket_handler):
     client_id = "client_id"
     token = "invalid_token"
 
-    websocket_handler.auth_service.get_user.side_effect = HTTPException(
+    websocket_handler.auth_service.get_verified_token.side_effect = HTTPException(
         status_code=HTTPStatus.UNAUTHORIZED,
         detail="Could not validate credentials",
         headers={"WWW-Authenticate": 'Bearer error="invalid_token"'},
@@ -35,7 +41,7 @@ async def test_authenticate_invalid_token(websocket_handler):
     with pytest.raises(WebSocketDisconnect):
         await websocket_handler._authenticate(client_id, token)
 
-    websocket_handler.auth_service.get_user.assert_called_once_with(token)
+    websocket_handler.auth_service.get_verified_token.assert_called_once_with(token)
     websocket_handler.connection_manager.send_message.assert_awaited_once_with(
         {"status": False, "message": "Invalid token"}, client_id
     )
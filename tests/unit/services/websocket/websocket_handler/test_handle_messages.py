@@ -1,3 +1,4 @@
+import time
 from unittest.mock import AsyncMock, MagicMock, patch
 
 import httpx
@@ -6,7 +7,7 @@ from openai import AuthenticationError as OpenAIAuthenticationError
 from starlette.websockets import WebSocket
 
 from backend.exceptions import UnsetVariableError
-from backend.models.auth import User
+from backend.models.auth import User, VerifiedToken
 from backend.models.message import Message
 from backend.models.session_config import SessionConfig
 
@@ -89,10 +90,12 @@ async def test_process_single_message_user_message(websocket_handler):
 
     websocket.receive_json.return_value = {
         "type": "user_message",
-        "data": {"content": user_message, "session_id": session_id},
+        "data": {"content": user_message, "session_id": session_id, "full_history": True},
         "access_token": token,
     }
-    websocket_handler.auth_service.get_user.return_value = user
+    websocket_handler.auth_service.get_verified_token.return_value = VerifiedToken(
+        user=user, expires_at=time.time() + 3600, revocation_checked_at=time.time()
+    )
     websocket_handler.session_manager.get_session.return_value = session
     websocket_handler.agency_manager.get_agency.return_value = (agency, None)
     websocket_handler.message_manager.get_messages.return_value = all_messages
@@ -100,7 +103,7 @@ async def test_process_single_message_user_message(websocket_handler):
     await websocket_handler._process_single_message(websocket, client_id)
 
     websocket.receive_json.assert_awaited_once()
-    websocket_handler.auth_service.get_user.assert_called_once_with(token)
+    websocket_handler.auth_service.get_verified_token.assert_called_once_with(token)
     websocket_handler.session_manager.get_session.assert_called_once_with(session_id)
     websocket_handler.agency_manager.get_agency.assert_awaited_once_with(session.agency_id, session.thread_ids, user.id)
     websocket_handler.session_manager.update_session_timestamp.assert_called_once_with(session_id)
@@ -112,6 +115,7 @@ async def test_process_single_message_user_message(websocket_handler):
                 "status": True,
                 "message": "Message processed successfully",
                 "data": [message.model_dump() for message in all_messages],
+                "incremental": False,
             },
             "connection_id": client_id,
         },
@@ -172,3 +176,55 @@ async def test_process_single_message_session_not_found(websocket_handler):
     websocket_handler.connection_manager.send_message.assert_awaited_once_with(
         {"status": False, "message": "Session not found"}, client_id
     )
+
+
+@pytest.mark.asyncio
+async def test_process_single_message_reuses_connection_context(websocket_handler):
+    websocket = AsyncMock(spec=WebSocket)
+    client_id = "client_id"
+    token = "valid_token"
+    user = User(id="user_id", email="user@example.com")
+    session = SessionConfig(id="session_id", name="Session", user_id=user.id, agency_id="agency_id")
+    agency = MagicMock()
+
+    websocket.receive_json.side_effect = [
+        {"type": "user_message", "data": {"content": "Message 1", "session_id": session.id}, "access_token": token},
+        {"type": "user_message", "data": {"content": "Message 2", "session_id": session.id}, "access_token": token},
+        {"type": "user_message", "data": {"content": "Message 3", "session_id": session.id}},
+    ]
+    websocket_handler.auth_service.get_verified_token.return_value = VerifiedToken(
+        user=user, expires_at=time.time() + 3600, revocation_checked_at=time.time()
+    )
+    websocket_handler.session_manager.get_session.return_value = session
+    websocket_handler.agency_manager.get_agency.return_value = (agency, None)
+    websocket_handler.message_manager.get_messages.return_value = []
+
+    for _ in range(3):
+        await websocket_handler._process_single_message(websocket, client_id)
+
+    websocket_handler.auth_service.get_verified_token.assert_called_once_with(token)
+    websocket_handler.session_manager.get_session.assert_called_once_with(session.id)
+    websocket_handler.agency_manager.get_agency.assert_awaited_once()
+    assert agency.get_completion_stream.call_count == 3
+    websocket_handler.agency_manager.release_agency.assert_not_called()
+
+    websocket_handler._release_context(client_id)
+    websocket_handler.agency_manager.release_agency.assert_called_once_with(agency)
+
+
+@pytest.mark.asyncio
+async def test_process_single_message_expired_token(websocket_handler):
+    websocket = AsyncMock(spec=WebSocket)
+    client_id = "client_id"
+    user = User(id="user_id", email="user@example.com")
+    websocket_handler._get_context(client_id).bind_user(
+        "expired_token", VerifiedToken(user=user, expires_at=time.time() - 1, revocation_checked_at=time.time())
+    )
+
+    websocket.receive_json.return_value = {"type": "user_message", "data": {}}
+    await websocket_handler._process_single_message(websocket, client_id)
+
+    websocket_handler.auth_service.get_verified_token.assert_not_called()
+    websocket_handler.connection_manager.send_message.assert_awaited_once_with(
+        {"status": False, "message": "Access token expired"}, client_id
+    )
@@ -20,7 +20,7 @@ async def test_handle_websocket_connection(websocket_handler):
 
     websocket_handler.connection_manager.connect.assert_awaited_once_with(websocket, client_id)
     handle_messages_mock.assert_awaited_once_with(websocket, client_id)
-    websocket_handler.connection_manager.disconnect.assert_awaited_once_with(client_id)
+    websocket_handler.connection_manager.disconnect.assert_awaited_once_with(client_id, websocket=websocket)
 
 
 @pytest.mark.asyncio
@@ -81,7 +81,7 @@ async def test_handle_websocket_connection_websocket_disconnect(websocket_handle
         handle_messages_mock.side_effect = WebSocketDisconnect(1000)
         await websocket_handler.handle_websocket_connection(websocket, client_id)
 
-    websocket_handler.connection_manager.disconnect.assert_awaited_once_with(client_id)
+    websocket_handler.connection_manager.disconnect.assert_awaited_once_with(client_id, websocket=websocket)
 
 
 @pytest.mark.asyncio
@@ -95,7 +95,7 @@ async def test_handle_websocket_connection_connection_closed_ok(websocket_handle
         handle_messages_mock.side_effect = ConnectionClosedOK(rcvd=close_frame, sent=None)
         await websocket_handler.handle_websocket_connection(websocket, client_id)
 
-    websocket_handler.connection_manager.disconnect.assert_awaited_once_with(client_id)
+    websocket_handler.connection_manager.disconnect.assert_awaited_once_with(client_id, websocket=websocket)
 
 
 @pytest.mark.asyncio
@@ -2,7 +2,7 @@ from unittest import mock
 from unittest.mock import MagicMock, patch
 
 import pytest
-from openai.types.beta.threads import Text, TextDelta
+from openai.types.beta.threads import Message as OpenAIMessage, Text, TextDelta
 from openai.types.beta.threads.runs import CodeInterpreterToolCall, CodeInterpreterToolCallDelta
 from openai.types.beta.threads.runs.code_interpreter_tool_call import CodeInterpreter
 from openai.types.beta.threads.runs.code_interpreter_tool_call_delta import CodeInterpreter as CodeInterpreterDelta
@@ -54,6 +54,7 @@ async def test_on_text_delta(websocket_handler):
                         "data": [],
                         "message": "Message processed successfully",
                         "status": True,
+                        "incremental": True,
                     },
                 },
                 client_id,
@@ -110,6 +111,7 @@ async def test_on_text_done(websocket_handler):
                         "data": [],
                         "message": "Message processed successfully",
                         "status": True,
+                        "incremental": True,
                     },
                 },
                 client_id,
@@ -168,6 +170,7 @@ async def test_on_tool_call_created(websocket_handler):
                         "data": [],
                         "message": "Message processed successfully",
                         "status": True,
+                        "incremental": True,
                     },
                 },
                 client_id,
@@ -229,9 +232,51 @@ async def test_on_tool_call_delta(websocket_handler):
                         "data": [],
                         "message": "Message processed successfully",
                         "status": True,
+                        "incremental": True,
                     },
                 },
                 client_id,
             )
             in send_message_mock.await_args_list
         )
+
+
+def _thread_message(message_id: str, thread_id: str, content: str) -> OpenAIMessage:
+    return OpenAIMessage.model_construct(
+        id=message_id,
+        thread_id=thread_id,
+        role="assistant",
+        created_at=1700000000,
+        content=[MagicMock(text=Text(value=content, annotations=[]))],
+    )
+
+
+@pytest.mark.asyncio
+async def test_on_message_done_sends_only_new_session_messages(websocket_handler):
+    user = MagicMock()
+    message_data = {"content": "Sample message", "session_id": "sample_session_id"}
+    client_id = "sample_client_id"
+
+    with (
+        patch.object(websocket_handler, "_setup_agency") as setup_agency_mock,
+        patch.object(websocket_handler.message_manager, "get_messages") as get_messages_mock,
+    ):
+        agency_mock = MagicMock()
+        setup_agency_mock.return_value = (MagicMock(), agency_mock)
+
+        def get_completion_stream_mock(message, event_handler_cls):  # noqa: ARG001
+            event_handler = event_handler_cls()
+            event_handler.on_message_done(_thread_message("msg_1", "other_agent_thread", "Internal message"))
+            event_handler.on_message_done(_thread_message("msg_2", "sample_session_id", "Final answer"))
+
+        agency_mock.get_completion_stream.side_effect = get_completion_stream_mock
+
+        await websocket_handler._process_user_message(user, message_data, client_id)
+
+        get_messages_mock.assert_not_called()
+        response = websocket_handler.connection_manager.send_message.await_args_list[-1].args[0]
+        assert response["type"] == "agent_response"
+        assert response["data"]["incremental"] is True
+        assert [(message["id"], message["content"]) for message in response["data"]["data"]] == [
+            ("msg_2", "Final answer")
+        ]